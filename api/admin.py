@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import RegistroEliminado
+
+
+@admin.register(RegistroEliminado)
+class RegistroEliminadoAdmin(admin.ModelAdmin):
+    list_display = ('recurso', 'objeto_id', 'fecha')
+    list_filter = ('recurso',)
+    readonly_fields = ('recurso', 'objeto_id', 'fecha')
@@ -0,0 +1,32 @@
+# api/filtros.py
+from django.core.exceptions import ValidationError as ErrorDjango
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from inventario.listado import construir_busqueda
+
+
+class FiltrosListado(BaseFilterBackend):
+    """
+    Filtros equivalentes a los de los listados HTML.
+
+    Cada vista declara:
+        filtros: parámetro GET -> búsqueda del ORM (p. ej. {'estado': 'estado'})
+        campos_busqueda: campos en los que busca el parámetro ?search=
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for parametro, campo in getattr(view, 'filtros', {}).items():
+            valor = request.query_params.get(parametro)
+            if valor:
+                try:
+                    queryset = queryset.filter(**{campo: valor})
+                except (ValueError, ErrorDjango):
+                    raise ValidationError({parametro: 'Valor no válido.'})
+
+        search = request.query_params.get('search')
+        campos_busqueda = getattr(view, 'campos_busqueda', None)
+        if search and campos_busqueda:
+            queryset = queryset.filter(construir_busqueda(search, campos_busqueda))
+
+        return queryset
@@ -0,0 +1,20 @@
+# api/management/commands/purgar_eliminados.py
+from django.core.management.base import BaseCommand
+from api.sincronizacion import DIAS_ELIMINADOS, purgar_eliminados
+
+
+class Command(BaseCommand):
+    help = 'Elimina las marcas de registros borrados más antiguas que N días'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=DIAS_ELIMINADOS,
+            help=f'Días que se conservan las bajas para la sincronización (por defecto {DIAS_ELIMINADOS})',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'🗑️  Purgando bajas de más de {options["dias"]} días...')
+        total = purgar_eliminados(options['dias'])
+        self.stdout.write(self.style.SUCCESS(f'\n✅ {total} marcas eliminadas'))
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroEliminado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recurso', models.CharField(max_length=30)),
+                ('objeto_id', models.PositiveBigIntegerField()),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Registro eliminado',
+                'verbose_name_plural': 'Registros eliminados',
+                'indexes': [models.Index(fields=['recurso', 'fecha', 'id'], name='eliminado_recurso_fecha_idx')],
+            },
+        ),
+    ]
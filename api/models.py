@@ -0,0 +1,24 @@
+# api/models.py
+from django.db import models
+from django.utils import timezone
+
+
+class RegistroEliminado(models.Model):
+    """
+    Marca de un registro eliminado, para que la sincronización incremental
+    pueda informar de las bajas (ver api/sincronizacion.py)
+    """
+    recurso = models.CharField(max_length=30)
+    objeto_id = models.PositiveBigIntegerField()
+    fecha = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.recurso} #{self.objeto_id} eliminado el {self.fecha:%d/%m/%Y %H:%M}"
+
+    class Meta:
+        verbose_name = "Registro eliminado"
+        verbose_name_plural = "Registros eliminados"
+        indexes = [
+            models.Index(fields=['recurso', 'fecha', 'id'],
+                         name='eliminado_recurso_fecha_idx'),
+        ]
@@ -0,0 +1,17 @@
+# api/paginacion.py
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CursorPaginacion(CursorPagination):
+    """
+    Paginación por cursor sobre la clave primaria.
+
+    Cada página se obtiene con un WHERE pk > último visto, por lo que el
+    coste no crece con la posición y los registros creados durante la
+    sincronización no desplazan las páginas.
+    """
+    ordering = 'pk'
+    page_size = getattr(settings, 'API_TAMANO_PAGINA', 100)
+    page_size_query_param = 'por_pagina'
+    max_page_size = getattr(settings, 'API_TAMANO_PAGINA_MAXIMO', 1000)
@@ -0,0 +1,19 @@
+# api/permisos.py
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+from usuarios.decorators import tiene_permiso_inventario
+
+
+class PermisoInventario(BasePermission):
+    """
+    Lectura para usuarios autenticados; escritura para los roles que
+    gestionan el inventario (ver tiene_permiso_inventario)
+    """
+    message = 'No tiene permisos para modificar el inventario.'
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        if request.method in SAFE_METHODS:
+            return True
+        return request.user.is_superuser or tiene_permiso_inventario(request.user)
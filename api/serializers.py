@@ -0,0 +1,157 @@
+# api/serializers.py
+from django.db import transaction
+from rest_framework import serializers
+
+from inventario.models import Activo, Hardware, Software, Mantenimiento
+from locales.models import Local, Equipamiento
+
+
+def campos_solicitados(request):
+    """Campos pedidos con ?fields=a,b,c (None si se piden todos)"""
+    if request is None:
+        return None
+    valor = request.query_params.get('fields')
+    if not valor:
+        return None
+    return {campo.strip() for campo in valor.split(',') if campo.strip()}
+
+
+class CamposDinamicosSerializer(serializers.ModelSerializer):
+    """Serializer que devuelve solo los campos indicados en ?fields="""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+
+        campos = campos_solicitados(request)
+        if campos:
+            for nombre in set(self.fields) - campos:
+                self.fields.pop(nombre)
+
+
+class ActivoSerializer(CamposDinamicosSerializer):
+    departamento_nombre = serializers.CharField(source='departamento.nombre', read_only=True)
+
+    class Meta:
+        model = Activo
+        fields = [
+            'id', 'tipo', 'nombre', 'descripcion', 'fecha_adquisicion',
+            'valor_adquisicion', 'estado', 'departamento', 'departamento_nombre',
+            'ubicacion', 'fecha_baja', 'motivo_baja', 'fecha_creacion',
+            'fecha_actualizacion', 'creado_por', 'actualizado_por',
+        ]
+        read_only_fields = ['fecha_creacion', 'fecha_actualizacion', 'creado_por', 'actualizado_por']
+
+
+class ActivoAnidadoSerializer(serializers.ModelSerializer):
+    """Datos generales del activo dentro de hardware y software"""
+    departamento_nombre = serializers.CharField(source='departamento.nombre', read_only=True)
+
+    class Meta:
+        model = Activo
+        fields = [
+            'nombre', 'descripcion', 'fecha_adquisicion', 'valor_adquisicion',
+            'estado', 'departamento', 'departamento_nombre', 'ubicacion',
+            'fecha_baja', 'motivo_baja', 'fecha_actualizacion',
+        ]
+        read_only_fields = ['fecha_actualizacion']
+
+
+class DetalleActivoSerializer(CamposDinamicosSerializer):
+    """
+    Base de hardware y software: el activo se crea y actualiza junto con
+    su detalle en una sola petición
+    """
+    id = serializers.IntegerField(source='activo_id', read_only=True)
+    activo = ActivoAnidadoSerializer()
+
+    tipo_activo = None
+
+    @transaction.atomic
+    def create(self, validated_data):
+        datos_activo = validated_data.pop('activo')
+        usuario = self.context['request'].user
+        activo = Activo.objects.create(
+            tipo=self.tipo_activo, creado_por=usuario, actualizado_por=usuario, **datos_activo)
+        return self.Meta.model.objects.create(activo=activo, **validated_data)
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        datos_activo = validated_data.pop('activo', None)
+        if datos_activo:
+            activo = instance.activo
+            for campo, valor in datos_activo.items():
+                setattr(activo, campo, valor)
+            activo.actualizado_por = self.context['request'].user
+            activo.save()
+        return super().update(instance, validated_data)
+
+
+class HardwareSerializer(DetalleActivoSerializer):
+    tipo_activo = 'hardware'
+
+    class Meta:
+        model = Hardware
+        fields = [
+            'id', 'activo', 'marca', 'modelo', 'numero_serie', 'especificaciones',
+            'fecha_garantia', 'periodicidad_mantenimiento', 'fecha_actualizacion',
+        ]
+
+
+class SoftwareSerializer(DetalleActivoSerializer):
+    tipo_activo = 'software'
+
+    class Meta:
+        model = Software
+        fields = [
+            'id', 'activo', 'version', 'tipo_licencia', 'clave_activacion',
+            'fecha_vencimiento', 'numero_licencias', 'fecha_actualizacion',
+        ]
+
+
+class MantenimientoSerializer(CamposDinamicosSerializer):
+    activo_nombre = serializers.CharField(source='activo.nombre', read_only=True)
+    responsable_nombre = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Mantenimiento
+        fields = [
+            'id', 'activo', 'activo_nombre', 'tipo', 'fecha_programada',
+            'fecha_realizacion', 'responsable', 'responsable_nombre', 'descripcion',
+            'costo', 'estado', 'observaciones', 'fecha_actualizacion',
+        ]
+
+    def get_responsable_nombre(self, obj):
+        if obj.responsable is None:
+            return None
+        return obj.responsable.get_full_name() or obj.responsable.username
+
+
+class LocalSerializer(CamposDinamicosSerializer):
+    departamento_nombre = serializers.CharField(source='departamento.nombre', read_only=True)
+    equipamientos = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = Local
+        fields = [
+            'id', 'nombre', 'tipo', 'capacidad', 'ubicacion', 'descripcion', 'estado',
+            'departamento', 'departamento_nombre', 'notas', 'equipamientos',
+            'fecha_creacion', 'fecha_actualizacion',
+        ]
+        read_only_fields = ['fecha_creacion', 'fecha_actualizacion']
+
+
+class EquipamientoSerializer(CamposDinamicosSerializer):
+    local_nombre = serializers.CharField(source='local.nombre', read_only=True)
+    hardware_nombre = serializers.CharField(source='hardware.activo.nombre', read_only=True)
+
+    class Meta:
+        model = Equipamiento
+        fields = [
+            'id', 'local', 'local_nombre', 'hardware', 'hardware_nombre',
+            'fecha_asignacion', 'estado', 'notas', 'fecha_actualizacion',
+        ]
+        read_only_fields = ['fecha_asignacion', 'fecha_actualizacion']
@@ -0,0 +1,25 @@
+# api/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from inventario.models import Activo, Hardware, Software
+
+from .sincronizacion import RECURSOS, registrar_baja
+
+
+def anotar_baja(sender, instance, **kwargs):
+    """Guardar la baja para la sincronización incremental"""
+    registrar_baja(instance)
+
+
+for modelo in RECURSOS:
+    post_delete.connect(anotar_baja, sender=modelo,
+                        dispatch_uid=f'sincronizacion_baja_{modelo.__name__}')
+
+
+@receiver(post_save, sender=Activo)
+def propagar_cambio_activo(sender, instance, **kwargs):
+    """Los datos del activo forman parte de su hardware o software en la API"""
+    detalle = Hardware if instance.tipo == 'hardware' else Software
+    detalle.objects.filter(activo_id=instance.pk).update(
+        fecha_actualizacion=instance.fecha_actualizacion)
@@ -0,0 +1,173 @@
+# api/sincronizacion.py
+"""
+Sincronización incremental para sistemas externos.
+
+Cada recurso se recorre en orden de (fecha_actualizacion, pk) y las bajas
+se leen de RegistroEliminado, que llenan las señales de api/signals.py. El
+cliente guarda el cursor de la última respuesta y en la siguiente ejecución
+solo recibe lo que cambió desde entonces.
+
+Los cambios de los últimos API_SINCRONIZACION_MARGEN segundos no se
+entregan todavía: así una transacción que guardó su fecha antes de que se
+leyera la página pero confirmó después no queda detrás del cursor. El
+margen debe ser más largo que la transacción de escritura más larga
+(incluida la espera de busy_timeout por el bloqueo). Las acciones masivas,
+que pueden durar segundos, además sellan la fecha definitiva en su última
+sentencia antes de confirmar (inventario/acciones.py).
+
+Configuración (settings):
+    API_SINCRONIZACION_MARGEN: segundos de margen (por defecto 30)
+    API_DIAS_ELIMINADOS: días que se conservan las bajas; un cursor más
+        antiguo obliga a una sincronización completa
+"""
+import base64
+import json
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from inventario.models import Activo, Hardware, Software, Mantenimiento
+from locales.models import Local, Equipamiento
+
+from .models import RegistroEliminado
+
+MARGEN = timedelta(seconds=getattr(settings, 'API_SINCRONIZACION_MARGEN', 30))
+DIAS_ELIMINADOS = getattr(settings, 'API_DIAS_ELIMINADOS', 90)
+LIMITE = 500
+LIMITE_MAXIMO = 5000
+
+# Nombre del recurso de cada modelo sincronizado (el mismo que en la URL)
+RECURSOS = {
+    Activo: 'activos',
+    Hardware: 'hardware',
+    Software: 'software',
+    Mantenimiento: 'mantenimientos',
+    Local: 'locales',
+    Equipamiento: 'equipamientos',
+}
+
+# Última posición entregada: cambios (fecha, pk) y bajas (fecha, id)
+Posicion = namedtuple('Posicion', ['cambio', 'cambio_id', 'baja', 'baja_id'])
+
+
+class CursorNoValido(Exception):
+    """El cursor o la fecha de inicio no se pueden interpretar"""
+
+
+class SincronizacionCaducada(Exception):
+    """El cursor es anterior a las bajas conservadas: hay que sincronizar todo"""
+
+
+def codificar_cursor(posicion):
+    datos = [
+        posicion.cambio.isoformat() if posicion.cambio else None,
+        posicion.cambio_id,
+        posicion.baja.isoformat(),
+        posicion.baja_id,
+    ]
+    return base64.urlsafe_b64encode(json.dumps(datos).encode('utf-8')).decode('ascii')
+
+
+def _fecha_cursor(valor):
+    fecha = parse_datetime(valor)
+    if fecha is None:
+        raise ValueError(valor)
+    if timezone.is_naive(fecha):
+        fecha = timezone.make_aware(fecha)
+    return fecha
+
+
+def decodificar_cursor(cursor):
+    try:
+        cambio, cambio_id, baja, baja_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return Posicion(
+            _fecha_cursor(cambio) if cambio is not None else None, int(cambio_id),
+            _fecha_cursor(baja), int(baja_id))
+    except (TypeError, ValueError):
+        raise CursorNoValido('Cursor de sincronización no válido.')
+
+
+def posicion_inicial(desde=None, ahora=None):
+    """
+    Posición de partida de una sincronización.
+
+    Sin fecha se entregan todos los registros y solo las bajas posteriores;
+    con fecha, los cambios y bajas desde ese momento.
+    """
+    if desde:
+        fecha = parse_datetime(desde)
+        if fecha is None:
+            raise CursorNoValido('Fecha de inicio no válida (use formato ISO 8601).')
+        if timezone.is_naive(fecha):
+            fecha = timezone.make_aware(fecha)
+        return Posicion(fecha, 0, fecha, 0)
+
+    inicio = (ahora or timezone.now()) - MARGEN
+    return Posicion(None, 0, inicio, 0)
+
+
+def _despues_de(campo_fecha, fecha, campo_id, pk):
+    return Q(**{f'{campo_fecha}__gt': fecha}) | Q(**{campo_fecha: fecha, f'{campo_id}__gt': pk})
+
+
+def pagina_cambios(queryset, recurso, posicion, limite=LIMITE, ahora=None):
+    """
+    Leer los cambios y bajas posteriores a una posición.
+
+    Returns:
+        Tupla (objetos modificados, bajas, nueva posición, hay_mas)
+
+    Raises:
+        SincronizacionCaducada: si la posición es anterior a las bajas conservadas
+    """
+    ahora = ahora or timezone.now()
+    if posicion.baja < ahora - timedelta(days=DIAS_ELIMINADOS):
+        raise SincronizacionCaducada(
+            'El cursor es demasiado antiguo; realice una sincronización completa.')
+
+    hasta = ahora - MARGEN
+
+    cambios = queryset.filter(fecha_actualizacion__lte=hasta)
+    if posicion.cambio:
+        cambios = cambios.filter(
+            _despues_de('fecha_actualizacion', posicion.cambio, 'pk', posicion.cambio_id))
+    cambios = list(cambios.order_by('fecha_actualizacion', 'pk')[:limite + 1])
+
+    bajas = list(
+        RegistroEliminado.objects.filter(recurso=recurso, fecha__lte=hasta)
+        .filter(_despues_de('fecha', posicion.baja, 'id', posicion.baja_id))
+        .order_by('fecha', 'id')[:limite + 1]
+    )
+
+    hay_mas = len(cambios) > limite or len(bajas) > limite
+    cambios, bajas = cambios[:limite], bajas[:limite]
+
+    nueva = posicion
+    if cambios:
+        nueva = nueva._replace(cambio=cambios[-1].fecha_actualizacion, cambio_id=cambios[-1].pk)
+    if bajas:
+        nueva = nueva._replace(baja=bajas[-1].fecha, baja_id=bajas[-1].id)
+
+    return cambios, bajas, nueva, hay_mas
+
+
+def registrar_baja(instancia):
+    """Anotar la eliminación de un registro sincronizado"""
+    RegistroEliminado.objects.create(
+        recurso=RECURSOS[type(instancia)], objeto_id=instancia.pk)
+
+
+def purgar_eliminados(dias=DIAS_ELIMINADOS):
+    """
+    Eliminar las marcas de baja más antiguas que `dias` días.
+
+    Returns:
+        Número de marcas eliminadas
+    """
+    limite = timezone.now() - timedelta(days=dias)
+    eliminados, _ = RegistroEliminado.objects.filter(fecha__lt=limite).delete()
+    return eliminados
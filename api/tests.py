@@ -0,0 +1,243 @@
+# api/tests.py
+"""
+Pruebas de la API REST del inventario
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from inventario.models import Activo, Hardware
+from locales.models import Local, Equipamiento
+from usuarios.models import Departamento, Rol
+
+
+class ApiInventarioTestCase(TestCase):
+    """
+    Pruebas de paginación, campos, filtros, GET condicional y escritura
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.departamento = Departamento.objects.create(nombre="TI")
+        self.user = User.objects.create_user(username='apiuser', password='testpass123')
+        # El perfil se crea con la señal de usuarios
+        self.user.perfil.rol = Rol.objects.create(nombre='Técnico')
+        self.user.perfil.save()
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        for numero in range(5):
+            activo = Activo.objects.create(
+                tipo='hardware',
+                nombre=f'PC {numero}',
+                fecha_adquisicion=date(2025, 1, numero + 1),
+                valor_adquisicion=Decimal('500.00'),
+                estado='activo' if numero % 2 else 'obsoleto',
+                departamento=self.departamento
+            )
+            Hardware.objects.create(
+                activo=activo, marca='Dell', modelo='Optiplex', numero_serie=f'SN-{numero}')
+
+    def test_paginacion_por_cursor_y_campos(self):
+        """
+        CP-API-01: Verificar la paginación por cursor y ?fields=
+        """
+        nombres = []
+        url = '/api/v1/activos/?por_pagina=2&fields=id,nombre'
+        while url:
+            respuesta = self.client.get(url)
+            self.assertEqual(respuesta.status_code, 200)
+            for fila in respuesta.data['results']:
+                self.assertEqual(set(fila), {'id', 'nombre'})
+                nombres.append(fila['nombre'])
+            url = respuesta.data['next']
+
+        self.assertEqual(nombres, [f'PC {numero}' for numero in range(5)])
+
+    def test_consultas_por_campos_solicitados(self):
+        """
+        CP-API-02: Verificar que las relaciones se cargan solo si se piden sus campos
+        """
+        with self.assertNumQueries(2):  # versiones de datos + página
+            respuesta = self.client.get('/api/v1/hardware/')
+        self.assertEqual(respuesta.data['results'][0]['activo']['departamento_nombre'], 'TI')
+
+        local = Local.objects.create(
+            nombre='Lab 1', tipo='laboratorio', ubicacion='Bloque A', departamento=self.departamento)
+        Equipamiento.objects.create(local=local, hardware=Hardware.objects.first())
+
+        with self.assertNumQueries(3):  # versiones + página + equipamientos
+            respuesta = self.client.get('/api/v1/locales/')
+        self.assertEqual(len(respuesta.data['results'][0]['equipamientos']), 1)
+
+        with self.assertNumQueries(2):
+            respuesta = self.client.get('/api/v1/locales/?fields=id,nombre')
+        self.assertNotIn('equipamientos', respuesta.data['results'][0])
+
+    def test_filtros_y_busqueda(self):
+        """
+        CP-API-03: Verificar los filtros equivalentes a los listados
+        """
+        respuesta = self.client.get('/api/v1/hardware/?estado=obsoleto')
+        self.assertEqual(len(respuesta.data['results']), 3)
+
+        respuesta = self.client.get('/api/v1/hardware/?search=SN-4')
+        self.assertEqual([fila['id'] for fila in respuesta.data['results']],
+                         [Activo.objects.get(nombre='PC 4').pk])
+
+        respuesta = self.client.get('/api/v1/activos/?departamento=abc')
+        self.assertEqual(respuesta.status_code, 400)
+
+    def test_get_condicional(self):
+        """
+        CP-API-04: Verificar el ETag, la respuesta 304 y su invalidación al modificar datos
+        """
+        respuesta = self.client.get('/api/v1/activos/')
+        etag = respuesta['ETag']
+
+        with self.assertNumQueries(1):
+            respuesta = self.client.get('/api/v1/activos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 304)
+
+        Activo.objects.filter(nombre='PC 0').first().save()
+        respuesta = self.client.get('/api/v1/activos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta['ETag'], etag)
+
+    def test_crear_hardware_con_activo(self):
+        """
+        CP-API-05: Verificar la creación de hardware con su activo y el permiso de escritura
+        """
+        datos = {
+            'activo': {
+                'nombre': 'Servidor API',
+                'fecha_adquisicion': '2025-02-01',
+                'valor_adquisicion': '2500.00',
+                'estado': 'activo',
+                'departamento': self.departamento.pk,
+            },
+            'marca': 'HP',
+            'modelo': 'ProLiant',
+            'numero_serie': 'SRV-001',
+        }
+        respuesta = self.client.post('/api/v1/hardware/', datos, format='json')
+        self.assertEqual(respuesta.status_code, 201)
+
+        hardware = Hardware.objects.select_related('activo').get(numero_serie='SRV-001')
+        self.assertEqual(hardware.activo.tipo, 'hardware')
+        self.assertEqual(hardware.activo.creado_por, self.user)
+
+        # Un usuario sin rol de inventario solo puede leer
+        lector = User.objects.create_user(username='lector', password='testpass123')
+        self.client.force_authenticate(lector)
+        self.assertEqual(self.client.get('/api/v1/hardware/').status_code, 200)
+        datos['numero_serie'] = 'SRV-002'
+        respuesta = self.client.post('/api/v1/hardware/', datos, format='json')
+        self.assertEqual(respuesta.status_code, 403)
+
+
+class SincronizacionTestCase(TestCase):
+    """
+    Pruebas de la sincronización incremental
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.departamento = Departamento.objects.create(nombre="TI")
+        self.user = User.objects.create_user(username='syncuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def crear_hardware(self, nombre, serie):
+        activo = Activo.objects.create(
+            tipo='hardware',
+            nombre=nombre,
+            fecha_adquisicion=date(2025, 1, 1),
+            valor_adquisicion=Decimal('500.00'),
+            departamento=self.departamento
+        )
+        return Hardware.objects.create(activo=activo, marca='Dell', modelo='Optiplex', numero_serie=serie)
+
+    def sincronizar(self, recurso, cursor=None):
+        """Recorrer todas las páginas como haría un cliente"""
+        from unittest import mock
+        from django.utils import timezone
+        from api import sincronizacion
+
+        cambios, eliminados = [], []
+        # Sin margen: los cambios recién hechos en la prueba ya son visibles
+        with mock.patch.object(sincronizacion, 'MARGEN', timezone.timedelta(0)):
+            while True:
+                parametros = {'limite': 2}
+                if cursor:
+                    parametros['cursor'] = cursor
+                respuesta = self.client.get(f'/api/v1/sync/{recurso}/', parametros)
+                self.assertEqual(respuesta.status_code, 200)
+                cambios += [fila['id'] for fila in respuesta.data['cambios']]
+                eliminados += [fila['id'] for fila in respuesta.data['eliminados']]
+                cursor = respuesta.data['cursor']
+                if not respuesta.data['hay_mas']:
+                    return cambios, eliminados, cursor
+
+    def test_cambios_y_bajas(self):
+        """
+        CP-API-06: Verificar la sincronización completa, los cambios posteriores y las bajas
+        """
+        equipos = [self.crear_hardware(f'PC {numero}', f'SN-{numero}') for numero in range(3)]
+
+        cambios, eliminados, cursor = self.sincronizar('hardware')
+        self.assertEqual(sorted(cambios), sorted(equipo.pk for equipo in equipos))
+        self.assertEqual(eliminados, [])
+
+        # Sin cambios no se entrega nada
+        cambios, eliminados, cursor = self.sincronizar('hardware', cursor)
+        self.assertEqual((cambios, eliminados), ([], []))
+        _, _, cursor_activos = self.sincronizar('activos')
+
+        # Modificar el activo cuenta como cambio de su hardware
+        activo = equipos[0].activo
+        activo.estado = 'obsoleto'
+        activo.save()
+        equipos[1].activo.delete()
+
+        cambios, eliminados, cursor = self.sincronizar('hardware', cursor)
+        self.assertEqual(cambios, [equipos[0].pk])
+        self.assertEqual(eliminados, [equipos[1].pk])
+
+        # Cada recurso lleva su propio cursor
+        cambios, eliminados, _ = self.sincronizar('activos', cursor_activos)
+        self.assertEqual(cambios, [activo.pk])
+        self.assertEqual(eliminados, [equipos[1].pk])
+
+    def test_cursor_no_valido(self):
+        """
+        CP-API-07: Verificar los errores de cursor, fecha y recurso
+        """
+        self.assertEqual(self.client.get('/api/v1/sync/hardware/', {'cursor': 'xx'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/sync/hardware/', {'desde': 'ayer'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/sync/usuarios/').status_code, 404)
+        self.assertEqual(
+            self.client.get('/api/v1/sync/hardware/', {'desde': '2000-01-01T00:00:00'}).status_code, 410)
+
+        # Cursores manipulados: fechas ausentes o inválidas son 400, no 500
+        import base64
+        import json
+        from django.utils import timezone
+
+        def cursor(*datos):
+            return base64.urlsafe_b64encode(json.dumps(datos).encode('utf-8')).decode('ascii')
+
+        reciente = timezone.localtime().replace(tzinfo=None).isoformat()
+        for datos in ([None, 0, 'x', 0], [None, 0, None, 0], ['x', 0, reciente, 0],
+                      [reciente, 'a', reciente, 0], [None, 0, 5, 0]):
+            respuesta = self.client.get('/api/v1/sync/hardware/', {'cursor': cursor(*datos)})
+            self.assertEqual(respuesta.status_code, 400, datos)
+
+        # Una fecha sin zona horaria se interpreta en la zona local
+        respuesta = self.client.get('/api/v1/sync/hardware/', {'cursor': cursor(reciente, 0, reciente, 0)})
+        self.assertEqual(respuesta.status_code, 200)
@@ -0,0 +1,22 @@
+# api/urls.py
+from django.urls import include, path, re_path
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
+router = DefaultRouter()
+router.register('activos', views.ActivoViewSet, basename='api-activo')
+router.register('hardware', views.HardwareViewSet, basename='api-hardware')
+router.register('software', views.SoftwareViewSet, basename='api-software')
+router.register('mantenimientos', views.MantenimientoViewSet, basename='api-mantenimiento')
+router.register('locales', views.LocalViewSet, basename='api-local')
+router.register('equipamientos', views.EquipamientoViewSet, basename='api-equipamiento')
+
+urlpatterns = [
+    re_path(r'^(?P<version>v1)/', include([
+        path('calendario/mantenimientos/', views.CalendarioMantenimientoView.as_view(),
+             name='api-calendario-mantenimientos'),
+        path('sync/<str:recurso>/', views.SincronizacionView.as_view(), name='api-sincronizacion'),
+        path('', include(router.urls)),
+    ])),
+]
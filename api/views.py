@@ -0,0 +1,309 @@
+# api/views.py
+import hashlib
+
+from django.db.models import Prefetch
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import viewsets
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from inventario.calendario import RangoNoValido, carga_diaria, parsear_rango
+from inventario.listado import CAMPOS_BUSQUEDA_HARDWARE, CAMPOS_BUSQUEDA_SOFTWARE
+from inventario.models import Activo, Hardware, Software, Mantenimiento
+from locales.models import Local, Equipamiento
+from reportes.cache_reportes import sello_dominios
+from usuarios.actividad import registrar_actividad
+
+from .filtros import FiltrosListado
+from .sincronizacion import (
+    LIMITE, LIMITE_MAXIMO, CursorNoValido, SincronizacionCaducada,
+    codificar_cursor, decodificar_cursor, pagina_cambios, posicion_inicial
+)
+from .serializers import (
+    ActivoSerializer, HardwareSerializer, SoftwareSerializer, MantenimientoSerializer,
+    LocalSerializer, EquipamientoSerializer, campos_solicitados
+)
+
+
+class InventarioViewSet(viewsets.ModelViewSet):
+    """
+    Base de los endpoints de la API.
+
+    Cada vista declara:
+        relaciones: campo del serializer -> rutas de select_related que necesita
+        prefetch: campo del serializer -> prefetch_related que necesita
+        dominios: grupos de VersionDatos de los que dependen sus respuestas
+        nombre_registro: texto para el registro de actividad
+    Solo se hacen los JOIN y prefetch de los campos pedidos con ?fields=.
+    """
+    filter_backends = [FiltrosListado]
+    relaciones = {}
+    prefetch = {}
+    dominios = ()
+    nombre_registro = 'registro'
+
+    def get_queryset(self):
+        return self.queryset_para(campos_solicitados(self.request))
+
+    @classmethod
+    def queryset_para(cls, campos=None):
+        """Queryset con las relaciones que necesitan los campos (None: todos)"""
+        queryset = cls.queryset.all()
+
+        select = set()
+        for campo, rutas in cls.relaciones.items():
+            if campos is None or campo in campos:
+                select.update(rutas)
+        if select:
+            queryset = queryset.select_related(*sorted(select))
+
+        for campo, prefetch in cls.prefetch.items():
+            if campos is None or campo in campos:
+                queryset = queryset.prefetch_related(prefetch)
+
+        return queryset
+
+    # GET condicional: el ETag depende de la versión de los datos, de modo
+    # que una respuesta sin cambios se contesta con 304 sin consultar las tablas
+
+    def etag(self, request):
+        clave = '|'.join([
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            sello_dominios(self.dominios),
+        ])
+        return quote_etag(hashlib.sha256(clave.encode('utf-8')).hexdigest())
+
+    def respuesta_condicional(self, request, accion, *args, **kwargs):
+        etag = self.etag(request)
+        if get_conditional_response(request._request, etag=etag) is not None:
+            return Response(status=304, headers={'ETag': etag})
+
+        respuesta = accion(request, *args, **kwargs)
+        if respuesta.status_code == 200:
+            respuesta['ETag'] = etag
+            respuesta['Cache-Control'] = 'private, no-cache'
+        return respuesta
+
+    def list(self, request, *args, **kwargs):
+        return self.respuesta_condicional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.respuesta_condicional(request, super().retrieve, *args, **kwargs)
+
+    # Registro de actividad de las modificaciones
+
+    def perform_create(self, serializer):
+        instancia = serializer.save()
+        self.registrar(f"Creación de {self.nombre_registro} vía API", instancia)
+
+    def perform_update(self, serializer):
+        instancia = serializer.save()
+        self.registrar(f"Actualización de {self.nombre_registro} vía API", instancia)
+
+    def perform_destroy(self, instance):
+        descripcion = str(instance)
+        instance.delete()
+        registrar_actividad(
+            usuario=self.request.user,
+            accion=f"Eliminación de {self.nombre_registro} vía API: {descripcion}",
+            ip=self.request.META.get('REMOTE_ADDR')
+        )
+
+    def registrar(self, accion, instancia):
+        registrar_actividad(
+            usuario=self.request.user,
+            accion=f"{accion}: {instancia}",
+            detalles=f"ID: {instancia.pk}",
+            ip=self.request.META.get('REMOTE_ADDR')
+        )
+
+
+class ActivoViewSet(InventarioViewSet):
+    queryset = Activo.objects.all()
+    serializer_class = ActivoSerializer
+    relaciones = {'departamento_nombre': ['departamento']}
+    filtros = {
+        'tipo': 'tipo',
+        'estado': 'estado',
+        'departamento': 'departamento_id',
+    }
+    campos_busqueda = ['nombre', 'ubicacion']
+    dominios = ('inventario', 'catalogos')
+    nombre_registro = 'activo'
+
+    def perform_create(self, serializer):
+        instancia = serializer.save(creado_por=self.request.user, actualizado_por=self.request.user)
+        self.registrar(f"Creación de {self.nombre_registro} vía API", instancia)
+
+    def perform_update(self, serializer):
+        instancia = serializer.save(actualizado_por=self.request.user)
+        self.registrar(f"Actualización de {self.nombre_registro} vía API", instancia)
+
+
+class HardwareViewSet(InventarioViewSet):
+    queryset = Hardware.objects.all()
+    serializer_class = HardwareSerializer
+    relaciones = {'activo': ['activo', 'activo__departamento']}
+    filtros = {
+        'estado': 'activo__estado',
+        'departamento': 'activo__departamento_id',
+    }
+    campos_busqueda = CAMPOS_BUSQUEDA_HARDWARE
+    dominios = ('inventario', 'catalogos')
+    nombre_registro = 'hardware'
+
+
+class SoftwareViewSet(InventarioViewSet):
+    queryset = Software.objects.all()
+    serializer_class = SoftwareSerializer
+    relaciones = {'activo': ['activo', 'activo__departamento']}
+    filtros = {
+        'estado': 'activo__estado',
+        'departamento': 'activo__departamento_id',
+        'tipo_licencia': 'tipo_licencia',
+    }
+    campos_busqueda = CAMPOS_BUSQUEDA_SOFTWARE
+    dominios = ('inventario', 'catalogos')
+    nombre_registro = 'software'
+
+
+class MantenimientoViewSet(InventarioViewSet):
+    queryset = Mantenimiento.objects.all()
+    serializer_class = MantenimientoSerializer
+    relaciones = {
+        'activo_nombre': ['activo'],
+        'responsable_nombre': ['responsable'],
+    }
+    filtros = {
+        'tipo': 'tipo',
+        'estado': 'estado',
+        'activo': 'activo_id',
+        'responsable': 'responsable_id',
+        'desde': 'fecha_programada__gte',
+        'hasta': 'fecha_programada__lte',
+    }
+    campos_busqueda = ['activo__nombre', 'descripcion']
+    dominios = ('mantenimiento', 'inventario', 'catalogos')
+    nombre_registro = 'mantenimiento'
+
+
+class LocalViewSet(InventarioViewSet):
+    queryset = Local.objects.all()
+    serializer_class = LocalSerializer
+    relaciones = {'departamento_nombre': ['departamento']}
+    prefetch = {
+        'equipamientos': Prefetch('equipamientos', queryset=Equipamiento.objects.only('id', 'local_id')),
+    }
+    filtros = {
+        'tipo': 'tipo',
+        'estado': 'estado',
+        'departamento': 'departamento_id',
+    }
+    campos_busqueda = ['nombre', 'ubicacion']
+    dominios = ('locales', 'catalogos')
+    nombre_registro = 'local'
+
+
+class EquipamientoViewSet(InventarioViewSet):
+    queryset = Equipamiento.objects.all()
+    serializer_class = EquipamientoSerializer
+    relaciones = {
+        'local_nombre': ['local'],
+        'hardware_nombre': ['hardware__activo'],
+    }
+    filtros = {
+        'local': 'local_id',
+        'estado': 'estado',
+        'hardware': 'hardware_id',
+    }
+    campos_busqueda = ['hardware__activo__nombre', 'local__nombre']
+    dominios = ('locales', 'inventario')
+    nombre_registro = 'equipamiento'
+
+
+# Recursos disponibles en la sincronización incremental
+VISTAS_SINCRONIZACION = {
+    'activos': ActivoViewSet,
+    'hardware': HardwareViewSet,
+    'software': SoftwareViewSet,
+    'mantenimientos': MantenimientoViewSet,
+    'locales': LocalViewSet,
+    'equipamientos': EquipamientoViewSet,
+}
+
+
+class SincronizacionView(APIView):
+    """
+    Cambios de un recurso desde la última sincronización.
+
+    Parámetros:
+        cursor: valor devuelto por la respuesta anterior
+        desde: fecha ISO 8601 de inicio (sin cursor ni fecha, todo el recurso)
+        limite: cambios y bajas máximos por respuesta
+        fields: campos de los registros modificados
+    Mientras 'hay_mas' sea true, el cliente repite la petición con el cursor nuevo.
+    """
+
+    def get(self, request, recurso, version=None):
+        vista = VISTAS_SINCRONIZACION.get(recurso)
+        if vista is None:
+            raise NotFound(f'Recurso desconocido: {recurso}')
+
+        try:
+            limite = max(1, min(int(request.query_params.get('limite', LIMITE)), LIMITE_MAXIMO))
+        except ValueError:
+            raise ValidationError({'limite': 'Debe ser un número entero.'})
+
+        cursor = request.query_params.get('cursor')
+        try:
+            if cursor:
+                posicion = decodificar_cursor(cursor)
+            else:
+                posicion = posicion_inicial(request.query_params.get('desde'))
+            cambios, bajas, posicion, hay_mas = pagina_cambios(
+                vista.queryset_para(campos_solicitados(request)), recurso, posicion, limite)
+        except CursorNoValido as e:
+            raise ValidationError({'cursor': str(e)})
+        except SincronizacionCaducada as e:
+            return Response({'detail': str(e)}, status=410)
+
+        serializer = vista.serializer_class(cambios, many=True, context={'request': request})
+        return Response({
+            'recurso': recurso,
+            'cambios': serializer.data,
+            'eliminados': [{'id': baja.objeto_id, 'fecha': baja.fecha} for baja in bajas],
+            'cursor': codificar_cursor(posicion),
+            'hay_mas': hay_mas,
+        })
+
+
+class CalendarioMantenimientoView(APIView):
+    """
+    Carga de mantenimientos por día y responsable en un rango de fechas.
+
+    Parámetros:
+        desde, hasta: fechas ISO del rango (obligatorias)
+        responsable: id del técnico (opcional)
+    Los conteos se calculan en la base de datos; las filas del rango se
+    obtienen de /mantenimientos/?desde=&hasta=.
+    """
+
+    def get(self, request, version=None):
+        try:
+            desde, hasta = parsear_rango(
+                request.query_params.get('desde'), request.query_params.get('hasta'))
+        except RangoNoValido as e:
+            raise ValidationError({'rango': str(e)})
+
+        responsable = request.query_params.get('responsable')
+        if responsable and not responsable.isdigit():
+            raise ValidationError({'responsable': 'Valor no válido.'})
+
+        return Response({
+            'desde': desde,
+            'hasta': hasta,
+            'dias': carga_diaria(desde, hasta, responsable or None),
+        })
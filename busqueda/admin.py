@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import DocumentoBusqueda
+
+
+@admin.register(DocumentoBusqueda)
+class DocumentoBusquedaAdmin(admin.ModelAdmin):
+    list_display = ('titulo', 'tipo', 'objeto_id', 'fecha_actualizacion')
+    list_filter = ('tipo',)
+    search_fields = ('titulo', 'contenido')
+    readonly_fields = ('fecha_actualizacion',)
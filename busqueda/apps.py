@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class BusquedaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'busqueda'
+    verbose_name = 'Búsqueda Global'
+
+    def ready(self):
+        import busqueda.signals  # Importa las señales
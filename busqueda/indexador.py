@@ -0,0 +1,227 @@
+# busqueda/indexador.py
+"""
+Índice de búsqueda global sobre activos, mantenimientos y locales.
+
+Cada entidad se desnormaliza en un DocumentoBusqueda. Según el motor de base
+de datos, la consulta se resuelve con:
+    - SQLite: tabla virtual FTS5 'busqueda_fts' sincronizada por triggers
+    - PostgreSQL: columna tsvector generada con índice GIN
+    - Otros motores: icontains sobre la tabla de documentos
+"""
+import re
+
+from django.db import connection, transaction, DatabaseError
+from django.db.models import Q
+from django.urls import reverse
+
+from inventario.models import Hardware, Software, Mantenimiento
+from locales.models import Local
+from .models import DocumentoBusqueda
+
+TABLA_FTS = 'busqueda_fts'
+LIMITE_DEFECTO = 20
+LIMITE_MAXIMO = 100
+
+
+def _unir(*partes):
+    return ' '.join(str(parte) for parte in partes if parte)
+
+
+def documento_hardware(hardware):
+    return hardware.activo.nombre, _unir(
+        hardware.marca, hardware.modelo, hardware.numero_serie)
+
+
+def documento_software(software):
+    return software.activo.nombre, _unir(
+        software.version, software.get_tipo_licencia_display())
+
+
+def documento_mantenimiento(mantenimiento):
+    return (
+        f"Mantenimiento {mantenimiento.get_tipo_display()} de {mantenimiento.activo.nombre}",
+        mantenimiento.descripcion or ''
+    )
+
+
+def documento_local(local):
+    return local.nombre, local.ubicacion or ''
+
+
+# tipo -> (modelo, constructor del documento, relaciones, nombre de URL)
+ENTIDADES = {
+    'hardware': (Hardware, documento_hardware, ['activo'], 'hardware_detail'),
+    'software': (Software, documento_software, ['activo'], 'software_detail'),
+    'mantenimiento': (Mantenimiento, documento_mantenimiento, ['activo'], 'mantenimiento_detail'),
+    'local': (Local, documento_local, [], 'local_detail'),
+}
+
+
+def indexar(tipo, instancia):
+    """Crear o actualizar el documento de una instancia"""
+    constructor = ENTIDADES[tipo][1]
+    titulo, contenido = constructor(instancia)
+    DocumentoBusqueda.objects.update_or_create(
+        tipo=tipo,
+        objeto_id=instancia.pk,
+        defaults={'titulo': titulo[:255], 'contenido': contenido}
+    )
+
+
+def indexar_lote(tipo, instancias):
+    """Crear los documentos de instancias nuevas con un solo bulk_create"""
+    constructor = ENTIDADES[tipo][1]
+    documentos = []
+    for instancia in instancias:
+        titulo, contenido = constructor(instancia)
+        documentos.append(DocumentoBusqueda(
+            tipo=tipo,
+            objeto_id=instancia.pk,
+            titulo=titulo[:255],
+            contenido=contenido
+        ))
+    DocumentoBusqueda.objects.bulk_create(documentos)
+
+
+def eliminar(tipo, objeto_id):
+    """Eliminar el documento de una instancia"""
+    DocumentoBusqueda.objects.filter(tipo=tipo, objeto_id=objeto_id).delete()
+
+
+def reconstruir_indice(tamano_lote=1000):
+    """
+    Regenerar todos los documentos desde las tablas de origen.
+
+    Returns:
+        Diccionario con el número de documentos indexados por tipo
+    """
+    totales = {}
+
+    with transaction.atomic():
+        DocumentoBusqueda.objects.all().delete()
+
+        for tipo, (modelo, constructor, relaciones, _) in ENTIDADES.items():
+            lote = []
+            total = 0
+            queryset = modelo.objects.select_related(*relaciones)
+
+            for instancia in queryset.iterator(chunk_size=tamano_lote):
+                titulo, contenido = constructor(instancia)
+                lote.append(DocumentoBusqueda(
+                    tipo=tipo,
+                    objeto_id=instancia.pk,
+                    titulo=titulo[:255],
+                    contenido=contenido
+                ))
+                if len(lote) >= tamano_lote:
+                    DocumentoBusqueda.objects.bulk_create(lote)
+                    total += len(lote)
+                    lote = []
+
+            if lote:
+                DocumentoBusqueda.objects.bulk_create(lote)
+                total += len(lote)
+
+            totales[tipo] = total
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES('optimize')")
+
+    return totales
+
+
+def _terminos(texto):
+    """Separar el texto en términos alfanuméricos"""
+    return re.findall(r'\w+', texto.lower())
+
+
+def _buscar_sqlite(terminos, tipos, limite):
+    # Cada término como prefijo; FTS5 combina los términos con AND
+    consulta = ' '.join(f'"{termino}"*' for termino in terminos)
+    sql = (
+        f"SELECT d.tipo, d.objeto_id, d.titulo, bm25({TABLA_FTS}, 10.0, 1.0) AS puntuacion "
+        f"FROM {TABLA_FTS} JOIN busqueda_documentobusqueda d ON d.id = {TABLA_FTS}.rowid "
+        f"WHERE {TABLA_FTS} MATCH %s"
+    )
+    parametros = [consulta]
+    if tipos:
+        sql += f" AND d.tipo IN ({', '.join(['%s'] * len(tipos))})"
+        parametros.extend(tipos)
+    sql += " ORDER BY puntuacion LIMIT %s"
+    parametros.append(limite)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, parametros)
+        # bm25 devuelve valores negativos: menor es más relevante
+        return [(tipo, objeto_id, titulo, -puntuacion)
+                for tipo, objeto_id, titulo, puntuacion in cursor.fetchall()]
+
+
+def _buscar_postgres(terminos, tipos, limite):
+    consulta = ' & '.join(f'{termino}:*' for termino in terminos)
+    sql = (
+        "SELECT tipo, objeto_id, titulo, ts_rank(vector, q) AS puntuacion "
+        "FROM busqueda_documentobusqueda, to_tsquery('spanish', %s) q "
+        "WHERE vector @@ q"
+    )
+    parametros = [consulta]
+    if tipos:
+        sql += " AND tipo = ANY(%s)"
+        parametros.append(list(tipos))
+    sql += " ORDER BY puntuacion DESC LIMIT %s"
+    parametros.append(limite)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, parametros)
+        return cursor.fetchall()
+
+
+def _buscar_basico(terminos, tipos, limite):
+    queryset = DocumentoBusqueda.objects.all()
+    for termino in terminos:
+        queryset = queryset.filter(
+            Q(titulo__icontains=termino) | Q(contenido__icontains=termino))
+    if tipos:
+        queryset = queryset.filter(tipo__in=tipos)
+    return [(tipo, objeto_id, titulo, 1.0) for tipo, objeto_id, titulo in
+            queryset.values_list('tipo', 'objeto_id', 'titulo')[:limite]]
+
+
+def buscar(texto, tipos=None, limite=LIMITE_DEFECTO):
+    """
+    Buscar en el índice global.
+
+    Returns:
+        Lista de resultados ordenados por relevancia, cada uno con
+        tipo, id, titulo, url y puntuacion
+    """
+    terminos = _terminos(texto)
+    if not terminos:
+        return []
+
+    tipos = [tipo for tipo in (tipos or []) if tipo in ENTIDADES]
+    limite = max(1, min(int(limite), LIMITE_MAXIMO))
+
+    try:
+        if connection.vendor == 'sqlite':
+            filas = _buscar_sqlite(terminos, tipos, limite)
+        elif connection.vendor == 'postgresql':
+            filas = _buscar_postgres(terminos, tipos, limite)
+        else:
+            filas = _buscar_basico(terminos, tipos, limite)
+    except DatabaseError:
+        # Índice nativo no disponible (p. ej. sin migrar): búsqueda simple
+        filas = _buscar_basico(terminos, tipos, limite)
+
+    return [
+        {
+            'tipo': tipo,
+            'id': objeto_id,
+            'titulo': titulo,
+            'url': reverse(ENTIDADES[tipo][3], kwargs={'pk': objeto_id}),
+            'puntuacion': round(float(puntuacion), 4),
+        }
+        for tipo, objeto_id, titulo, puntuacion in filas
+    ]
@@ -0,0 +1,31 @@
+# busqueda/management/commands/rebuild_search_index.py
+import time
+
+from django.core.management.base import BaseCommand
+from busqueda.indexador import reconstruir_indice
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda global desde las tablas de origen'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Cantidad de documentos insertados por lote',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔎 Reconstruyendo índice de búsqueda...')
+
+        inicio = time.time()
+        totales = reconstruir_indice(tamano_lote=options['batch_size'])
+
+        for tipo, total in totales.items():
+            self.stdout.write(f'   ✓ {tipo}: {total} documentos')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Índice reconstruido en {time.time() - inicio:.2f} segundos')
+        )
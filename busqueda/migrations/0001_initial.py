@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoBusqueda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('hardware', 'Hardware'), ('software', 'Software'), ('mantenimiento', 'Mantenimiento'), ('local', 'Local')], max_length=20)),
+                ('objeto_id', models.BigIntegerField()),
+                ('titulo', models.CharField(max_length=255)),
+                ('contenido', models.TextField(blank=True, default='')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Documento de Búsqueda',
+                'verbose_name_plural': 'Documentos de Búsqueda',
+                'unique_together': {('tipo', 'objeto_id')},
+            },
+        ),
+    ]
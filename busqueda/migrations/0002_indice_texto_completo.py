@@ -0,0 +1,83 @@
+# Índices de texto completo según el motor de base de datos
+
+from django.db import migrations
+
+SQLITE_CREAR = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS busqueda_fts USING fts5(
+        titulo, contenido,
+        content='busqueda_documentobusqueda', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS busqueda_fts_ai AFTER INSERT ON busqueda_documentobusqueda BEGIN
+        INSERT INTO busqueda_fts(rowid, titulo, contenido)
+        VALUES (new.id, new.titulo, new.contenido);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS busqueda_fts_ad AFTER DELETE ON busqueda_documentobusqueda BEGIN
+        INSERT INTO busqueda_fts(busqueda_fts, rowid, titulo, contenido)
+        VALUES ('delete', old.id, old.titulo, old.contenido);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS busqueda_fts_au AFTER UPDATE ON busqueda_documentobusqueda BEGIN
+        INSERT INTO busqueda_fts(busqueda_fts, rowid, titulo, contenido)
+        VALUES ('delete', old.id, old.titulo, old.contenido);
+        INSERT INTO busqueda_fts(rowid, titulo, contenido)
+        VALUES (new.id, new.titulo, new.contenido);
+    END
+    """,
+]
+
+SQLITE_ELIMINAR = [
+    "DROP TRIGGER IF EXISTS busqueda_fts_ai",
+    "DROP TRIGGER IF EXISTS busqueda_fts_ad",
+    "DROP TRIGGER IF EXISTS busqueda_fts_au",
+    "DROP TABLE IF EXISTS busqueda_fts",
+]
+
+POSTGRES_CREAR = [
+    """
+    ALTER TABLE busqueda_documentobusqueda ADD COLUMN IF NOT EXISTS vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(contenido, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS busqueda_vector_gin ON busqueda_documentobusqueda USING GIN (vector)",
+]
+
+POSTGRES_ELIMINAR = [
+    "DROP INDEX IF EXISTS busqueda_vector_gin",
+    "ALTER TABLE busqueda_documentobusqueda DROP COLUMN IF EXISTS vector",
+]
+
+
+def _ejecutar(schema_editor, sentencias_por_motor):
+    sentencias = sentencias_por_motor.get(schema_editor.connection.vendor, [])
+    for sentencia in sentencias:
+        schema_editor.execute(sentencia)
+
+
+def crear_indice(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQLITE_CREAR,
+                              'postgresql': POSTGRES_CREAR})
+
+
+def eliminar_indice(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQLITE_ELIMINAR,
+                              'postgresql': POSTGRES_ELIMINAR})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('busqueda', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class DocumentoBusqueda(models.Model):
+    """
+    Documento desnormalizado del índice de búsqueda global.
+
+    En SQLite se replica en una tabla virtual FTS5 y en PostgreSQL se
+    indexa con un tsvector/GIN (ver busqueda/indexador.py).
+    """
+    TIPO_CHOICES = [
+        ('hardware', 'Hardware'),
+        ('software', 'Software'),
+        ('mantenimiento', 'Mantenimiento'),
+        ('local', 'Local'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
+    objeto_id = models.BigIntegerField()
+    titulo = models.CharField(max_length=255)
+    contenido = models.TextField(blank=True, default='')
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.titulo} ({self.get_tipo_display()})"
+
+    class Meta:
+        verbose_name = "Documento de Búsqueda"
+        verbose_name_plural = "Documentos de Búsqueda"
+        unique_together = ['tipo', 'objeto_id']
@@ -0,0 +1,61 @@
+# busqueda/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from inventario.models import Activo, Hardware, Software, Mantenimiento
+from locales.models import Local
+from . import indexador
+
+
+@receiver(post_save, sender=Hardware)
+def indexar_hardware(sender, instance, **kwargs):
+    """Mantener actualizado el documento del hardware"""
+    indexador.indexar('hardware', instance)
+
+
+@receiver(post_save, sender=Software)
+def indexar_software(sender, instance, **kwargs):
+    """Mantener actualizado el documento del software"""
+    indexador.indexar('software', instance)
+
+
+@receiver(post_save, sender=Mantenimiento)
+def indexar_mantenimiento(sender, instance, **kwargs):
+    """Mantener actualizado el documento del mantenimiento"""
+    indexador.indexar('mantenimiento', instance)
+
+
+@receiver(post_save, sender=Local)
+def indexar_local(sender, instance, **kwargs):
+    """Mantener actualizado el documento del local"""
+    indexador.indexar('local', instance)
+
+
+@receiver(post_save, sender=Activo)
+def indexar_activo(sender, instance, created, **kwargs):
+    """El nombre del activo forma parte de los documentos que dependen de él"""
+    if created:
+        # Aún no tiene hardware, software ni mantenimientos asociados
+        return
+
+    for modelo, tipo in ((Hardware, 'hardware'), (Software, 'software')):
+        detalle = modelo.objects.filter(activo=instance).first()
+        if detalle:
+            indexador.indexar(tipo, detalle)
+
+    for mantenimiento in instance.mantenimientos.all():
+        indexador.indexar('mantenimiento', mantenimiento)
+
+
+@receiver(post_delete, sender=Hardware)
+@receiver(post_delete, sender=Software)
+@receiver(post_delete, sender=Mantenimiento)
+@receiver(post_delete, sender=Local)
+def eliminar_documento(sender, instance, **kwargs):
+    """Eliminar del índice las instancias borradas"""
+    tipos = {
+        Hardware: 'hardware',
+        Software: 'software',
+        Mantenimiento: 'mantenimiento',
+        Local: 'local',
+    }
+    indexador.eliminar(tipos[sender], instance.pk)
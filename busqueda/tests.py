@@ -0,0 +1,102 @@
+# busqueda/tests.py
+"""
+Pruebas del índice de búsqueda global
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from busqueda.indexador import buscar, reconstruir_indice
+from busqueda.models import DocumentoBusqueda
+from inventario.models import Activo, Hardware, Mantenimiento
+from locales.models import Local
+from usuarios.models import Departamento
+
+
+class IndiceBusquedaTestCase(TestCase):
+    """
+    Pruebas de sincronización y consulta del índice
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.departamento = Departamento.objects.create(nombre="Búsqueda Test")
+        self.user = User.objects.create_user(
+            username='searchuser',
+            password='testpass123'
+        )
+
+        self.activo = Activo.objects.create(
+            tipo='hardware',
+            nombre='Servidor Principal',
+            fecha_adquisicion=date.today(),
+            valor_adquisicion=Decimal('5000.00'),
+            departamento=self.departamento,
+            creado_por=self.user
+        )
+        self.hardware = Hardware.objects.create(
+            activo=self.activo,
+            marca='Lenovo',
+            modelo='ThinkSystem',
+            numero_serie='SRV-0001'
+        )
+        Mantenimiento.objects.create(
+            activo=self.activo,
+            tipo='preventivo',
+            fecha_programada=date.today(),
+            descripcion='Limpieza de ventiladores'
+        )
+        Local.objects.create(
+            nombre='Laboratorio de Redes',
+            tipo='laboratorio',
+            ubicacion='Edificio Informática',
+            departamento=self.departamento
+        )
+
+    def test_senales_mantienen_indice(self):
+        """
+        CP-BUS-01: Verificar que las señales indexan, actualizan y eliminan documentos
+        """
+        resultados = buscar('lenovo')
+        self.assertEqual([(r['tipo'], r['id']) for r in resultados],
+                         [('hardware', self.activo.id)])
+
+        # Cambiar el nombre del activo actualiza los documentos dependientes
+        self.activo.nombre = 'Servidor Respaldo'
+        self.activo.save()
+        tipos = {r['tipo'] for r in buscar('respaldo')}
+        self.assertEqual(tipos, {'hardware', 'mantenimiento'})
+
+        self.activo.delete()
+        self.assertEqual(buscar('respaldo'), [])
+        self.assertFalse(DocumentoBusqueda.objects.filter(
+            tipo__in=['hardware', 'mantenimiento']).exists())
+
+    def test_busqueda_prefijo_y_acentos(self):
+        """
+        CP-BUS-02: Verificar búsqueda por prefijo e insensible a acentos
+        """
+        resultados = buscar('informatica lab')
+        self.assertEqual(len(resultados), 1)
+        self.assertEqual(resultados[0]['tipo'], 'local')
+        self.assertEqual(buscar('venti', tipos=['local']), [])
+
+    def test_reconstruir_indice_y_endpoint(self):
+        """
+        CP-BUS-03: Verificar reconstrucción del índice y endpoint global
+        """
+        DocumentoBusqueda.objects.all().delete()
+        totales = reconstruir_indice()
+        self.assertEqual(totales['hardware'], 1)
+        self.assertEqual(totales['local'], 1)
+
+        self.client.login(username='searchuser', password='testpass123')
+        response = self.client.get('/busqueda/', {'q': 'SRV-0001'})
+        self.assertEqual(response.status_code, 200)
+        datos = response.json()
+        self.assertEqual(datos['total'], 1)
+        self.assertEqual(datos['resultados'][0]['url'],
+                         f'/inventario/hardware/{self.activo.id}/')
@@ -0,0 +1,7 @@
+# busqueda/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.buscar_view, name='busqueda_global'),
+]
@@ -0,0 +1,24 @@
+# busqueda/views.py
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from .indexador import buscar, LIMITE_DEFECTO
+
+
+@login_required
+def buscar_view(request):
+    """Búsqueda global con resultados ordenados por relevancia"""
+    texto = request.GET.get('q', '').strip()
+    tipos = request.GET.getlist('tipo')
+
+    try:
+        limite = int(request.GET.get('limite', LIMITE_DEFECTO))
+    except ValueError:
+        limite = LIMITE_DEFECTO
+
+    resultados = buscar(texto, tipos=tipos, limite=limite) if len(texto) >= 2 else []
+
+    return JsonResponse({
+        'q': texto,
+        'total': len(resultados),
+        'resultados': resultados,
+    })
@@ -6,7 +6,8 @@ from django.forms import formset_factory
 from django.db import transaction, models
 from .models import Cuestionario, Pregunta, Diagnostico, Respuesta, IndicadorDiagnostico
 from .forms import CuestionarioForm, PreguntaForm, PreguntaInlineFormSet, DiagnosticoForm, RespuestaForm
-from usuarios.models import LogActividad, Departamento
+from usuarios.models import Departamento
+from usuarios.actividad import registrar_actividad
 
 
 @login_required
@@ -51,7 +52,7 @@ def cuestionario_create(request):
             cuestionario.save()
 
             # Registrar actividad
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion=f"Creación de cuestionario: {cuestionario.titulo}",
                 detalles=f"Cuestionario ID: {cuestionario.id}"
@@ -73,7 +74,7 @@ def cuestionario_detail(request, pk):
         cuestionario=cuestionario).order_by('orden')
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de cuestionario: {cuestionario.titulo}",
         detalles=f"Cuestionario ID: {cuestionario.id}"
@@ -99,7 +100,7 @@ def cuestionario_update(request, pk):
             formset.save()
 
             # Registrar actividad
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion=f"Actualización de cuestionario: {cuestionario.titulo}",
                 detalles=f"Cuestionario ID: {cuestionario.id}"
@@ -131,7 +132,7 @@ def cuestionario_delete(request, pk):
         cuestionario.delete()
 
         # Registrar actividad
-        LogActividad.objects.create(
+        registrar_actividad(
             usuario=request.user,
             accion=f"Eliminación de cuestionario: {titulo}",
             detalles=f"ID: {pk}"
@@ -236,7 +237,7 @@ def evaluacion_respuestas(request, pk):
                 calcular_indicadores(diagnostico)
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion=f"Evaluación completada",
                     detalles=f"Departamento: {diagnostico.departamento.nombre}"
@@ -273,7 +274,7 @@ def evaluacion_detail(request, pk):
     indicadores = IndicadorDiagnostico.objects.filter(diagnostico=diagnostico)
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de evaluación",
         detalles=f"Departamento: {diagnostico.departamento.nombre}"
@@ -297,7 +298,7 @@ def evaluacion_update(request, pk):
             diagnostico = form.save()
 
             # Registrar actividad
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion=f"Actualización de evaluación",
                 detalles=f"Departamento: {diagnostico.departamento.nombre}"
@@ -352,7 +353,7 @@ def indicador_detail(request, pk):
     indicador = get_object_or_404(IndicadorDiagnostico, pk=pk)
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de indicador: {indicador.nombre}",
         detalles=f"Departamento: {indicador.diagnostico.departamento.nombre}"
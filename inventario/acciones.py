@@ -0,0 +1,140 @@
+# inventario/acciones.py
+"""
+Acciones masivas sobre activos.
+
+Una acción (cambio de estado, traslado de departamento o baja) se aplica a
+todos los activos seleccionados con un único UPDATE ... WHERE y deja una
+sola entrada en el registro de actividad.
+
+QuerySet.update() no envía señales, así que aquí se replican sus efectos:
+los contadores de KPI se trasladan a partir de un conteo previo de la
+selección, se renueva la fecha_actualizacion del hardware y software (la
+usa la sincronización de la API) y se invalidan las cachés de dashboards y
+reportes. El índice de búsqueda no cambia: sus documentos no incluyen el
+estado ni el departamento.
+
+La fecha_actualizacion definitiva se escribe en la última sentencia antes de
+confirmar: con una selección grande la transacción dura segundos, y una
+fecha tomada al empezar podría quedar detrás del margen de la
+sincronización, que avanzaría su cursor sin haber visto estas filas.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Activo, Hardware, Software
+
+ACCIONES = [
+    ('estado', 'Cambiar estado'),
+    ('departamento', 'Trasladar a otro departamento'),
+    ('baja', 'Dar de baja'),
+]
+
+# Ids de activos que se anotan en el registro de actividad
+IDS_REGISTRADOS = 50
+
+
+class AccionNoValida(Exception):
+    """Faltan o no son válidos los datos de la acción"""
+
+
+def cambios_accion(accion, estado=None, departamento_id=None, fecha_baja=None, motivo_baja=None):
+    """
+    Campos de Activo que modifica una acción.
+
+    Raises:
+        AccionNoValida: si la acción es desconocida o le faltan datos
+    """
+    if accion == 'estado':
+        if estado not in dict(Activo.ESTADO_CHOICES):
+            raise AccionNoValida('Seleccione un estado válido.')
+        return {'estado': estado}
+
+    if accion == 'departamento':
+        if not departamento_id:
+            raise AccionNoValida('Seleccione el departamento de destino.')
+        return {'departamento_id': departamento_id}
+
+    if accion == 'baja':
+        return {
+            'estado': 'baja',
+            'fecha_baja': fecha_baja or timezone.localdate(),
+            'motivo_baja': motivo_baja or '',
+        }
+
+    raise AccionNoValida(f'Acción desconocida: {accion}')
+
+
+def describir_cambios(cambios):
+    """Texto legible de los cambios para mensajes y registro de actividad"""
+    from usuarios.models import Departamento
+
+    partes = []
+    if 'estado' in cambios:
+        partes.append(f"estado '{dict(Activo.ESTADO_CHOICES)[cambios['estado']]}'")
+    if 'departamento_id' in cambios:
+        nombre = Departamento.objects.filter(
+            pk=cambios['departamento_id']).values_list('nombre', flat=True).first()
+        partes.append(f"departamento '{nombre or cambios['departamento_id']}'")
+    if cambios.get('fecha_baja'):
+        partes.append(f"fecha de baja {cambios['fecha_baja']}")
+    if cambios.get('motivo_baja'):
+        partes.append(f"motivo '{cambios['motivo_baja']}'")
+    return ', '.join(partes)
+
+
+def aplicar_accion(activos, cambios, usuario=None, ip=None):
+    """
+    Aplicar los cambios a todos los activos del queryset.
+
+    Args:
+        activos: queryset de Activo con la selección (filtro o lista de ids)
+        cambios: campos y valores nuevos, ver cambios_accion()
+        usuario: autor del cambio (actualizado_por y registro de actividad)
+
+    Returns:
+        Número de activos modificados
+    """
+    from reportes import cache_dashboard, cache_reportes, kpis
+    from usuarios.actividad import registrar_actividad
+
+    activos = activos.order_by()
+    ahora = timezone.now()
+
+    with transaction.atomic():
+        # Primero los detalles: en SQLite esta escritura toma el bloqueo y el
+        # conteo siguiente ya no puede cambiar antes del UPDATE de los activos
+        for modelo in (Hardware, Software):
+            modelo.objects.filter(activo__in=activos).update(fecha_actualizacion=ahora)
+
+        ids = list(activos.values_list('pk', flat=True)[:IDS_REGISTRADOS + 1])
+        if not ids:
+            return 0
+        kpis.mover_activos(activos, cambios)
+
+        valores = dict(cambios, fecha_actualizacion=ahora)
+        if usuario is not None:
+            valores['actualizado_por'] = usuario
+        modificados = activos.update(**valores)
+
+        transaction.on_commit(cache_dashboard.invalidar)
+        cache_reportes.incrementar_version('inventario')
+
+        # Última sentencia: volver a sellar las filas con la hora del commit.
+        # La selección puede haber dejado de coincidir con su filtro (p. ej.
+        # por estado), así que se localizan por la fecha provisional
+        fin = timezone.now()
+        for modelo in (Activo, Hardware, Software):
+            modelo.objects.filter(fecha_actualizacion=ahora).update(fecha_actualizacion=fin)
+
+    if usuario is not None:
+        listado = ', '.join(str(pk) for pk in ids[:IDS_REGISTRADOS])
+        if len(ids) > IDS_REGISTRADOS:
+            listado += ', ...'
+        registrar_actividad(
+            usuario=usuario,
+            accion=f"Acción masiva sobre {modificados} activos: {describir_cambios(cambios)}",
+            detalles=f"IDs: {listado}",
+            ip=ip
+        )
+
+    return modificados
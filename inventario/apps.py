@@ -5,3 +5,14 @@ class InventarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'inventario'
     verbose_name = 'Gestión de Inventario'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+        from .basedatos import configurar_conexion
+
+        connection_created.connect(configurar_conexion, dispatch_uid='inventario.basedatos')
+
+        if getattr(settings, 'MANTENIMIENTO_PLANIFICADOR_AUTOMATICO', False):
+            from .planificador import iniciar_planificador
+            iniciar_planificador()
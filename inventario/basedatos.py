@@ -0,0 +1,131 @@
+# inventario/basedatos.py
+"""
+Perfil de producción de SQLite.
+
+Al abrir cada conexión (señal connection_created) se aplican los PRAGMA de
+PRAGMAS:
+    - journal_mode=WAL: los lectores no bloquean al escritor ni al revés
+    - synchronous=NORMAL: en WAL solo sincroniza el disco en los checkpoints;
+      un corte de luz puede perder las últimas transacciones, no corromper
+    - busy_timeout: milisegundos que una escritura espera al bloqueo antes
+      de fallar con "database is locked"
+    - mmap_size y cache_size: lecturas desde memoria mapeada y una caché de
+      páginas mayor (cache_size negativo se expresa en KiB)
+
+Una entrada de DATABASES puede sustituir los PRAGMA con la clave 'PRAGMAS'
+({} no aplica ninguno). Las conexiones se reutilizan (CONN_MAX_AGE), de modo
+que los PRAGMA se ejecutan una vez por conexión y no por petición. Además,
+OPTIONS['transaction_mode'] = 'IMMEDIATE' hace que cada atomic() tome el
+bloqueo de escritura al empezar: una transacción que lee y luego escribe ya
+no falla al no poder ampliar su bloqueo, sino que espera su turno.
+
+db_health informa del tamaño y la fragmentación y ejecuta ANALYZE y VACUUM
+incremental; medir_concurrencia compara el rendimiento con y sin el perfil.
+"""
+from django.conf import settings
+from django.db import connections
+
+PRAGMAS = getattr(settings, 'SQLITE_PRAGMAS', {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,  # KiB
+    'temp_store': 'MEMORY',
+})
+
+# Páginas liberadas por cada ejecución de VACUUM incremental
+PAGINAS_VACUUM = 1000
+
+
+def aplicar_pragmas(cursor, pragmas):
+    for nombre, valor in pragmas.items():
+        cursor.execute(f'PRAGMA {nombre} = {valor}')
+
+
+def configurar_conexion(sender, connection, **kwargs):
+    """Receptor de connection_created: PRAGMA de las conexiones SQLite"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS', PRAGMAS)
+    if pragmas:
+        with connection.cursor() as cursor:
+            aplicar_pragmas(cursor, pragmas)
+
+
+def _pragma(cursor, nombre):
+    cursor.execute(f'PRAGMA {nombre}')
+    return cursor.fetchone()[0]
+
+
+def estado(alias='default'):
+    """
+    Tamaño, fragmentación y configuración de una base de datos SQLite.
+
+    Returns:
+        Diccionario con las páginas totales y libres, el tamaño de página,
+        la fragmentación (páginas libres / totales), los modos de diario y
+        de auto_vacuum, y las tablas e índices más grandes
+    """
+    with connections[alias].cursor() as cursor:
+        paginas = _pragma(cursor, 'page_count')
+        libres = _pragma(cursor, 'freelist_count')
+        datos = {
+            'paginas': paginas,
+            'paginas_libres': libres,
+            'tamano_pagina': _pragma(cursor, 'page_size'),
+            'fragmentacion': libres / paginas if paginas else 0.0,
+            'journal_mode': _pragma(cursor, 'journal_mode'),
+            'auto_vacuum': {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}[_pragma(cursor, 'auto_vacuum')],
+            'objetos': [],
+        }
+        # dbstat solo existe si SQLite se compiló con SQLITE_ENABLE_DBSTAT_VTAB
+        try:
+            cursor.execute(
+                'SELECT name, COUNT(*), SUM(unused) * 1.0 / SUM(pgsize) FROM dbstat '
+                'GROUP BY name ORDER BY COUNT(*) DESC LIMIT 15')
+            datos['objetos'] = cursor.fetchall()
+        except Exception:
+            pass
+    return datos
+
+
+def analizar(alias='default'):
+    """Actualizar las estadísticas del planificador de consultas"""
+    with connections[alias].cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def activar_vacuum_incremental(alias='default'):
+    """
+    Pasar la base de datos a auto_vacuum=INCREMENTAL.
+
+    Requiere un VACUUM completo, que reescribe el archivo y bloquea la base
+    de datos mientras dura: ejecutarlo una sola vez, fuera de horario.
+    """
+    with connections[alias].cursor() as cursor:
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        cursor.execute('VACUUM')
+
+
+def vacuum_incremental(alias='default', paginas=PAGINAS_VACUUM):
+    """
+    Devolver al sistema hasta `paginas` páginas libres.
+
+    Returns:
+        Páginas liberadas (0 si auto_vacuum no es INCREMENTAL)
+    """
+    with connections[alias].cursor() as cursor:
+        if _pragma(cursor, 'auto_vacuum') != 2:
+            return 0
+        antes = _pragma(cursor, 'freelist_count')
+        cursor.execute(f'PRAGMA incremental_vacuum({int(paginas)})')
+        cursor.fetchall()
+        return antes - _pragma(cursor, 'freelist_count')
+
+
+def checkpoint(alias='default'):
+    """Copiar el WAL a la base de datos y truncarlo"""
+    with connections[alias].cursor() as cursor:
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return cursor.fetchone()
@@ -0,0 +1,288 @@
+# inventario/calendario.py
+"""
+Calendario de mantenimientos.
+
+Todas las consultas se limitan a la ventana pedida con un filtro por rango
+sobre fecha_programada, resuelto con los índices compuestos
+(fecha_programada, estado) y (responsable, fecha_programada):
+    - carga_diaria: conteos por día y responsable calculados con GROUP BY
+    - mantenimientos_en_rango: filas de la ventana, opcionalmente limitadas
+      a las primeras de cada día con ROW_NUMBER()
+    - feed_ical: documento iCalendar con los mantenimientos de un técnico
+
+El feed se sirve sin sesión (los clientes de calendario no la envían); la
+URL lleva el id del técnico firmado con SECRET_KEY, ver token_ical().
+"""
+import calendar
+from datetime import date, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .models import Mantenimiento
+
+VISTAS = [
+    ('semana', 'Semana'),
+    ('mes', 'Mes'),
+]
+
+# Rango máximo de la API de carga diaria
+DIAS_MAXIMOS = 366
+
+# Mantenimientos listados en cada día de la vista semanal
+MANTENIMIENTOS_POR_DIA = 8
+
+# Ventana del feed iCalendar alrededor de hoy
+ICAL_DIAS_ANTERIORES = 30
+ICAL_DIAS_POSTERIORES = 180
+
+SAL_ICAL = 'inventario.calendario.ical'
+
+# Fechas navegables: fuera de este margen el cálculo de la semana o del mes
+# anterior y siguiente se sale del rango de datetime.date
+FECHA_MINIMA = date(1900, 1, 1)
+FECHA_MAXIMA = date(2999, 12, 31)
+
+ESTADOS = [estado for estado, _ in Mantenimiento.ESTADO_CHOICES]
+
+# Estado del mantenimiento -> STATUS del VEVENT
+ESTADOS_ICAL = {
+    'programado': 'TENTATIVE',
+    'en_proceso': 'CONFIRMED',
+    'completado': 'CONFIRMED',
+    'cancelado': 'CANCELLED',
+}
+
+
+class RangoNoValido(Exception):
+    """Fechas del rango ausentes, mal formadas o fuera del máximo"""
+
+
+def rango_vista(vista, fecha):
+    """
+    Primer y último día de la semana (lunes a domingo) o del mes de `fecha`.
+    """
+    if vista == 'mes':
+        ultimo = calendar.monthrange(fecha.year, fecha.month)[1]
+        return fecha.replace(day=1), fecha.replace(day=ultimo)
+    inicio = fecha - timedelta(days=fecha.weekday())
+    return inicio, inicio + timedelta(days=6)
+
+
+def desplazar(vista, fecha, pasos):
+    """Fecha equivalente `pasos` semanas o meses antes o después"""
+    if vista == 'mes':
+        mes = fecha.month - 1 + pasos
+        anio = fecha.year + mes // 12
+        mes = mes % 12 + 1
+        return date(anio, mes, min(fecha.day, calendar.monthrange(anio, mes)[1]))
+    return fecha + timedelta(weeks=pasos)
+
+
+def parsear_rango(desde, hasta, maximo=DIAS_MAXIMOS):
+    """
+    Convertir las fechas ISO de un rango.
+
+    Raises:
+        RangoNoValido: si faltan, no son fechas o el rango es inválido
+    """
+    try:
+        desde = date.fromisoformat(desde)
+        hasta = date.fromisoformat(hasta)
+    except (TypeError, ValueError):
+        raise RangoNoValido('Indique desde y hasta como fechas AAAA-MM-DD.')
+    if hasta < desde:
+        raise RangoNoValido('La fecha final es anterior a la inicial.')
+    if (hasta - desde).days + 1 > maximo:
+        raise RangoNoValido(f'El rango no puede superar {maximo} días.')
+    return desde, hasta
+
+
+def _en_rango(desde, hasta, responsable_id=None):
+    queryset = Mantenimiento.objects.filter(fecha_programada__range=(desde, hasta))
+    if responsable_id:
+        queryset = queryset.filter(responsable_id=responsable_id)
+    return queryset
+
+
+def nombre_responsable(usuario):
+    if usuario is None:
+        return 'Sin asignar'
+    return usuario.get_full_name() or usuario.username
+
+
+def carga_diaria(desde, hasta, responsable_id=None):
+    """
+    Carga de trabajo por día y responsable.
+
+    Returns:
+        Lista ordenada por fecha de diccionarios con fecha, total y
+        responsables (id, nombre, total, costo_total y un conteo por estado)
+    """
+    conteos = {
+        estado: Count('id', filter=Q(estado=estado)) for estado in ESTADOS
+    }
+    filas = (
+        _en_rango(desde, hasta, responsable_id)
+        .values('fecha_programada', 'responsable_id')
+        .annotate(total=Count('id'), costo_total=Sum('costo'), **conteos)
+        .order_by('fecha_programada', 'responsable_id')
+    )
+
+    filas = list(filas)
+    usuarios = User.objects.in_bulk(
+        {fila['responsable_id'] for fila in filas if fila['responsable_id']})
+
+    dias = {}
+    for fila in filas:
+        fecha = fila.pop('fecha_programada')
+        responsable_id = fila.pop('responsable_id')
+        dia = dias.setdefault(fecha, {'fecha': fecha, 'total': 0, 'responsables': []})
+        dia['total'] += fila['total']
+        dia['responsables'].append(dict(
+            fila,
+            id=responsable_id,
+            nombre=nombre_responsable(usuarios.get(responsable_id)),
+        ))
+    return list(dias.values())
+
+
+def mantenimientos_en_rango(desde, hasta, responsable_id=None, por_dia=None):
+    """
+    Mantenimientos de la ventana ordenados por fecha.
+
+    Args:
+        por_dia: máximo de filas por día (None: todas)
+    """
+    queryset = _en_rango(desde, hasta, responsable_id).select_related(
+        'activo', 'responsable'
+    ).only(
+        'id', 'tipo', 'estado', 'fecha_programada', 'descripcion', 'fecha_actualizacion',
+        'activo__nombre', 'responsable__username',
+        'responsable__first_name', 'responsable__last_name',
+    ).order_by('fecha_programada', 'id')
+
+    if por_dia:
+        queryset = queryset.annotate(
+            posicion=Window(
+                RowNumber(),
+                partition_by=F('fecha_programada'),
+                order_by=F('id').asc(),
+            )
+        ).filter(posicion__lte=por_dia)
+    return queryset
+
+
+def semanas_calendario(desde, hasta, carga, mantenimientos=()):
+    """
+    Cuadrícula de semanas completas (lunes a domingo) que cubre el rango.
+
+    Args:
+        carga: resultado de carga_diaria() para el rango
+        mantenimientos: mantenimientos a mostrar en cada día
+
+    Returns:
+        Lista de semanas; cada día es un diccionario con fecha, en_rango,
+        carga y mantenimientos (los días fuera del rango quedan vacíos)
+    """
+    carga = {dia['fecha']: dia for dia in carga}
+    por_fecha = {}
+    for mantenimiento in mantenimientos:
+        por_fecha.setdefault(mantenimiento.fecha_programada, []).append(mantenimiento)
+
+    semanas = []
+    dia = desde - timedelta(days=desde.weekday())
+    while dia <= hasta:
+        semana = []
+        for _ in range(7):
+            semana.append({
+                'fecha': dia,
+                'en_rango': desde <= dia <= hasta,
+                'carga': carga.get(dia),
+                'mantenimientos': por_fecha.get(dia, []),
+            })
+            dia += timedelta(days=1)
+        semanas.append(semana)
+    return semanas
+
+
+def token_ical(usuario):
+    """Token firmado con el id del técnico para la URL de su feed"""
+    return signing.Signer(salt=SAL_ICAL).sign(str(usuario.pk))
+
+
+def usuario_de_token(token):
+    """
+    Técnico al que pertenece un token de feed.
+
+    Returns:
+        User activo, o None si el token no es válido
+    """
+    try:
+        pk = signing.Signer(salt=SAL_ICAL).unsign(token)
+    except signing.BadSignature:
+        return None
+    return User.objects.filter(pk=pk, is_active=True).first()
+
+
+def _escapar(texto):
+    return (str(texto).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _plegar(linea):
+    """Partir una línea en tramos de 75 octetos (RFC 5545, 3.1)"""
+    datos = linea.encode('utf-8')
+    if len(datos) <= 75:
+        return linea
+    partes = []
+    while datos:
+        corte = min(len(datos), 75 if not partes else 74)
+        # No partir un carácter multibyte
+        while corte < len(datos) and (datos[corte] & 0xC0) == 0x80:
+            corte -= 1
+        partes.append(datos[:corte].decode('utf-8'))
+        datos = datos[corte:]
+    return '\r\n '.join(partes)
+
+
+def feed_ical(usuario, url_detalle, hoy=None):
+    """
+    Documento iCalendar con los mantenimientos asignados a un técnico.
+
+    Args:
+        url_detalle: función que recibe un mantenimiento y devuelve su URL absoluta
+
+    Returns:
+        Texto del VCALENDAR, con saltos de línea CRLF
+    """
+    hoy = hoy or timezone.localdate()
+    desde = hoy - timedelta(days=ICAL_DIAS_ANTERIORES)
+    hasta = hoy + timedelta(days=ICAL_DIAS_POSTERIORES)
+
+    lineas = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//UCF//Inventario//ES',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escapar("Mantenimientos de " + nombre_responsable(usuario))}',
+    ]
+    for mantenimiento in mantenimientos_en_rango(desde, hasta, usuario.pk).iterator():
+        sello = mantenimiento.fecha_actualizacion.astimezone(dt_timezone.utc)
+        lineas += [
+            'BEGIN:VEVENT',
+            f'UID:mantenimiento-{mantenimiento.pk}@inventario-ucf',
+            f'DTSTAMP:{sello:%Y%m%dT%H%M%SZ}',
+            f'DTSTART;VALUE=DATE:{mantenimiento.fecha_programada:%Y%m%d}',
+            f'DTEND;VALUE=DATE:{mantenimiento.fecha_programada + timedelta(days=1):%Y%m%d}',
+            f'SUMMARY:{_escapar(f"{mantenimiento.get_tipo_display()}: {mantenimiento.activo.nombre}")}',
+            f'DESCRIPTION:{_escapar(mantenimiento.descripcion)}',
+            f'STATUS:{ESTADOS_ICAL[mantenimiento.estado]}',
+            f'URL:{url_detalle(mantenimiento)}',
+            'END:VEVENT',
+        ]
+    lineas.append('END:VCALENDAR')
+    return '\r\n'.join(_plegar(linea) for linea in lineas) + '\r\n'
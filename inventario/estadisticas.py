@@ -0,0 +1,92 @@
+# inventario/estadisticas.py
+"""
+Servicio de estadísticas para los dashboards.
+
+Calcula los indicadores del inventario con agregaciones condicionales sobre
+joins, en lugar de contar por separado y construir listas de ids.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Activo, Mantenimiento
+
+# Estados que se consideran en uso (todo menos 'baja')
+ESTADOS_VIGENTES = ['activo', 'en_mantenimiento', 'obsoleto']
+ESTADOS_PENDIENTES = ['programado', 'en_proceso']
+DIAS_AVISO_VENCIMIENTO = 30
+
+# Un activo forma parte del inventario si tiene detalle de hardware o software
+ES_INVENTARIO = Q(hardware__isnull=False) | Q(software__isnull=False)
+
+
+@dataclass(frozen=True)
+class ResumenInventario:
+    """Instantánea de los indicadores del inventario"""
+    total_activos: int = 0
+    total_hardware: int = 0
+    total_software: int = 0
+    mantenimientos_pendientes: int = 0
+    equipos_obsoletos: int = 0
+    software_vencer: int = 0
+    por_estado: dict = field(default_factory=dict)
+    por_departamento: list = field(default_factory=list)
+
+
+def activos_inventario():
+    """Activos con detalle de hardware o software"""
+    return Activo.objects.filter(ES_INVENTARIO)
+
+
+def obtener_resumen(limite_departamentos=5, hoy=None):
+    """
+    Calcular los indicadores del inventario.
+
+    Usa tres consultas: una agregación condicional sobre Activo (con joins
+    a Hardware y Software), otra sobre Mantenimiento y la agrupación por
+    departamento.
+    """
+    hoy = hoy or timezone.now().date()
+    limite_vencimiento = hoy + timedelta(days=DIAS_AVISO_VENCIMIENTO)
+
+    agregados = {
+        'total_activos': Count('id', filter=ES_INVENTARIO & ~Q(estado='baja')),
+        'total_hardware': Count('id', filter=Q(
+            hardware__isnull=False, estado__in=ESTADOS_VIGENTES)),
+        'total_software': Count('id', filter=Q(
+            software__isnull=False, estado__in=ESTADOS_VIGENTES)),
+        'equipos_obsoletos': Count('id', filter=Q(estado='obsoleto')),
+        'software_vencer': Count('id', filter=Q(
+            estado='activo',
+            software__fecha_vencimiento__gte=hoy,
+            software__fecha_vencimiento__lte=limite_vencimiento)),
+    }
+    for estado, _ in Activo.ESTADO_CHOICES:
+        agregados[f'estado_{estado}'] = Count(
+            'id', filter=ES_INVENTARIO & Q(estado=estado))
+
+    valores = Activo.objects.aggregate(**agregados)
+
+    pendientes = Mantenimiento.objects.aggregate(
+        total=Count('id', filter=Q(estado__in=ESTADOS_PENDIENTES))
+    )['total']
+
+    por_departamento = list(
+        activos_inventario().exclude(estado='baja').values(
+            'departamento__nombre'
+        ).annotate(total=Count('id')).order_by('-total')[:limite_departamentos]
+    )
+
+    por_estado = {
+        estado: valores.pop(f'estado_{estado}')
+        for estado, _ in Activo.ESTADO_CHOICES
+    }
+
+    return ResumenInventario(
+        mantenimientos_pendientes=pendientes,
+        por_estado=por_estado,
+        por_departamento=por_departamento,
+        **valores
+    )
@@ -289,3 +289,56 @@ class SoftwareForm(forms.ModelForm):
             # Capturar y reenviar la excepción para que se pueda mostrar en la vista
             print(f"Error guardando software: {str(e)}")
             raise
+
+
+class ImportacionForm(forms.Form):
+    archivo = forms.FileField(
+        label='Archivo',
+        help_text='CSV (separado por comas o punto y coma, UTF-8) o Excel .xlsx',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'})
+    )
+    simular = forms.BooleanField(
+        required=False,
+        label='Solo validar (no guardar)',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+
+
+class AccionMasivaForm(forms.Form):
+    accion = forms.ChoiceField(label='Acción', choices=[])
+    estado = forms.ChoiceField(
+        label='Nuevo estado', choices=[('', '---------')] + Activo.ESTADO_CHOICES, required=False)
+    departamento = forms.ModelChoiceField(
+        label='Departamento de destino', queryset=Departamento.objects.all(), required=False)
+    fecha_baja = forms.DateField(
+        label='Fecha de baja', required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    motivo_baja = forms.CharField(label='Motivo de baja', max_length=500, required=False)
+
+    def __init__(self, *args, **kwargs):
+        from .acciones import ACCIONES
+
+        super().__init__(*args, **kwargs)
+        self.fields['accion'].choices = ACCIONES
+        for field in self.fields.values():
+            field.widget.attrs['class'] = 'form-select' if isinstance(
+                field.widget, forms.Select) else 'form-control'
+
+    def clean(self):
+        from .acciones import AccionNoValida, cambios_accion
+
+        cleaned_data = super().clean()
+        if self.errors:
+            return cleaned_data
+
+        departamento = cleaned_data.get('departamento')
+        try:
+            cleaned_data['cambios'] = cambios_accion(
+                cleaned_data['accion'],
+                estado=cleaned_data.get('estado'),
+                departamento_id=departamento.pk if departamento else None,
+                fecha_baja=cleaned_data.get('fecha_baja'),
+                motivo_baja=cleaned_data.get('motivo_baja'),
+            )
+        except AccionNoValida as e:
+            raise forms.ValidationError(str(e))
+        return cleaned_data
@@ -0,0 +1,437 @@
+# inventario/importacion.py
+"""
+Importación masiva de hardware y software desde CSV o Excel.
+
+Las filas se leen y validan de una en una (el archivo nunca se carga
+completo en memoria) y las válidas se insertan con bulk_create en lotes,
+cada lote dentro de su propia transacción. Los departamentos y los números
+de serie existentes se leen con una consulta cada uno al empezar.
+
+bulk_create no envía señales, así que al final de cada lote se aplican en
+bloque los efectos que tendrían: contadores de KPI, documentos del índice de
+búsqueda y, al terminar, la versión de los datos cacheados.
+
+Columnas (la primera fila del archivo es la cabecera):
+    comunes: nombre, descripcion, fecha_adquisicion, valor_adquisicion,
+        estado, departamento (nombre o id), ubicacion
+    hardware: marca, modelo, numero_serie, especificaciones,
+        fecha_garantia, periodicidad_mantenimiento
+    software: version, tipo_licencia, clave_activacion,
+        fecha_vencimiento, numero_licencias
+"""
+import codecs
+import csv
+import io
+import logging
+import os
+import time
+from collections import Counter, namedtuple
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction
+
+from usuarios.models import Departamento
+from .models import Activo, Hardware, Software
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 1000
+MAXIMO_ERRORES = 1000
+VALOR_MAXIMO = Decimal('99999999.99')
+# Máximo de los campos enteros (IntegerField)
+ENTERO_MAXIMO = 2147483647
+
+# Codificaciones de CSV que se prueban en orden; las exportaciones de Excel
+# en español suelen venir en cp1252 y latin-1 acepta cualquier byte
+CODIFICACIONES_CSV = ['utf-8-sig', 'cp1252', 'latin-1']
+
+COLUMNAS_ACTIVO = [
+    'nombre', 'descripcion', 'fecha_adquisicion', 'valor_adquisicion',
+    'estado', 'departamento', 'ubicacion',
+]
+COLUMNAS_DETALLE = {
+    'hardware': [
+        'marca', 'modelo', 'numero_serie', 'especificaciones',
+        'fecha_garantia', 'periodicidad_mantenimiento',
+    ],
+    'software': [
+        'version', 'tipo_licencia', 'clave_activacion',
+        'fecha_vencimiento', 'numero_licencias',
+    ],
+}
+OBLIGATORIAS = {
+    'hardware': ['nombre', 'fecha_adquisicion', 'valor_adquisicion', 'departamento',
+                 'marca', 'modelo', 'numero_serie'],
+    'software': ['nombre', 'fecha_adquisicion', 'valor_adquisicion', 'departamento',
+                 'version', 'tipo_licencia'],
+}
+
+ErrorFila = namedtuple('ErrorFila', ['fila', 'mensaje'])
+
+
+class ArchivoNoValido(Exception):
+    """El archivo no se puede leer o le faltan columnas obligatorias"""
+
+
+@dataclass
+class ResultadoImportacion:
+    tipo: str
+    filas: int = 0
+    creados: int = 0
+    errores: list = field(default_factory=list)
+    errores_omitidos: int = 0
+    segundos: float = 0.0
+
+    @property
+    def total_errores(self):
+        return len(self.errores) + self.errores_omitidos
+
+
+# Lectura del archivo
+
+def _normalizar_cabecera(valor):
+    return str(valor or '').strip().lower().replace(' ', '_')
+
+
+def _codificacion_csv(archivo):
+    """
+    Primera codificación de CODIFICACIONES_CSV que decodifica el archivo
+    completo. Se comprueba antes de insertar nada: un error de decodificación
+    a mitad de la importación dejaría lotes ya guardados.
+    """
+    for codificacion in CODIFICACIONES_CSV:
+        decodificador = codecs.getincrementaldecoder(codificacion)()
+        archivo.seek(0)
+        try:
+            for bloque in iter(lambda: archivo.read(64 * 1024), b''):
+                decodificador.decode(bloque)
+            decodificador.decode(b'', final=True)
+        except UnicodeDecodeError:
+            continue
+        finally:
+            archivo.seek(0)
+        return codificacion
+    raise ArchivoNoValido('No se reconoce la codificación del archivo: guárdelo como CSV UTF-8.')
+
+
+def _filas_csv(archivo):
+    """Filas de un CSV; acepta coma o punto y coma como separador"""
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=',;')
+    except csv.Error:
+        dialecto = csv.excel
+    yield from csv.reader(archivo, dialecto)
+
+
+def _filas_excel(archivo):
+    from openpyxl import load_workbook
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        yield from libro.active.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def leer_filas(archivo, nombre):
+    """
+    Recorrer las filas de un archivo CSV o XLSX como diccionarios.
+
+    Args:
+        archivo: archivo abierto en modo binario
+        nombre: nombre del archivo, para distinguir el formato
+
+    Yields:
+        Tuplas (número de fila en el archivo, diccionario columna -> valor)
+    """
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension == '.xlsx':
+        filas = _filas_excel(archivo)
+    elif extension == '.csv':
+        codificacion = _codificacion_csv(archivo)
+        filas = _filas_csv(io.TextIOWrapper(archivo, encoding=codificacion, newline=''))
+    else:
+        raise ArchivoNoValido('Formato no soportado: use un archivo .csv o .xlsx.')
+
+    try:
+        cabecera = [_normalizar_cabecera(valor) for valor in next(filas)]
+    except StopIteration:
+        raise ArchivoNoValido('El archivo está vacío.')
+    except Exception as e:
+        raise ArchivoNoValido(f'No se pudo leer el archivo: {e}')
+
+    numero = 1
+    try:
+        for numero, valores in enumerate(filas, start=2):
+            if not any(valor not in (None, '') for valor in valores):
+                continue
+            yield numero, dict(zip(cabecera, valores))
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ArchivoNoValido(f'No se pudo leer el archivo después de la fila {numero}: {e}')
+
+
+# Conversión de valores
+
+def _texto(valor):
+    if valor is None:
+        return ''
+    return str(valor).strip()
+
+
+def _fecha(valor):
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    texto = _texto(valor)
+    for formato in ('%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    raise ValueError(f"fecha no válida '{texto}' (use AAAA-MM-DD o DD/MM/AAAA)")
+
+
+def _decimal(valor):
+    texto = _texto(valor)
+    if ',' in texto and '.' not in texto:
+        texto = texto.replace(',', '.')
+    try:
+        numero = Decimal(texto)
+        # NaN e infinito no son importes
+        if not numero.is_finite():
+            raise InvalidOperation
+        numero = numero.quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f"valor no válido '{texto}'")
+    if numero < 0 or numero > VALOR_MAXIMO:
+        raise ValueError(f"valor fuera de rango '{texto}'")
+    return numero
+
+
+def _entero(valor):
+    texto = _texto(valor)
+    try:
+        numero = int(float(texto)) if '.' in texto else int(texto)
+    except (ValueError, OverflowError):
+        raise ValueError(f"número entero no válido '{texto}'")
+    if numero < 0:
+        raise ValueError(f"número negativo '{texto}'")
+    if numero > ENTERO_MAXIMO:
+        raise ValueError(f"número fuera de rango '{texto}'")
+    return numero
+
+
+def _opcion(valor, opciones, campo):
+    """Aceptar la clave o la etiqueta de una opción, sin distinguir mayúsculas"""
+    texto = _texto(valor).lower()
+    for clave, etiqueta in opciones:
+        if texto in (clave, etiqueta.lower()):
+            return clave
+    raise ValueError(f"{campo} no válido '{_texto(valor)}'")
+
+
+class ImportadorActivos:
+    """
+    Importa hardware o software por lotes.
+
+    Usage:
+        importador = ImportadorActivos('hardware', usuario)
+        with open(ruta, 'rb') as archivo:
+            resultado = importador.importar(leer_filas(archivo, ruta))
+    """
+
+    def __init__(self, tipo, usuario=None, tamano_lote=TAMANO_LOTE, simular=False):
+        if tipo not in COLUMNAS_DETALLE:
+            raise ValueError(f'Tipo de activo desconocido: {tipo}')
+        self.tipo = tipo
+        self.modelo = Hardware if tipo == 'hardware' else Software
+        self.usuario = usuario
+        self.tamano_lote = tamano_lote
+        self.simular = simular
+
+    def _cargar_referencias(self):
+        """Departamentos y números de serie existentes, una consulta cada uno"""
+        self.departamentos = {}
+        for pk, nombre in Departamento.objects.values_list('id', 'nombre'):
+            self.departamentos[str(pk)] = pk
+            self.departamentos.setdefault(nombre.strip().lower(), pk)
+
+        self.series = set()
+        if self.tipo == 'hardware':
+            self.series = set(Hardware.objects.values_list('numero_serie', flat=True))
+
+    def validar(self, datos):
+        """
+        Convertir una fila en un par (Activo, detalle) sin guardar.
+
+        Raises:
+            ValueError: con la descripción de todos los problemas de la fila
+        """
+        problemas = []
+        faltantes = [campo for campo in OBLIGATORIAS[self.tipo] if not _texto(datos.get(campo))]
+        if faltantes:
+            raise ValueError(f"faltan datos obligatorios: {', '.join(faltantes)}")
+
+        def convertir(campo, conversor, *args, defecto=None):
+            if not _texto(datos.get(campo)):
+                return defecto
+            try:
+                return conversor(datos[campo], *args)
+            except ValueError as e:
+                problemas.append(f'{campo}: {e}')
+
+        departamento_id = self.departamentos.get(_texto(datos['departamento']).lower())
+        if departamento_id is None:
+            problemas.append(f"departamento no encontrado '{_texto(datos['departamento'])}'")
+
+        activo = Activo(
+            tipo=self.tipo,
+            nombre=_texto(datos['nombre'])[:200],
+            descripcion=_texto(datos.get('descripcion')),
+            fecha_adquisicion=convertir('fecha_adquisicion', _fecha),
+            valor_adquisicion=convertir('valor_adquisicion', _decimal),
+            estado=convertir('estado', _opcion, Activo.ESTADO_CHOICES, 'estado',
+                             defecto='activo'),
+            departamento_id=departamento_id,
+            ubicacion=_texto(datos.get('ubicacion'))[:100],
+            creado_por=self.usuario,
+            actualizado_por=self.usuario,
+        )
+
+        if self.tipo == 'hardware':
+            numero_serie = _texto(datos['numero_serie'])[:100]
+            if numero_serie in self.series:
+                problemas.append(f"número de serie duplicado '{numero_serie}'")
+            detalle = Hardware(
+                marca=_texto(datos['marca'])[:100],
+                modelo=_texto(datos['modelo'])[:100],
+                numero_serie=numero_serie,
+                especificaciones=_texto(datos.get('especificaciones')),
+                fecha_garantia=convertir('fecha_garantia', _fecha),
+                periodicidad_mantenimiento=convertir(
+                    'periodicidad_mantenimiento', _entero, defecto=180),
+            )
+        else:
+            detalle = Software(
+                version=_texto(datos['version'])[:50],
+                tipo_licencia=convertir('tipo_licencia', _opcion,
+                                        Software.TIPO_LICENCIA_CHOICES, 'tipo de licencia'),
+                clave_activacion=_texto(datos.get('clave_activacion'))[:200],
+                fecha_vencimiento=convertir('fecha_vencimiento', _fecha),
+                numero_licencias=convertir('numero_licencias', _entero, defecto=1),
+            )
+
+        if problemas:
+            raise ValueError('; '.join(problemas))
+
+        if self.tipo == 'hardware':
+            self.series.add(detalle.numero_serie)
+        return activo, detalle
+
+    def _insertar(self, lote):
+        """Guardar un lote de pares (Activo, detalle) en una transacción"""
+        from busqueda import indexador
+        from reportes import kpis
+
+        activos = [activo for activo, _ in lote]
+        with transaction.atomic():
+            Activo.objects.bulk_create(activos)
+            detalles = []
+            for activo, detalle in lote:
+                detalle.activo = activo
+                detalles.append(detalle)
+            self.modelo.objects.bulk_create(detalles)
+
+            # Efectos de las señales post_save de reportes y busqueda
+            claves = Counter(
+                tuple(sorted(kpis.clave_activo(activo, self.tipo).items()))
+                for activo in activos
+            )
+            for clave, cantidad in claves.items():
+                kpis.ajustar_activo(dict(clave), cantidad)
+            indexador.indexar_lote(self.tipo, detalles)
+
+    def _anotar_error(self, resultado, fila, mensaje):
+        if len(resultado.errores) < MAXIMO_ERRORES:
+            resultado.errores.append(ErrorFila(fila, mensaje))
+        else:
+            resultado.errores_omitidos += 1
+
+    def _guardar_lote(self, resultado, lote, numeros):
+        if self.simular:
+            resultado.creados += len(lote)
+            return
+        try:
+            self._insertar(lote)
+            resultado.creados += len(lote)
+        except IntegrityError as e:
+            # Otro proceso registró un número de serie del lote mientras tanto
+            self._anotar_error(
+                resultado, numeros[0],
+                f'lote de las filas {numeros[0]}-{numeros[-1]} descartado: {e}')
+
+    def importar(self, filas):
+        """
+        Validar e insertar las filas.
+
+        Args:
+            filas: iterable de (número de fila, diccionario), como leer_filas()
+
+        Returns:
+            ResultadoImportacion con los creados y los errores por fila
+        """
+        from reportes import cache_dashboard, cache_reportes
+
+        inicio = time.monotonic()
+        resultado = ResultadoImportacion(tipo=self.tipo)
+        self._cargar_referencias()
+
+        lote, numeros = [], []
+        columnas_revisadas = False
+        for numero, datos in filas:
+            if not columnas_revisadas:
+                faltantes = [campo for campo in OBLIGATORIAS[self.tipo] if campo not in datos]
+                if faltantes:
+                    raise ArchivoNoValido(
+                        f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+                columnas_revisadas = True
+
+            resultado.filas += 1
+            try:
+                lote.append(self.validar(datos))
+                numeros.append(numero)
+            except ValueError as e:
+                self._anotar_error(resultado, numero, str(e))
+                continue
+
+            if len(lote) >= self.tamano_lote:
+                self._guardar_lote(resultado, lote, numeros)
+                lote, numeros = [], []
+
+        if lote:
+            self._guardar_lote(resultado, lote, numeros)
+
+        if resultado.creados and not self.simular:
+            cache_dashboard.invalidar()
+            cache_reportes.incrementar_version('inventario')
+
+        resultado.segundos = time.monotonic() - inicio
+        logger.info('Importación de %s: %d filas, %d creados, %d errores, %.2f s',
+                    self.tipo, resultado.filas, resultado.creados,
+                    resultado.total_errores, resultado.segundos)
+        return resultado
+
+
+def escribir_errores(resultado, destino):
+    """Escribir el informe de errores como CSV (fila, error)"""
+    escritor = csv.writer(destino)
+    escritor.writerow(['fila', 'error'])
+    for error in resultado.errores:
+        escritor.writerow([error.fila, error.mensaje])
+    if resultado.errores_omitidos:
+        escritor.writerow(['', f'... y {resultado.errores_omitidos} errores más'])
@@ -0,0 +1,189 @@
+# inventario/listado.py
+"""
+Motor de listado compartido para hardware y software.
+
+Pagina por keyset (seek) sobre (fecha_adquisicion, id) en lugar de OFFSET,
+de modo que el coste de cada página no crece con el tamaño del inventario.
+"""
+from datetime import date
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Q
+
+# Tamaños de página (configurables desde settings)
+TAMANO_PAGINA_DEFECTO = getattr(settings, 'INVENTARIO_TAMANO_PAGINA', 25)
+TAMANO_PAGINA_MAXIMO = getattr(settings, 'INVENTARIO_TAMANO_PAGINA_MAXIMO', 200)
+
+# Campos de búsqueda por tipo de activo
+CAMPOS_BUSQUEDA_HARDWARE = [
+    'activo__nombre', 'marca', 'modelo', 'numero_serie'
+]
+CAMPOS_BUSQUEDA_SOFTWARE = [
+    'activo__nombre', 'version', 'tipo_licencia'
+]
+
+
+class PaginaKeyset:
+    """Página de resultados con los cursores para navegar"""
+
+    def __init__(self, elementos, cursor_siguiente=None, cursor_anterior=None):
+        self.elementos = elementos
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+
+    @property
+    def tiene_siguiente(self):
+        return self.cursor_siguiente is not None
+
+    @property
+    def tiene_anterior(self):
+        return self.cursor_anterior is not None
+
+    def __iter__(self):
+        return iter(self.elementos)
+
+    def __len__(self):
+        return len(self.elementos)
+
+
+def construir_busqueda(search, campos):
+    """Combinar la búsqueda sobre varios campos en una sola expresión Q"""
+    condicion = Q()
+    for campo in campos:
+        condicion |= Q(**{f'{campo}__icontains': search})
+    return condicion
+
+
+def codificar_cursor(fecha, pk):
+    """Codificar la posición (fecha, id) como texto para la URL"""
+    return f"{fecha.isoformat()}_{pk}"
+
+
+def decodificar_cursor(cursor):
+    """Decodificar un cursor; devuelve None si el valor no es válido"""
+    try:
+        fecha, pk = cursor.rsplit('_', 1)
+        return date.fromisoformat(fecha), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def obtener_tamano_pagina(valor):
+    """Normalizar el tamaño de página solicitado"""
+    try:
+        tamano = int(valor)
+    except (TypeError, ValueError):
+        return TAMANO_PAGINA_DEFECTO
+    return max(1, min(tamano, TAMANO_PAGINA_MAXIMO))
+
+
+def paginar_keyset(queryset, tamano, despues=None, antes=None,
+                   campo_fecha='activo__fecha_adquisicion', campo_id='activo_id'):
+    """
+    Paginar un queryset en orden descendente de (fecha, id).
+
+    Args:
+        despues: cursor del último elemento de la página anterior
+        antes: cursor del primer elemento de la página siguiente
+    """
+    orden = [f'-{campo_fecha}', f'-{campo_id}']
+    posicion_antes = decodificar_cursor(antes) if antes else None
+    posicion_despues = decodificar_cursor(despues) if despues else None
+
+    if posicion_antes:
+        # Retroceder: recorrer en orden ascendente y luego invertir
+        fecha, pk = posicion_antes
+        queryset = queryset.filter(
+            Q(**{f'{campo_fecha}__gt': fecha}) |
+            Q(**{campo_fecha: fecha, f'{campo_id}__gt': pk})
+        ).order_by(campo_fecha, campo_id)
+        filas = list(queryset[:tamano + 1])
+        hay_mas = len(filas) > tamano
+        filas = filas[:tamano][::-1]
+        hay_siguiente, hay_anterior = True, hay_mas
+    else:
+        if posicion_despues:
+            fecha, pk = posicion_despues
+            queryset = queryset.filter(
+                Q(**{f'{campo_fecha}__lt': fecha}) |
+                Q(**{campo_fecha: fecha, f'{campo_id}__lt': pk})
+            )
+        filas = list(queryset.order_by(*orden)[:tamano + 1])
+        hay_siguiente = len(filas) > tamano
+        filas = filas[:tamano]
+        hay_anterior = posicion_despues is not None
+
+    def cursor_de(fila):
+        return codificar_cursor(_resolver(fila, campo_fecha), _resolver(fila, campo_id))
+
+    return PaginaKeyset(
+        filas,
+        cursor_siguiente=cursor_de(filas[-1]) if filas and hay_siguiente else None,
+        cursor_anterior=cursor_de(filas[0]) if filas and hay_anterior else None,
+    )
+
+
+def _resolver(obj, ruta):
+    """Obtener el valor de una ruta tipo 'activo__fecha_adquisicion'"""
+    for parte in ruta.split('__'):
+        obj = getattr(obj, parte)
+    return obj
+
+
+def filtrar_activos(queryset, parametros, campos_busqueda):
+    """Aplicar la búsqueda y los filtros de departamento y estado de un listado"""
+    search = parametros.get('search', '')
+    departamento = parametros.get('departamento', '')
+    estado = parametros.get('estado', '')
+
+    if search:
+        queryset = queryset.filter(construir_busqueda(search, campos_busqueda))
+
+    if departamento:
+        queryset = queryset.filter(activo__departamento_id=departamento)
+
+    if estado:
+        queryset = queryset.filter(activo__estado=estado)
+
+    return queryset
+
+
+def listar_activos(request, queryset, campos_busqueda):
+    """
+    Aplicar filtros, búsqueda y paginación keyset a un listado de activos.
+
+    Devuelve el contexto común para las plantillas de listado.
+    """
+    search = request.GET.get('search', '')
+    departamento = request.GET.get('departamento', '')
+    estado = request.GET.get('estado', '')
+    tamano = obtener_tamano_pagina(request.GET.get('por_pagina'))
+
+    queryset = filtrar_activos(queryset, request.GET, campos_busqueda)
+
+    pagina = paginar_keyset(
+        queryset,
+        tamano,
+        despues=request.GET.get('despues'),
+        antes=request.GET.get('antes'),
+    )
+
+    # Parámetros a conservar en los enlaces de paginación
+    filtros = {
+        clave: valor for clave, valor in (
+            ('search', search),
+            ('departamento', departamento),
+            ('estado', estado),
+            ('por_pagina', request.GET.get('por_pagina', '')),
+        ) if valor
+    }
+
+    return {
+        'pagina': pagina,
+        'search': search,
+        'departamento': departamento,
+        'estado': estado,
+        'por_pagina': tamano,
+        'query_filtros': urlencode(filtros),
+    }
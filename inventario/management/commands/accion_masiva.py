@@ -0,0 +1,103 @@
+# inventario/management/commands/accion_masiva.py
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.acciones import (
+    ACCIONES, AccionNoValida, aplicar_accion, cambios_accion, describir_cambios
+)
+from inventario.models import Activo
+from usuarios.models import Departamento
+
+
+class Command(BaseCommand):
+    help = 'Cambia el estado, traslada o da de baja varios activos con una sola actualización'
+
+    def add_arguments(self, parser):
+        parser.add_argument('accion', choices=[clave for clave, _ in ACCIONES])
+
+        seleccion = parser.add_argument_group('selección de activos')
+        seleccion.add_argument('--ids', help='Ids de activos separados por comas')
+        seleccion.add_argument('--tipo', choices=['hardware', 'software'])
+        seleccion.add_argument('--en-estado', help='Solo activos en este estado')
+        seleccion.add_argument('--en-departamento', type=int,
+                               help='Solo activos de este departamento (id)')
+        seleccion.add_argument('--ubicacion', help='Solo activos con esta ubicación')
+
+        datos = parser.add_argument_group('datos de la acción')
+        datos.add_argument('--estado', help='Nuevo estado (acción estado)')
+        datos.add_argument('--departamento', type=int,
+                           help='Departamento de destino (acción departamento)')
+        datos.add_argument('--fecha-baja', type=date.fromisoformat,
+                           help='Fecha de baja AAAA-MM-DD (por defecto hoy)')
+        datos.add_argument('--motivo', help='Motivo de baja')
+
+        parser.add_argument('--usuario', help='Usuario que figura como autor del cambio')
+        parser.add_argument(
+            '--simular',
+            action='store_true',
+            help='Mostrar cuántos activos se modificarían sin modificar nada',
+        )
+
+    def seleccionar(self, options):
+        activos = Activo.objects.all()
+        filtrado = False
+
+        if options['ids']:
+            try:
+                ids = [int(valor) for valor in options['ids'].split(',') if valor.strip()]
+            except ValueError:
+                raise CommandError('--ids debe ser una lista de números separados por comas')
+            activos = activos.filter(pk__in=ids)
+            filtrado = True
+        if options['tipo']:
+            activos = activos.filter(tipo=options['tipo'])
+            filtrado = True
+        if options['en_estado']:
+            activos = activos.filter(estado=options['en_estado'])
+            filtrado = True
+        if options['en_departamento']:
+            activos = activos.filter(departamento_id=options['en_departamento'])
+            filtrado = True
+        if options['ubicacion']:
+            activos = activos.filter(ubicacion=options['ubicacion'])
+            filtrado = True
+
+        if not filtrado:
+            raise CommandError('Indique al menos un criterio de selección (--ids, --tipo, --en-estado...)')
+        return activos
+
+    def handle(self, *args, **options):
+        try:
+            cambios = cambios_accion(
+                options['accion'],
+                estado=options['estado'],
+                departamento_id=options['departamento'],
+                fecha_baja=options['fecha_baja'],
+                motivo_baja=options['motivo'],
+            )
+        except AccionNoValida as e:
+            raise CommandError(str(e))
+
+        departamento = options['departamento']
+        if departamento is not None and not Departamento.objects.filter(pk=departamento).exists():
+            raise CommandError(f'No existe el departamento {departamento}')
+
+        usuario = None
+        if options['usuario']:
+            try:
+                usuario = User.objects.get(username=options['usuario'])
+            except User.DoesNotExist:
+                raise CommandError(f"No existe el usuario '{options['usuario']}'")
+
+        activos = self.seleccionar(options)
+        self.stdout.write(f'🛠️  Aplicando {describir_cambios(cambios)}...')
+
+        if options['simular']:
+            self.stdout.write(
+                self.style.WARNING(f'   ⚠ Simulación: se modificarían {activos.count()} activos'))
+            return
+
+        modificados = aplicar_accion(activos, cambios, usuario=usuario)
+        self.stdout.write(self.style.SUCCESS(f'\n✅ {modificados} activos actualizados'))
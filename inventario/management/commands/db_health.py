@@ -0,0 +1,71 @@
+# inventario/management/commands/db_health.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from inventario.basedatos import (
+    PAGINAS_VACUUM, activar_vacuum_incremental, analizar, checkpoint, estado, vacuum_incremental
+)
+
+
+class Command(BaseCommand):
+    help = 'Informa del tamaño y la fragmentación de la base de datos SQLite y ejecuta su mantenimiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Alias de la base de datos (por defecto default)',
+        )
+        parser.add_argument(
+            '--mantener',
+            action='store_true',
+            help='Ejecutar ANALYZE, VACUUM incremental y un checkpoint del WAL',
+        )
+        parser.add_argument(
+            '--paginas',
+            type=int,
+            default=PAGINAS_VACUUM,
+            help=f'Páginas liberadas como máximo por el VACUUM incremental (por defecto {PAGINAS_VACUUM})',
+        )
+        parser.add_argument(
+            '--activar-incremental',
+            action='store_true',
+            help='Pasar a auto_vacuum=INCREMENTAL con un VACUUM completo (bloquea la base de datos)',
+        )
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        if connections[alias].vendor != 'sqlite':
+            raise CommandError(f'La base de datos {alias} no es SQLite')
+
+        if options['activar_incremental']:
+            self.stdout.write('🔧 Activando auto_vacuum=INCREMENTAL (VACUUM completo)...')
+            activar_vacuum_incremental(alias)
+
+        datos = estado(alias)
+        tamano = datos['paginas'] * datos['tamano_pagina'] / 1024 / 1024
+        self.stdout.write(f'📊 Base de datos {alias}:')
+        self.stdout.write(f'   ✓ Páginas: {datos["paginas"]} de {datos["tamano_pagina"]} bytes ({tamano:.1f} MB)')
+        self.stdout.write(
+            f'   ✓ Páginas libres: {datos["paginas_libres"]} ({datos["fragmentacion"]:.1%} de fragmentación)')
+        self.stdout.write(f'   ✓ journal_mode: {datos["journal_mode"]}, auto_vacuum: {datos["auto_vacuum"]}')
+        for nombre, paginas, sin_uso in datos['objetos']:
+            self.stdout.write(f'     {nombre}: {paginas} páginas ({sin_uso or 0:.0%} sin usar)')
+
+        if datos['auto_vacuum'] != 'INCREMENTAL':
+            self.stdout.write(self.style.WARNING(
+                '   ⚠ auto_vacuum no es INCREMENTAL: el VACUUM incremental no libera páginas '
+                '(ver --activar-incremental)'))
+
+        if not options['mantener']:
+            return
+
+        self.stdout.write('\n🧹 Mantenimiento...')
+        analizar(alias)
+        self.stdout.write('   ✓ ANALYZE completado')
+        liberadas = vacuum_incremental(alias, options['paginas'])
+        self.stdout.write(f'   ✓ VACUUM incremental: {liberadas} páginas liberadas')
+        if datos['journal_mode'] == 'wal':
+            bloqueado, paginas_wal, copiadas = checkpoint(alias)
+            self.stdout.write(f'   ✓ Checkpoint del WAL: {copiadas} de {paginas_wal} páginas copiadas')
+        self.stdout.write(self.style.SUCCESS('\n✅ Mantenimiento completado'))
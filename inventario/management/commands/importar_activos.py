@@ -0,0 +1,84 @@
+# inventario/management/commands/importar_activos.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.importacion import (
+    TAMANO_LOTE, ArchivoNoValido, ImportadorActivos, escribir_errores, leer_filas
+)
+from usuarios.actividad import registrar_actividad
+
+
+class Command(BaseCommand):
+    help = 'Importa hardware o software desde un archivo CSV o XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=['hardware', 'software'])
+        parser.add_argument('archivo', help='Ruta del archivo .csv o .xlsx')
+        parser.add_argument(
+            '--usuario',
+            help='Nombre del usuario que figura como creador de los activos',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Filas insertadas por transacción (por defecto {TAMANO_LOTE})',
+        )
+        parser.add_argument(
+            '--errores',
+            help='Ruta del CSV donde escribir el informe de errores por fila',
+        )
+        parser.add_argument(
+            '--simular',
+            action='store_true',
+            help='Validar el archivo sin guardar nada',
+        )
+
+    def handle(self, *args, **options):
+        usuario = None
+        if options['usuario']:
+            try:
+                usuario = User.objects.get(username=options['usuario'])
+            except User.DoesNotExist:
+                raise CommandError(f"No existe el usuario '{options['usuario']}'")
+
+        tipo, ruta = options['tipo'], options['archivo']
+        self.stdout.write(f'📥 Importando {tipo} desde {ruta}...')
+
+        importador = ImportadorActivos(
+            tipo, usuario, tamano_lote=options['lote'], simular=options['simular'])
+        try:
+            with open(ruta, 'rb') as archivo:
+                resultado = importador.importar(leer_filas(archivo, ruta))
+        except OSError as e:
+            raise CommandError(f'No se pudo abrir el archivo: {e}')
+        except ArchivoNoValido as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f'   ✓ Filas leídas: {resultado.filas}')
+        self.stdout.write(f'   ✓ Activos creados: {resultado.creados}')
+        self.stdout.write(f'   ✓ Tiempo: {resultado.segundos:.2f} segundos')
+
+        if resultado.total_errores:
+            self.stdout.write(
+                self.style.WARNING(f'   ⚠ Filas con errores: {resultado.total_errores}'))
+            if options['errores']:
+                with open(options['errores'], 'w', newline='', encoding='utf-8') as destino:
+                    escribir_errores(resultado, destino)
+                self.stdout.write(f"   ✓ Informe de errores: {options['errores']}")
+            else:
+                for error in resultado.errores[:20]:
+                    self.stdout.write(f'     Fila {error.fila}: {error.mensaje}')
+
+        if options['simular']:
+            self.stdout.write(self.style.WARNING('\n⚠ Simulación: no se guardó ningún activo'))
+            return
+
+        if usuario and resultado.creados:
+            registrar_actividad(
+                usuario=usuario,
+                accion=f"Importación masiva de {tipo}: {resultado.creados} activos",
+                detalles=f"Archivo {ruta}; {resultado.total_errores} filas con errores"
+            )
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Importación completada'))
@@ -0,0 +1,118 @@
+# inventario/management/commands/medir_concurrencia.py
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from inventario.basedatos import PRAGMAS
+from usuarios.models import LogActividad
+
+# Perfiles comparados: los valores por defecto de Django y el de producción
+PERFILES = [
+    ('Django por defecto', {}, {}),
+    ('Producción (WAL)', {'transaction_mode': 'IMMEDIATE'}, PRAGMAS),
+]
+
+
+class Command(BaseCommand):
+    help = 'Mide escrituras concurrentes en el registro de actividad con y sin el perfil de SQLite'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hilos',
+            type=int,
+            default=8,
+            help='Hilos que escriben a la vez (por defecto 8)',
+        )
+        parser.add_argument(
+            '--operaciones',
+            type=int,
+            default=200,
+            help='Operaciones por hilo (por defecto 200)',
+        )
+
+    def handle(self, *args, **options):
+        hilos = options['hilos']
+        operaciones = options['operaciones']
+        directorio = tempfile.mkdtemp()
+
+        self.stdout.write(f'⏱️  Midiendo {hilos} hilos x {operaciones} operaciones por perfil...')
+        self.stdout.write('   (la mitad son atomic() que leen y luego escriben, como las vistas)')
+
+        resultados = []
+        try:
+            for indice, (nombre, opciones, pragmas) in enumerate(PERFILES):
+                alias = f'medicion_{indice}'
+                connections.settings[alias] = dict(
+                    connections.settings['default'],
+                    NAME=os.path.join(directorio, f'{alias}.sqlite3'),
+                    OPTIONS=opciones,
+                    PRAGMAS=pragmas,
+                    CONN_MAX_AGE=0,
+                )
+                try:
+                    resultado = self.medir(alias, hilos, operaciones)
+                finally:
+                    connections[alias].close()
+                resultados.append(resultado)
+                por_segundo, errores, segundos = resultado
+                self.stdout.write(
+                    f'   ✓ {nombre}: {por_segundo:.0f} operaciones/s, '
+                    f'{errores} errores "database is locked" ({segundos:.2f} s)')
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+        base, ajustado = resultados[0][0], resultados[1][0]
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Rendimiento con el perfil de producción: x{ajustado / base:.2f}'))
+
+    def medir(self, alias, hilos, operaciones):
+        """
+        Returns:
+            (operaciones completadas por segundo, errores, segundos)
+        """
+        with connections[alias].schema_editor() as editor:
+            editor.create_model(User)
+            editor.create_model(LogActividad)
+        # bulk_create: sin las señales que crean el perfil (su tabla no existe aquí)
+        usuarios = User.objects.using(alias).bulk_create(
+            User(username=f'medicion{numero}') for numero in range(hilos))
+
+        completadas = [0] * hilos
+        errores = [0] * hilos
+        salida = threading.Barrier(hilos + 1)
+
+        def trabajar(numero):
+            usuario = usuarios[numero]
+            salida.wait()
+            try:
+                for operacion in range(operaciones):
+                    try:
+                        if operacion % 2:
+                            LogActividad.objects.using(alias).create(
+                                usuario=usuario, accion='Medición')
+                        else:
+                            with transaction.atomic(using=alias):
+                                LogActividad.objects.using(alias).filter(usuario=usuario).count()
+                                LogActividad.objects.using(alias).create(
+                                    usuario=usuario, accion='Medición en transacción')
+                        completadas[numero] += 1
+                    except OperationalError:
+                        errores[numero] += 1
+            finally:
+                connections[alias].close()
+
+        trabajadores = [threading.Thread(target=trabajar, args=(numero,)) for numero in range(hilos)]
+        for trabajador in trabajadores:
+            trabajador.start()
+        salida.wait()
+        inicio = time.perf_counter()
+        for trabajador in trabajadores:
+            trabajador.join()
+        segundos = time.perf_counter() - inicio
+        return sum(completadas) / segundos, sum(errores), segundos
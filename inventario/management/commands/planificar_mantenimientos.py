@@ -0,0 +1,43 @@
+# inventario/management/commands/planificar_mantenimientos.py
+from django.core.management.base import BaseCommand
+
+from inventario.planificador import DIAS_ANTICIPACION, TAMANO_LOTE, planificar
+
+
+class Command(BaseCommand):
+    help = 'Genera los mantenimientos preventivos que vencen según la periodicidad de cada hardware'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--anticipacion',
+            type=int,
+            default=DIAS_ANTICIPACION,
+            help=f'Días antes del vencimiento en que se genera la orden (por defecto {DIAS_ANTICIPACION})',
+        )
+        parser.add_argument(
+            '--completo',
+            action='store_true',
+            help='Recalcular los planes de todo el hardware, no solo los que cambiaron',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Registros escritos por consulta (por defecto {TAMANO_LOTE})',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🗓️  Planificando mantenimientos preventivos...')
+
+        resultado = planificar(
+            anticipacion=options['anticipacion'],
+            completo=options['completo'],
+            tamano_lote=options['lote'],
+        )
+
+        self.stdout.write(f'   ✓ Planes recalculados: {resultado.recalculados}')
+        self.stdout.write(f'   ✓ Mantenimientos generados: {resultado.generados}')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Planificación completada en {resultado.segundos:.2f} segundos')
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0002_remove_hardware_proveedor_remove_software_proveedor_and_more'),
+        ('usuarios', '0002_remove_perfilusuario_cargo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(fields=['-fecha_adquisicion', '-id'], name='activo_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(fields=['estado', '-fecha_adquisicion', '-id'], name='activo_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(fields=['departamento', '-fecha_adquisicion', '-id'], name='activo_depto_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(fields=['nombre'], name='activo_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardware',
+            index=models.Index(fields=['marca', 'modelo'], name='hardware_marca_modelo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['version'], name='software_version_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['tipo_licencia'], name='software_licencia_idx'),
+        ),
+    ]
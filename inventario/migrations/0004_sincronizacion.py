@@ -0,0 +1,47 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0003_indices_listado'),
+        ('usuarios', '0004_archivo_log_actividad'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hardware',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='mantenimiento',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='software',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='activo',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='activo_cambio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hardware',
+            index=models.Index(fields=['fecha_actualizacion', 'activo'], name='hardware_cambio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mantenimiento',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='mantenimiento_cambio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='software',
+            index=models.Index(fields=['fecha_actualizacion', 'activo'], name='software_cambio_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0004_sincronizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlanMantenimiento',
+            fields=[
+                ('hardware', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='plan_mantenimiento', serialize=False, to='inventario.hardware')),
+                ('ultimo_mantenimiento', models.DateField(blank=True, null=True)),
+                ('proxima_fecha', models.DateField()),
+                ('fecha_calculo', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Plan de Mantenimiento',
+                'verbose_name_plural': 'Planes de Mantenimiento',
+                'indexes': [models.Index(fields=['proxima_fecha'], name='plan_proxima_fecha_idx')],
+            },
+        ),
+    ]
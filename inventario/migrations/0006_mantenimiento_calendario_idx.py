@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0005_planmantenimiento'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mantenimiento',
+            index=models.Index(fields=['fecha_programada', 'estado'], name='mantenimiento_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mantenimiento',
+            index=models.Index(fields=['responsable', 'fecha_programada'], name='mantenimiento_resp_fecha_idx'),
+        ),
+    ]
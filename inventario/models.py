@@ -43,6 +43,20 @@ class Activo(models.Model):
         verbose_name = "Activo"
         verbose_name_plural = "Activos"
         ordering = ['-fecha_adquisicion']
+        indexes = [
+            # Paginación keyset de los listados
+            models.Index(fields=['-fecha_adquisicion', '-id'],
+                         name='activo_fecha_id_idx'),
+            models.Index(fields=['estado', '-fecha_adquisicion', '-id'],
+                         name='activo_estado_fecha_idx'),
+            models.Index(fields=['departamento', '-fecha_adquisicion', '-id'],
+                         name='activo_depto_fecha_idx'),
+            # Búsqueda
+            models.Index(fields=['nombre'], name='activo_nombre_idx'),
+            # Sincronización incremental (api/sincronizacion.py)
+            models.Index(fields=['fecha_actualizacion', 'id'],
+                         name='activo_cambio_idx'),
+        ]
 
 
 class Hardware(models.Model):
@@ -55,6 +69,8 @@ class Hardware(models.Model):
     fecha_garantia = models.DateField(blank=True, null=True)
     periodicidad_mantenimiento = models.IntegerField(
         help_text="Periodicidad en días", default=180)
+    # También se actualiza al guardar el activo (ver api/signals.py)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.activo.nombre} - {self.marca} {self.modelo}"
@@ -62,6 +78,12 @@ class Hardware(models.Model):
     class Meta:
         verbose_name = "Hardware"
         verbose_name_plural = "Hardware"
+        indexes = [
+            models.Index(fields=['marca', 'modelo'],
+                         name='hardware_marca_modelo_idx'),
+            models.Index(fields=['fecha_actualizacion', 'activo'],
+                         name='hardware_cambio_idx'),
+        ]
 
 
 class Software(models.Model):
@@ -80,6 +102,8 @@ class Software(models.Model):
     clave_activacion = models.CharField(max_length=200, blank=True, null=True)
     fecha_vencimiento = models.DateField(blank=True, null=True)
     numero_licencias = models.IntegerField(default=1)
+    # También se actualiza al guardar el activo (ver api/signals.py)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.activo.nombre} - v{self.version}"
@@ -87,6 +111,13 @@ class Software(models.Model):
     class Meta:
         verbose_name = "Software"
         verbose_name_plural = "Software"
+        indexes = [
+            models.Index(fields=['version'], name='software_version_idx'),
+            models.Index(fields=['tipo_licencia'],
+                         name='software_licencia_idx'),
+            models.Index(fields=['fecha_actualizacion', 'activo'],
+                         name='software_cambio_idx'),
+        ]
 
 
 class Mantenimiento(models.Model):
@@ -114,6 +145,7 @@ class Mantenimiento(models.Model):
     estado = models.CharField(
         max_length=20, choices=ESTADO_CHOICES, default='programado')
     observaciones = models.TextField(blank=True, null=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Mantenimiento {self.get_tipo_display()} de {self.activo.nombre} - {self.fecha_programada}"
@@ -122,6 +154,34 @@ class Mantenimiento(models.Model):
         verbose_name = "Mantenimiento"
         verbose_name_plural = "Mantenimientos"
         ordering = ['-fecha_programada']
+        indexes = [
+            models.Index(fields=['fecha_actualizacion', 'id'],
+                         name='mantenimiento_cambio_idx'),
+            # Calendario: rango de fechas y rango de cada responsable
+            models.Index(fields=['fecha_programada', 'estado'],
+                         name='mantenimiento_fecha_idx'),
+            models.Index(fields=['responsable', 'fecha_programada'],
+                         name='mantenimiento_resp_fecha_idx'),
+        ]
+
+
+class PlanMantenimiento(models.Model):
+    """Próximo mantenimiento preventivo de cada hardware (ver inventario/planificador.py)"""
+    hardware = models.OneToOneField(
+        Hardware, on_delete=models.CASCADE, primary_key=True, related_name='plan_mantenimiento')
+    ultimo_mantenimiento = models.DateField(blank=True, null=True)
+    proxima_fecha = models.DateField()
+    fecha_calculo = models.DateTimeField()
+
+    def __str__(self):
+        return f"Plan de {self.hardware_id}: {self.proxima_fecha}"
+
+    class Meta:
+        verbose_name = "Plan de Mantenimiento"
+        verbose_name_plural = "Planes de Mantenimiento"
+        indexes = [
+            models.Index(fields=['proxima_fecha'], name='plan_proxima_fecha_idx'),
+        ]
 
 
 class Proceso(models.Model):
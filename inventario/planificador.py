@@ -0,0 +1,273 @@
+# inventario/planificador.py
+"""
+Planificación de mantenimientos preventivos.
+
+Cada hardware vigente tiene un PlanMantenimiento con la fecha del próximo
+preventivo: el último mantenimiento cerrado (o la fecha de adquisición)
+más su periodicidad_mantenimiento. Un mantenimiento completado de cualquier
+tipo reinicia el ciclo; un preventivo cancelado también, de modo que
+cancelar la orden generada omite ese ciclo en lugar de volver a crearla.
+
+Cada ejecución:
+    1. Recalcula solo los planes afectados por cambios posteriores al
+       último cálculo (hardware o activo modificado, mantenimiento cerrado);
+       por cada lote, una consulta agrupada de los últimos mantenimientos y
+       un bulk_create con upsert.
+    2. Crea con bulk_create un mantenimiento 'programado' para cada plan que
+       vence dentro de la anticipación y aún no tiene un preventivo abierto.
+
+Repetir una ejecución no crea duplicados. La ejecución se lanza con el
+comando planificar_mantenimientos (cron) o con el hilo PlanificadorPeriodico.
+
+Configuración (settings):
+    MANTENIMIENTO_DIAS_ANTICIPACION: días antes del vencimiento en que se
+        genera la orden (por defecto 15)
+    MANTENIMIENTO_PLANIFICADOR_AUTOMATICO: arrancar el hilo al iniciar Django
+    MANTENIMIENTO_PLANIFICADOR_INTERVALO: segundos entre ejecuciones del hilo
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, F, Max, OuterRef, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Activo, Hardware, Mantenimiento, PlanMantenimiento
+
+logger = logging.getLogger(__name__)
+
+DIAS_ANTICIPACION = getattr(settings, 'MANTENIMIENTO_DIAS_ANTICIPACION', 15)
+INTERVALO = getattr(settings, 'MANTENIMIENTO_PLANIFICADOR_INTERVALO', 3600)
+TAMANO_LOTE = 2000
+
+# Solo el hardware en uso recibe mantenimiento preventivo
+ESTADOS_PLANIFICABLES = ['activo', 'en_mantenimiento']
+ESTADOS_ABIERTOS = ['programado', 'en_proceso']
+
+# Mantenimientos que cierran un ciclo
+CIERRA_CICLO = Q(estado='completado') | Q(estado='cancelado', tipo='preventivo')
+
+CLAVE_BLOQUEO = 'planificador_mantenimiento:bloqueo'
+
+
+@dataclass
+class ResultadoPlanificacion:
+    recalculados: int = 0
+    generados: int = 0
+    segundos: float = 0.0
+
+
+def planes_desactualizados(completo=False):
+    """Hardware cuyo plan falta o puede haber cambiado desde su último cálculo"""
+    hardware = Hardware.objects.filter(
+        activo__estado__in=ESTADOS_PLANIFICABLES, periodicidad_mantenimiento__gt=0)
+
+    if not completo:
+        calculo = OuterRef('plan_mantenimiento__fecha_calculo')
+        mantenimiento_cerrado = Mantenimiento.objects.filter(
+            CIERRA_CICLO, activo=OuterRef('activo_id'), fecha_actualizacion__gt=calculo)
+        hardware = hardware.filter(
+            Q(plan_mantenimiento__isnull=True)
+            | Q(fecha_actualizacion__gt=F('plan_mantenimiento__fecha_calculo'))
+            | Exists(mantenimiento_cerrado)
+        )
+
+    return hardware
+
+
+def ultimos_mantenimientos(activo_ids):
+    """Fecha del último mantenimiento cerrado de cada activo (una consulta agrupada)"""
+    return dict(
+        Mantenimiento.objects.filter(CIERRA_CICLO, activo_id__in=activo_ids)
+        .values('activo_id')
+        .annotate(ultimo=Max(Coalesce('fecha_realizacion', 'fecha_programada')))
+        .values_list('activo_id', 'ultimo')
+        .order_by()
+    )
+
+
+def recalcular_planes(ahora, completo=False, tamano_lote=TAMANO_LOTE):
+    """
+    Actualizar los planes desactualizados.
+
+    Returns:
+        Número de planes recalculados
+    """
+    desactualizados = planes_desactualizados(completo)
+    # Solo los ids se leen de una vez; los datos se piden por lotes, de modo
+    # que las escrituras en la tabla de planes no alteran una lectura abierta
+    ids = list(desactualizados.values_list('activo_id', flat=True).order_by())
+
+    total = 0
+    for inicio in range(0, len(ids), tamano_lote):
+        lote_ids = ids[inicio:inicio + tamano_lote]
+        filas = Hardware.objects.filter(activo_id__in=lote_ids).values_list(
+            'activo_id', 'periodicidad_mantenimiento', 'activo__fecha_adquisicion')
+        ultimos = ultimos_mantenimientos(lote_ids)
+
+        planes = []
+        for hardware_id, periodicidad, adquisicion in filas:
+            ultimo = ultimos.get(hardware_id)
+            planes.append(PlanMantenimiento(
+                hardware_id=hardware_id,
+                ultimo_mantenimiento=ultimo,
+                proxima_fecha=(ultimo or adquisicion) + timedelta(days=periodicidad),
+                fecha_calculo=ahora,
+            ))
+        PlanMantenimiento.objects.bulk_create(
+            planes,
+            update_conflicts=True,
+            unique_fields=['hardware'],
+            update_fields=['ultimo_mantenimiento', 'proxima_fecha', 'fecha_calculo'],
+        )
+        total += len(planes)
+    return total
+
+
+def planes_vencidos(hoy, anticipacion=DIAS_ANTICIPACION):
+    """Planes que vencen dentro de la anticipación y no tienen preventivo abierto"""
+    abierto = Mantenimiento.objects.filter(
+        activo=OuterRef('hardware_id'), tipo='preventivo', estado__in=ESTADOS_ABIERTOS)
+    return PlanMantenimiento.objects.filter(
+        proxima_fecha__lte=hoy + timedelta(days=anticipacion),
+        hardware__activo__estado__in=ESTADOS_PLANIFICABLES,
+    ).exclude(Exists(abierto))
+
+
+def generar_mantenimientos(hoy, anticipacion=DIAS_ANTICIPACION, tamano_lote=TAMANO_LOTE):
+    """
+    Crear los preventivos 'programado' de los planes vencidos.
+
+    bulk_create no envía señales: se aplican aquí los contadores de KPI y
+    los documentos del índice de búsqueda.
+
+    Returns:
+        Número de mantenimientos creados
+    """
+    from busqueda import indexador
+    from reportes import kpis
+
+    ids = list(planes_vencidos(hoy, anticipacion).values_list('hardware_id', flat=True).order_by())
+
+    total = 0
+    for inicio in range(0, len(ids), tamano_lote):
+        filas = PlanMantenimiento.objects.filter(
+            hardware_id__in=ids[inicio:inicio + tamano_lote]
+        ).values_list(
+            'hardware_id', 'hardware__activo__nombre', 'proxima_fecha',
+            'hardware__periodicidad_mantenimiento')
+
+        lote = [
+            Mantenimiento(
+                activo=Activo(pk=activo_id, nombre=nombre),
+                tipo='preventivo',
+                fecha_programada=max(proxima, hoy),
+                descripcion=f'Mantenimiento preventivo periódico (cada {periodicidad} días)',
+                estado='programado',
+            )
+            for activo_id, nombre, proxima, periodicidad in filas
+        ]
+        with transaction.atomic():
+            Mantenimiento.objects.bulk_create(lote)
+            kpis.ajustar_mantenimiento('preventivo', 'programado', len(lote))
+            indexador.indexar_lote('mantenimiento', lote)
+        total += len(lote)
+    return total
+
+
+def planificar(hoy=None, anticipacion=DIAS_ANTICIPACION, completo=False, tamano_lote=TAMANO_LOTE):
+    """
+    Ejecutar la planificación completa.
+
+    Args:
+        completo: recalcular todos los planes, no solo los desactualizados
+
+    Returns:
+        ResultadoPlanificacion
+    """
+    from reportes import cache_dashboard, cache_reportes
+
+    inicio = time.monotonic()
+    ahora = timezone.now()
+    hoy = hoy or timezone.localdate()
+
+    resultado = ResultadoPlanificacion()
+    resultado.recalculados = recalcular_planes(ahora, completo, tamano_lote)
+    resultado.generados = generar_mantenimientos(hoy, anticipacion, tamano_lote)
+
+    if resultado.generados:
+        cache_dashboard.invalidar()
+        cache_reportes.incrementar_version('mantenimiento')
+
+    resultado.segundos = time.monotonic() - inicio
+    logger.info('Planificación de mantenimientos: %d planes recalculados, %d generados, %.2f s',
+                resultado.recalculados, resultado.generados, resultado.segundos)
+    return resultado
+
+
+def planificar_con_bloqueo(**kwargs):
+    """
+    Ejecutar planificar() si ningún otro proceso lo está haciendo.
+
+    El bloqueo usa la caché por defecto; solo protege entre procesos si el
+    backend es compartido (archivo o Redis).
+
+    Returns:
+        ResultadoPlanificacion, o None si otra ejecución estaba en curso
+    """
+    if not cache.add(CLAVE_BLOQUEO, True, INTERVALO):
+        return None
+    try:
+        return planificar(**kwargs)
+    finally:
+        cache.delete(CLAVE_BLOQUEO)
+
+
+class PlanificadorPeriodico:
+    """Hilo que ejecuta la planificación cada `intervalo` segundos"""
+
+    def __init__(self, intervalo=INTERVALO):
+        self.intervalo = intervalo
+        self._hilo = None
+        self._detener = threading.Event()
+
+    def iniciar(self):
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, name='planificador-mantenimiento', daemon=True)
+        self._hilo.start()
+
+    def _ejecutar(self):
+        # La primera ejecución espera un intervalo: el arranque no debe cargar la base de datos
+        while not self._detener.wait(self.intervalo):
+            try:
+                planificar_con_bloqueo()
+            except Exception:
+                logger.exception('Error en la planificación de mantenimientos')
+            finally:
+                close_old_connections()
+
+    def detener(self, timeout=5):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+
+_planificador = None
+
+
+def iniciar_planificador():
+    """Arrancar el hilo compartido por el proceso (una sola vez)"""
+    global _planificador
+    if _planificador is None:
+        _planificador = PlanificadorPeriodico()
+        _planificador.iniciar()
+    return _planificador
@@ -460,6 +460,532 @@ class MetricasRendimientoTestCase(TestCase):
                         f"La consulta tomó {execution_time:.2f} segundos")
 
 
+class ListadoKeysetTestCase(TestCase):
+    """
+    Pruebas unitarias para el motor de listado con paginación keyset
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.departamento = Departamento.objects.create(nombre="Listado Test")
+        self.user = User.objects.create_user(
+            username='listuser',
+            password='testpass123'
+        )
+
+        for i in range(7):
+            activo = Activo.objects.create(
+                tipo='hardware',
+                nombre=f'Equipo {i}',
+                fecha_adquisicion=date(2024, 1, 1 + i % 3),
+                valor_adquisicion=Decimal('100.00'),
+                departamento=self.departamento,
+                creado_por=self.user
+            )
+            Hardware.objects.create(
+                activo=activo,
+                marca='Dell' if i % 2 == 0 else 'HP',
+                modelo=f'M{i}',
+                numero_serie=f'SN-LIST-{i}'
+            )
+
+    def test_paginacion_keyset_recorre_todo(self):
+        """
+        CP-UT-15: Verificar que la paginación keyset recorre todos los registros sin repetir
+        """
+        from inventario.listado import paginar_keyset
+
+        queryset = Hardware.objects.select_related('activo')
+        vistos = []
+        cursor = None
+        while True:
+            pagina = paginar_keyset(queryset, 3, despues=cursor)
+            vistos.extend(h.activo_id for h in pagina)
+            if not pagina.tiene_siguiente:
+                break
+            cursor = pagina.cursor_siguiente
+
+        esperado = list(Activo.objects.order_by(
+            '-fecha_adquisicion', '-id').values_list('id', flat=True))
+        self.assertEqual(vistos, esperado)
+
+        # Retroceder desde la segunda página devuelve la primera
+        segunda = paginar_keyset(
+            queryset, 3, despues=paginar_keyset(queryset, 3).cursor_siguiente)
+        primera = paginar_keyset(queryset, 3, antes=segunda.cursor_anterior)
+        self.assertEqual([h.activo_id for h in primera], esperado[:3])
+        self.assertFalse(primera.tiene_anterior)
+
+    def test_listado_busqueda_combinada(self):
+        """
+        CP-UT-16: Verificar que la búsqueda combinada filtra por cualquier campo
+        """
+        self.client.login(username='listuser', password='testpass123')
+        response = self.client.get(
+            '/inventario/hardware/', {'search': 'dell', 'por_pagina': 2})
+
+        self.assertEqual(response.status_code, 200)
+        pagina = response.context['pagina']
+        self.assertEqual(len(pagina), 2)
+        self.assertTrue(pagina.tiene_siguiente)
+        self.assertTrue(all(h.marca == 'Dell' for h in pagina))
+
+
+class ResumenInventarioTestCase(TestCase):
+    """
+    Pruebas unitarias para el servicio de estadísticas de los dashboards
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        from datetime import timedelta
+
+        self.departamento = Departamento.objects.create(nombre="KPI Test")
+        hoy = date.today()
+
+        estados = ['activo', 'activo', 'obsoleto', 'baja']
+        for i, estado in enumerate(estados):
+            activo = Activo.objects.create(
+                tipo='hardware',
+                nombre=f'PC KPI {i}',
+                fecha_adquisicion=hoy,
+                valor_adquisicion=Decimal('100.00'),
+                estado=estado,
+                departamento=self.departamento
+            )
+            Hardware.objects.create(
+                activo=activo, marca='Dell', modelo='X', numero_serie=f'KPI-{i}')
+
+        licencia = Activo.objects.create(
+            tipo='software',
+            nombre='Antivirus',
+            fecha_adquisicion=hoy,
+            valor_adquisicion=Decimal('50.00'),
+            departamento=self.departamento
+        )
+        Software.objects.create(
+            activo=licencia,
+            version='1.0',
+            tipo_licencia='temporal',
+            fecha_vencimiento=hoy + timedelta(days=10)
+        )
+        Mantenimiento.objects.create(
+            activo=licencia,
+            tipo='preventivo',
+            fecha_programada=hoy,
+            descripcion='Actualización',
+            estado='programado'
+        )
+
+    def test_resumen_en_pocas_consultas(self):
+        """
+        CP-UT-17: Verificar los indicadores del dashboard calculados con agregación condicional
+        """
+        from inventario.estadisticas import obtener_resumen
+
+        with self.assertNumQueries(3):
+            resumen = obtener_resumen()
+
+        self.assertEqual(resumen.total_activos, 4)
+        self.assertEqual(resumen.total_hardware, 3)
+        self.assertEqual(resumen.total_software, 1)
+        self.assertEqual(resumen.equipos_obsoletos, 1)
+        self.assertEqual(resumen.software_vencer, 1)
+        self.assertEqual(resumen.mantenimientos_pendientes, 1)
+        self.assertEqual(resumen.por_estado['baja'], 1)
+        self.assertEqual(resumen.por_departamento,
+                         [{'departamento__nombre': 'KPI Test', 'total': 4}])
+
+
+class ImportacionActivosTestCase(TestCase):
+    """
+    Pruebas unitarias para la importación masiva de activos
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.departamento = Departamento.objects.create(nombre="Laboratorios")
+        activo = Activo.objects.create(
+            tipo='hardware',
+            nombre='PC existente',
+            fecha_adquisicion=date(2024, 1, 1),
+            valor_adquisicion=Decimal('100.00'),
+            departamento=self.departamento
+        )
+        Hardware.objects.create(
+            activo=activo, marca='Dell', modelo='X', numero_serie='SN-EXISTE')
+
+    def test_importar_csv_con_errores_por_fila(self):
+        """
+        CP-UT-18: Verificar la importación por lotes, el informe de errores y los KPI
+        """
+        import io
+        from inventario.importacion import ImportadorActivos, leer_filas
+        from reportes.models import EstadisticaMensual
+        from busqueda.models import DocumentoBusqueda
+
+        contenido = (
+            "Nombre;Fecha Adquisicion;Valor Adquisicion;Estado;Departamento;Marca;Modelo;Numero Serie\n"
+            "PC 1;2025-03-01;500,50;Activo;laboratorios;HP;ProDesk;SN-1\n"
+            f"PC 2;02/03/2025;600;obsoleto;{self.departamento.pk};HP;ProDesk;SN-2\n"
+            "PC 3;2025-03-03;700;activo;Laboratorios;HP;ProDesk;SN-1\n"
+            "PC 4;2025-03-04;700;activo;Laboratorios;HP;ProDesk;SN-EXISTE\n"
+            "PC 5;ayer;700;roto;Otro;HP;ProDesk;SN-5\n"
+            ";;;;;;;\n"
+            "PC 6;2025-03-06;800;activo;Laboratorios;HP;ProDesk;SN-6\n"
+        ).encode('utf-8')
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        importador = ImportadorActivos('hardware', tamano_lote=2)
+        with CaptureQueriesContext(connection) as consultas:
+            resultado = importador.importar(leer_filas(io.BytesIO(contenido), 'equipos.csv'))
+
+        # Un INSERT por lote con las filas válidas
+        inserciones = [consulta for consulta in consultas.captured_queries
+                       if consulta['sql'].startswith('INSERT INTO "inventario_activo"')]
+        self.assertEqual(len(inserciones), 2)
+
+        self.assertEqual(resultado.filas, 6)
+        self.assertEqual(resultado.creados, 3)
+        self.assertEqual([error.fila for error in resultado.errores], [4, 5, 6])
+        self.assertIn('SN-EXISTE', resultado.errores[1].mensaje)
+        self.assertIn('fecha_adquisicion', resultado.errores[2].mensaje)
+        self.assertIn('departamento no encontrado', resultado.errores[2].mensaje)
+
+        pc2 = Hardware.objects.select_related('activo').get(numero_serie='SN-2')
+        self.assertEqual(pc2.activo.estado, 'obsoleto')
+        self.assertEqual(pc2.activo.fecha_adquisicion, date(2025, 3, 2))
+        self.assertEqual(Activo.objects.get(nombre='PC 1').valor_adquisicion, Decimal('500.50'))
+        self.assertTrue(DocumentoBusqueda.objects.filter(
+            tipo='hardware', objeto_id=pc2.pk).exists())
+
+        # Los contadores incrementales coinciden con un recálculo completo
+        from reportes.kpis import recalcular_estadisticas
+        antes = sorted(EstadisticaMensual.objects.filter(total__gt=0).values_list(
+            'departamento_id', 'tipo', 'estado', 'mes', 'total'))
+        recalcular_estadisticas()
+        despues = sorted(EstadisticaMensual.objects.values_list(
+            'departamento_id', 'tipo', 'estado', 'mes', 'total'))
+        self.assertEqual(antes, despues)
+
+    def test_importar_csv_cp1252_y_valores_extremos(self):
+        """
+        CP-UT-18b: Verificar un CSV en cp1252 con acentos lejos del inicio y que
+        los números no finitos o desbordados son errores de fila
+        """
+        import io
+        from inventario.importacion import ImportadorActivos, leer_filas
+
+        lineas = ["Nombre;Fecha Adquisicion;Valor Adquisicion;Departamento;Marca;Modelo;"
+                  "Numero Serie;Periodicidad Mantenimiento"]
+        lineas += [f"PC {numero};2025-03-01;500;Laboratorios;HP;ProDesk;CP-{numero};90"
+                   for numero in range(500)]
+        lineas += [
+            "Portátil año 2025;2025-03-01;500;Laboratorios;HP;ProBook;CP-ENE;90",
+            "PC NaN;2025-03-01;NaN;Laboratorios;HP;ProDesk;CP-NAN;90",
+            "PC inf;2025-03-01;500;Laboratorios;HP;ProDesk;CP-INF;1.0e999",
+            "PC grande;2025-03-01;500;Laboratorios;HP;ProDesk;CP-GRANDE;99999999999",
+        ]
+        contenido = "\n".join(lineas).encode('cp1252')
+        self.assertGreater(contenido.index('ñ'.encode('cp1252')), 8192)
+
+        importador = ImportadorActivos('hardware', tamano_lote=100)
+        resultado = importador.importar(leer_filas(io.BytesIO(contenido), 'equipos.csv'))
+
+        self.assertEqual(resultado.creados, 501)
+        self.assertTrue(Activo.objects.filter(nombre='Portátil año 2025').exists())
+        self.assertEqual([error.fila for error in resultado.errores], [503, 504, 505])
+        self.assertIn('valor_adquisicion', resultado.errores[0].mensaje)
+        self.assertIn('periodicidad_mantenimiento', resultado.errores[1].mensaje)
+        self.assertIn('fuera de rango', resultado.errores[2].mensaje)
+
+
+class AccionMasivaTestCase(TestCase):
+    """
+    Pruebas unitarias para las acciones masivas sobre activos
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.origen = Departamento.objects.create(nombre="Laboratorio 1")
+        self.destino = Departamento.objects.create(nombre="Almacén")
+        self.user = User.objects.create_superuser(username='admin', password='testpass123')
+
+        for numero in range(6):
+            activo = Activo.objects.create(
+                tipo='hardware',
+                nombre=f'PC Lab {numero}',
+                fecha_adquisicion=date(2024, 1 + numero % 2, 1),
+                valor_adquisicion=Decimal('300.00'),
+                estado='activo' if numero < 4 else 'en_mantenimiento',
+                departamento=self.origen
+            )
+            Hardware.objects.create(
+                activo=activo, marca='Lenovo', modelo='M70', numero_serie=f'LAB-{numero}')
+
+    def test_baja_masiva_desde_listado(self):
+        """
+        CP-UT-19: Verificar la acción masiva con un solo UPDATE, los KPI y el registro de actividad
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reportes.kpis import recalcular_estadisticas
+        from reportes.models import EstadisticaMensual
+        from usuarios.models import LogActividad
+
+        antes = Hardware.objects.get(numero_serie='LAB-0').fecha_actualizacion
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.post('/inventario/hardware/accion/', {
+                'accion': 'baja',
+                'motivo_baja': 'Renovación del laboratorio',
+                'todos': '1',
+                'estado': 'activo',
+            })
+        self.assertEqual(respuesta.status_code, 302)
+
+        # Un UPDATE aplica los cambios y otro, al final, sella la fecha definitiva
+        actualizaciones = [consulta for consulta in consultas.captured_queries
+                           if consulta['sql'].startswith('UPDATE "inventario_activo"')]
+        self.assertEqual(len(actualizaciones), 2)
+        self.assertIn('"estado"', actualizaciones[0]['sql'])
+        self.assertNotIn('"estado"', actualizaciones[1]['sql'])
+
+        self.assertEqual(Activo.objects.filter(estado='baja').count(), 4)
+        baja = Activo.objects.get(nombre='PC Lab 0')
+        self.assertEqual(baja.motivo_baja, 'Renovación del laboratorio')
+        self.assertEqual(baja.actualizado_por, self.user)
+        self.assertGreater(Hardware.objects.get(numero_serie='LAB-0').fecha_actualizacion, antes)
+        self.assertEqual(Activo.objects.get(nombre='PC Lab 5').estado, 'en_mantenimiento')
+
+        # Traslado por lista de ids
+        ids = list(Activo.objects.filter(nombre__in=['PC Lab 4', 'PC Lab 5']).values_list('pk', flat=True))
+        self.client.post('/inventario/hardware/accion/', {
+            'accion': 'departamento',
+            'departamento': self.destino.pk,
+            'seleccion': ids,
+        })
+        self.assertEqual(Activo.objects.filter(departamento=self.destino).count(), 2)
+
+        self.assertEqual(LogActividad.objects.filter(accion__startswith='Acción masiva').count(), 2)
+
+        # Los contadores trasladados coinciden con un recálculo completo
+        incrementales = sorted(EstadisticaMensual.objects.filter(total__gt=0).values_list(
+            'departamento_id', 'tipo', 'estado', 'mes', 'total'))
+        recalcular_estadisticas()
+        self.assertEqual(incrementales, sorted(EstadisticaMensual.objects.values_list(
+            'departamento_id', 'tipo', 'estado', 'mes', 'total')))
+
+    def test_comando_departamento_inexistente(self):
+        """
+        CP-UT-19b: El comando accion_masiva rechaza un departamento de destino inexistente
+        """
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        with self.assertRaisesMessage(CommandError, 'No existe el departamento 9999'):
+            call_command('accion_masiva', 'departamento', departamento=9999, tipo='hardware')
+        self.assertEqual(Activo.objects.filter(departamento=self.origen).count(), 6)
+
+
+class PlanificadorMantenimientoTestCase(TestCase):
+    """
+    Pruebas unitarias para la planificación de mantenimientos preventivos
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.departamento = Departamento.objects.create(nombre="Soporte")
+        self.hoy = date(2025, 6, 1)
+
+        self.equipos = {}
+        for nombre, adquisicion, estado in [
+            ('Servidor', date(2025, 1, 1), 'activo'),       # vence el 2025-04-01
+            ('Switch', date(2025, 5, 20), 'activo'),        # vence el 2025-08-18
+            ('Impresora', date(2024, 1, 1), 'baja'),        # no se planifica
+        ]:
+            activo = Activo.objects.create(
+                tipo='hardware',
+                nombre=nombre,
+                fecha_adquisicion=adquisicion,
+                valor_adquisicion=Decimal('900.00'),
+                estado=estado,
+                departamento=self.departamento
+            )
+            self.equipos[nombre] = Hardware.objects.create(
+                activo=activo, marca='HP', modelo='X', numero_serie=f'PL-{nombre}',
+                periodicidad_mantenimiento=90)
+
+    def test_generacion_idempotente_e_incremental(self):
+        """
+        CP-UT-20: Verificar la generación de preventivos, su idempotencia y el recálculo incremental
+        """
+        from inventario.models import PlanMantenimiento
+        from inventario.planificador import planificar
+
+        resultado = planificar(hoy=self.hoy, anticipacion=15)
+        self.assertEqual((resultado.recalculados, resultado.generados), (2, 1))
+
+        servidor = self.equipos['Servidor'].activo
+        orden = Mantenimiento.objects.get(activo=servidor)
+        self.assertEqual((orden.tipo, orden.estado), ('preventivo', 'programado'))
+        self.assertEqual(orden.fecha_programada, self.hoy)  # vencido: se programa para hoy
+
+        # Sin cambios no se recalcula ni se duplica nada
+        resultado = planificar(hoy=self.hoy, anticipacion=15)
+        self.assertEqual((resultado.recalculados, resultado.generados), (0, 0))
+
+        # Completar el mantenimiento reinicia el ciclo solo para ese equipo
+        orden.estado = 'completado'
+        orden.fecha_realizacion = date(2025, 6, 3)
+        orden.save()
+        resultado = planificar(hoy=self.hoy, anticipacion=15)
+        self.assertEqual((resultado.recalculados, resultado.generados), (1, 0))
+        self.assertEqual(PlanMantenimiento.objects.get(hardware=self.equipos['Servidor']).proxima_fecha,
+                         date(2025, 9, 1))
+
+        # Dentro de la anticipación del switch se genera su orden
+        resultado = planificar(hoy=date(2025, 8, 10), anticipacion=15)
+        self.assertEqual(resultado.generados, 1)
+        self.assertEqual(
+            Mantenimiento.objects.get(activo=self.equipos['Switch'].activo).fecha_programada,
+            date(2025, 8, 18))
+        self.assertFalse(Mantenimiento.objects.filter(activo=self.equipos['Impresora'].activo).exists())
+
+
+class CalendarioMantenimientoTestCase(TestCase):
+    """
+    Pruebas unitarias para el calendario de mantenimientos
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.hoy = timezone.localdate()
+        self.tecnico = User.objects.create_user(
+            username='tecnico', password='testpass123', first_name='Ana', last_name='Pérez')
+        self.otro = User.objects.create_user(username='otro', password='testpass123')
+        activo = Activo.objects.create(
+            tipo='hardware',
+            nombre='Servidor, rack 1',
+            fecha_adquisicion=date(2024, 1, 1),
+            valor_adquisicion=Decimal('900.00'),
+            departamento=Departamento.objects.create(nombre="Soporte")
+        )
+        for dias, responsable, estado in [
+            (0, self.tecnico, 'programado'),
+            (0, self.tecnico, 'completado'),
+            (0, self.otro, 'programado'),
+            (1, None, 'en_proceso'),
+            (400, self.tecnico, 'programado'),  # fuera de todas las ventanas
+        ]:
+            Mantenimiento.objects.create(
+                activo=activo,
+                tipo='preventivo',
+                fecha_programada=self.hoy + timedelta(days=dias),
+                responsable=responsable,
+                descripcion='Limpieza; revisión',
+                estado=estado
+            )
+
+    def test_carga_diaria_y_feed(self):
+        """
+        CP-UT-21: Verificar la carga por día y responsable, la API por rango y el feed iCalendar
+        """
+        from datetime import timedelta
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from inventario.calendario import carga_diaria, rango_vista, token_ical
+
+        desde, hasta = self.hoy, self.hoy + timedelta(days=6)
+        dias = carga_diaria(desde, hasta)
+        self.assertEqual([(dia['fecha'], dia['total']) for dia in dias],
+                         [(self.hoy, 3), (self.hoy + timedelta(days=1), 1)])
+        carga_tecnico = dias[0]['responsables'][0]
+        self.assertEqual(carga_tecnico['nombre'], 'Ana Pérez')
+        self.assertEqual((carga_tecnico['total'], carga_tecnico['programado'],
+                          carga_tecnico['completado']), (2, 1, 1))
+        self.assertEqual(dias[1]['responsables'][0]['nombre'], 'Sin asignar')
+
+        inicio, fin = rango_vista('mes', date(2024, 2, 14))
+        self.assertEqual((inicio, fin), (date(2024, 2, 1), date(2024, 2, 29)))
+
+        # API: agregados del rango y validación del rango
+        api = APIClient()
+        api.force_authenticate(self.otro)
+        respuesta = api.get('/api/v1/calendario/mantenimientos/', {
+            'desde': desde.isoformat(), 'hasta': hasta.isoformat(), 'responsable': self.tecnico.pk})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual([dia['total'] for dia in respuesta.data['dias']], [2])
+        respuesta = api.get('/api/v1/calendario/mantenimientos/', {
+            'desde': hasta.isoformat(), 'hasta': desde.isoformat()})
+        self.assertEqual(respuesta.status_code, 400)
+
+        # Feed: solo los mantenimientos del técnico dentro de la ventana, sin sesión
+        respuesta = self.client.get(reverse('mantenimiento_ical', args=[token_ical(self.tecnico)]))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['Content-Type'], 'text/calendar; charset=utf-8')
+        contenido = respuesta.content.decode()
+        self.assertEqual(contenido.count('BEGIN:VEVENT'), 2)
+        self.assertIn('SUMMARY:Preventivo: Servidor\\, rack 1', contenido)
+        self.assertIn(f'DTSTART;VALUE=DATE:{self.hoy:%Y%m%d}', contenido)
+
+        respuesta = self.client.get(reverse('mantenimiento_ical', args=[f'{self.tecnico.pk}:falso']))
+        self.assertEqual(respuesta.status_code, 404)
+
+        # Vista semanal
+        self.client.login(username='otro', password='testpass123')
+        respuesta = self.client.get(reverse('mantenimiento_calendario'), {'vista': 'semana'})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.context['total'],
+                         sum(dia['total'] for dia in carga_diaria(*rango_vista('semana', self.hoy))))
+
+        # Fechas en los extremos del calendario vuelven a hoy en lugar de fallar
+        for vista in ('semana', 'mes'):
+            for fecha in ('9999-12-31', '0001-01-01'):
+                respuesta = self.client.get(
+                    reverse('mantenimiento_calendario'), {'vista': vista, 'fecha': fecha})
+                self.assertEqual(respuesta.status_code, 200, (vista, fecha))
+                self.assertEqual(respuesta.context['fecha'], self.hoy)
+
+
+class PerfilSQLiteTestCase(TestCase):
+    """
+    Pruebas unitarias para el perfil de producción de SQLite
+    """
+
+    def test_pragmas_y_db_health(self):
+        """
+        CP-UT-22: Verificar que cada conexión recibe los PRAGMA del perfil y que
+        db_health informa del estado y ejecuta el mantenimiento
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from inventario.basedatos import PRAGMAS, estado
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], PRAGMAS['busy_timeout'])
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+        datos = estado()
+        self.assertGreater(datos['paginas'], 0)
+        self.assertLessEqual(datos['paginas_libres'], datos['paginas'])
+        self.assertTrue(0 <= datos['fragmentacion'] <= 1)
+
+        salida = StringIO()
+        call_command('db_health', mantener=True, stdout=salida)
+        self.assertIn('ANALYZE completado', salida.getvalue())
+        self.assertIn('Mantenimiento completado', salida.getvalue())
+
+
 if __name__ == '__main__':
     # Ejecutar pruebas unitarias
     import unittest
@@ -8,6 +8,10 @@ urlpatterns = [
     # Hardware
     path('hardware/', views.hardware_list, name='hardware_list'),
     path('hardware/new/', views.hardware_create, name='hardware_new'),
+    path('hardware/importar/', views.importar_activos,
+         {'tipo': 'hardware'}, name='hardware_importar'),
+    path('hardware/accion/', views.accion_masiva,
+         {'tipo': 'hardware'}, name='hardware_accion'),
     path('hardware/<int:pk>/', views.hardware_detail, name='hardware_detail'),
     path('hardware/<int:pk>/edit/', views.hardware_update, name='hardware_edit'),
     path('hardware/<int:pk>/delete/',
@@ -16,6 +20,10 @@ urlpatterns = [
     # Software
     path('software/', views.software_list, name='software_list'),
     path('software/new/', views.software_create, name='software_new'),
+    path('software/importar/', views.importar_activos,
+         {'tipo': 'software'}, name='software_importar'),
+    path('software/accion/', views.accion_masiva,
+         {'tipo': 'software'}, name='software_accion'),
     path('software/<int:pk>/', views.software_detail, name='software_detail'),
     path('software/<int:pk>/edit/', views.software_update, name='software_edit'),
     path('software/<int:pk>/delete/',
@@ -23,6 +31,10 @@ urlpatterns = [
 
     # Mantenimiento
     path('mantenimiento/', views.mantenimiento_list, name='mantenimiento_list'),
+    path('mantenimiento/calendario/', views.mantenimiento_calendario,
+         name='mantenimiento_calendario'),
+    path('mantenimiento/calendario/<str:token>.ics', views.mantenimiento_ical,
+         name='mantenimiento_ical'),
     path('mantenimiento/new/', views.mantenimiento_create,
          name='mantenimiento_new'),
     path('mantenimiento/<int:pk>/', views.mantenimiento_detail,
@@ -1,11 +1,15 @@
 # inventario/views.py
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.models import User
 from .models import Activo, Hardware, Software, Mantenimiento
-from .forms import HardwareForm, SoftwareForm
-from usuarios.models import LogActividad
+from .forms import HardwareForm, SoftwareForm, ImportacionForm, AccionMasivaForm
+from .listado import (
+    listar_activos, filtrar_activos, CAMPOS_BUSQUEDA_HARDWARE, CAMPOS_BUSQUEDA_SOFTWARE
+)
+from usuarios.actividad import registrar_actividad
 
 
 @login_required
@@ -19,38 +23,15 @@ def index(request):
 @login_required
 def hardware_list(request):
     """Lista de hardware"""
-    hardware_list = Hardware.objects.all().select_related(
-        'activo', 'activo__departamento')
-
-    # Filtros
-    search = request.GET.get('search', '')
-    departamento = request.GET.get('departamento', '')
-    estado = request.GET.get('estado', '')
-
-    if search:
-        hardware_list = hardware_list.filter(
-            activo__nombre__icontains=search
-        ) | hardware_list.filter(
-            marca__icontains=search
-        ) | hardware_list.filter(
-            modelo__icontains=search
-        ) | hardware_list.filter(
-            numero_serie__icontains=search
-        )
-
-    if departamento:
-        hardware_list = hardware_list.filter(
-            activo__departamento_id=departamento)
-
-    if estado:
-        hardware_list = hardware_list.filter(activo__estado=estado)
+    context = listar_activos(
+        request,
+        Hardware.objects.select_related('activo', 'activo__departamento'),
+        CAMPOS_BUSQUEDA_HARDWARE
+    )
+    context['hardware_list'] = context['pagina'].elementos
+    context['form_accion'] = AccionMasivaForm()
 
-    return render(request, 'inventario/hardware_list.html', {
-        'hardware_list': hardware_list,
-        'search': search,
-        'departamento': departamento,
-        'estado': estado
-    })
+    return render(request, 'inventario/hardware_list.html', context)
 
 
 @login_required
@@ -92,7 +73,7 @@ def hardware_create(request):
             hardware.save()
 
             # Registrar Actividad
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion=f"Creación de hardware: {activo.nombre}",
                 detalles=f"Hardware {hardware.marca} {hardware.modelo} con número de serie {hardware.numero_serie}"
@@ -114,7 +95,7 @@ def hardware_detail(request, pk):
     hardware = get_object_or_404(Hardware, activo_id=pk)
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de hardware: {hardware.activo.nombre}",
         detalles=f"Hardware {hardware.marca} {hardware.modelo} con número de serie {hardware.numero_serie}"
@@ -135,7 +116,7 @@ def hardware_update(request, pk):
                 hardware = form.save(user=request.user)
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion=f"Actualización de hardware: {hardware.activo.nombre}",
                     detalles=f"Hardware {hardware.marca} {hardware.modelo} con número de serie {hardware.numero_serie}"
@@ -173,7 +154,7 @@ def hardware_delete(request, pk):
         activo.delete()    # Elimina el activo explícitamente
 
         # Registrar actividad
-        LogActividad.objects.create(
+        registrar_actividad(
             usuario=request.user,
             accion=f"Eliminación de hardware: {activo_nombre}",
             detalles=f"ID de activo: {activo_id} - Eliminado completamente"
@@ -189,36 +170,15 @@ def hardware_delete(request, pk):
 @login_required
 def software_list(request):
     """Lista de software"""
-    software_list = Software.objects.all().select_related(
-        'activo', 'activo__departamento')
-
-    # Filtros
-    search = request.GET.get('search', '')
-    departamento = request.GET.get('departamento', '')
-    estado = request.GET.get('estado', '')
-
-    if search:
-        software_list = software_list.filter(
-            activo__nombre__icontains=search
-        ) | software_list.filter(
-            version__icontains=search
-        ) | software_list.filter(
-            tipo_licencia__icontains=search
-        )
-
-    if departamento:
-        software_list = software_list.filter(
-            activo__departamento_id=departamento)
+    context = listar_activos(
+        request,
+        Software.objects.select_related('activo', 'activo__departamento'),
+        CAMPOS_BUSQUEDA_SOFTWARE
+    )
+    context['software_list'] = context['pagina'].elementos
+    context['form_accion'] = AccionMasivaForm()
 
-    if estado:
-        software_list = software_list.filter(activo__estado=estado)
-
-    return render(request, 'inventario/software_list.html', {
-        'software_list': software_list,
-        'search': search,
-        'departamento': departamento,
-        'estado': estado
-    })
+    return render(request, 'inventario/software_list.html', context)
 
 
 @login_required
@@ -260,7 +220,7 @@ def software_create(request):
             software.save()
 
             # Registrar actividad
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion=f"Creación de software: {activo.nombre}",
                 detalles=f"Software versión {software.version} con licencia {software.get_tipo_licencia_display()}"
@@ -283,7 +243,7 @@ def software_detail(request, pk):
     software = get_object_or_404(Software, activo_id=pk)
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de software: {software.activo.nombre}",
         detalles=f"Software versión {software.version}"
@@ -304,7 +264,7 @@ def software_update(request, pk):
                 software = form.save(user=request.user)
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion=f"Actualización de software: {software.activo.nombre}",
                     detalles=f"Software versión {software.version} con licencia {software.get_tipo_licencia_display()}"
@@ -344,7 +304,7 @@ def software_delete(request, pk):
         activo.delete()    # Elimina el activo explícitamente
 
         # Registrar actividad
-        LogActividad.objects.create(
+        registrar_actividad(
             usuario=request.user,
             accion=f"Eliminación de software: {activo_nombre}",
             detalles=f"ID de activo: {activo_id} - Eliminado completamente"
@@ -357,6 +317,102 @@ def software_delete(request, pk):
     return render(request, 'inventario/software_confirm_delete.html', {'software': software})
 
 
+# Acciones e importación masivas
+
+
+@login_required
+def accion_masiva(request, tipo):
+    """Aplicar un cambio de estado, traslado o baja a varios activos a la vez"""
+    from urllib.parse import urlencode
+    from usuarios.decorators import tiene_permiso_inventario
+    from .acciones import aplicar_accion, describir_cambios
+
+    filtros = {
+        clave: request.POST[clave]
+        for clave in ('search', 'departamento', 'estado', 'por_pagina')
+        if request.POST.get(clave)
+    }
+    destino = redirect(f"{reverse(f'{tipo}_list')}?{urlencode(filtros)}")
+
+    if request.method != 'POST':
+        return destino
+    if not (request.user.is_superuser or tiene_permiso_inventario(request.user)):
+        messages.error(request, 'No tiene permisos para modificar activos en bloque.')
+        return destino
+
+    form = AccionMasivaForm(request.POST)
+    if not form.is_valid():
+        for errores in form.errors.values():
+            for error in errores:
+                messages.error(request, error)
+        return destino
+
+    if request.POST.get('todos'):
+        # Todos los resultados del filtro actual, no solo la página visible
+        modelo, campos = {
+            'hardware': (Hardware, CAMPOS_BUSQUEDA_HARDWARE),
+            'software': (Software, CAMPOS_BUSQUEDA_SOFTWARE),
+        }[tipo]
+        detalles = filtrar_activos(modelo.objects.all(), request.POST, campos)
+        activos = Activo.objects.filter(pk__in=detalles.values('activo_id'))
+    else:
+        ids = [valor for valor in request.POST.getlist('seleccion') if valor.isdigit()]
+        if not ids:
+            messages.error(request, 'No seleccionó ningún activo.')
+            return destino
+        activos = Activo.objects.filter(pk__in=ids, tipo=tipo)
+
+    cambios = form.cleaned_data['cambios']
+    modificados = aplicar_accion(
+        activos, cambios, usuario=request.user, ip=request.META.get('REMOTE_ADDR'))
+    messages.success(
+        request, f'{modificados} activos actualizados: {describir_cambios(cambios)}.')
+    return destino
+
+
+@login_required
+def importar_activos(request, tipo):
+    """Importar hardware o software desde un archivo CSV o XLSX"""
+    from usuarios.decorators import tiene_permiso_inventario
+    from .importacion import (
+        COLUMNAS_ACTIVO, COLUMNAS_DETALLE, OBLIGATORIAS,
+        ArchivoNoValido, ImportadorActivos, leer_filas
+    )
+
+    lista = f'{tipo}_list'
+    if not (request.user.is_superuser or tiene_permiso_inventario(request.user)):
+        messages.error(request, 'No tiene permisos para importar activos.')
+        return redirect(lista)
+
+    form = ImportacionForm(request.POST or None, request.FILES or None)
+    resultado = None
+
+    if request.method == 'POST' and form.is_valid():
+        archivo = form.cleaned_data['archivo']
+        importador = ImportadorActivos(
+            tipo, request.user, simular=form.cleaned_data['simular'])
+        try:
+            resultado = importador.importar(leer_filas(archivo.file, archivo.name))
+        except ArchivoNoValido as e:
+            messages.error(request, str(e))
+        else:
+            if resultado.creados and not importador.simular:
+                registrar_actividad(
+                    usuario=request.user,
+                    accion=f"Importación masiva de {tipo}: {resultado.creados} activos",
+                    detalles=f"Archivo {archivo.name}; {resultado.total_errores} filas con errores"
+                )
+
+    return render(request, 'inventario/importar.html', {
+        'form': form,
+        'tipo': tipo,
+        'lista': lista,
+        'resultado': resultado,
+        'columnas': COLUMNAS_ACTIVO + COLUMNAS_DETALLE[tipo],
+        'obligatorias': OBLIGATORIAS[tipo],
+    })
+
+
 @login_required
 def mantenimiento_list(request):
     """Lista de mantenimientos"""
@@ -388,6 +444,82 @@ def mantenimiento_list(request):
     })
 
 
+@login_required
+def mantenimiento_calendario(request):
+    """Calendario semanal o mensual de mantenimientos con la carga por responsable"""
+    from datetime import date
+    from django.utils import timezone
+    from usuarios.decorators import tiene_permiso_inventario
+    from .calendario import (
+        VISTAS, MANTENIMIENTOS_POR_DIA, FECHA_MINIMA, FECHA_MAXIMA, rango_vista, desplazar,
+        carga_diaria, mantenimientos_en_rango, semanas_calendario, token_ical
+    )
+
+    vista = request.GET.get('vista', 'semana')
+    if vista not in dict(VISTAS):
+        vista = 'semana'
+    try:
+        fecha = date.fromisoformat(request.GET.get('fecha', ''))
+    except ValueError:
+        fecha = timezone.localdate()
+    if not FECHA_MINIMA <= fecha <= FECHA_MAXIMA:
+        fecha = timezone.localdate()
+    responsable = request.GET.get('responsable', '')
+    if not responsable.isdigit():
+        responsable = ''
+
+    desde, hasta = rango_vista(vista, fecha)
+    carga = carga_diaria(desde, hasta, responsable or None)
+
+    # La vista mensual solo muestra los totales de cada día
+    mantenimientos = []
+    if vista == 'semana':
+        mantenimientos = mantenimientos_en_rango(
+            desde, hasta, responsable or None, por_dia=MANTENIMIENTOS_POR_DIA)
+
+    usuarios = User.objects.filter(is_active=True).only(
+        'id', 'username', 'first_name', 'last_name').order_by('username')
+
+    # Feed del técnico filtrado (solo gestores del inventario) o del propio usuario
+    tecnico = request.user
+    if responsable and (request.user.is_superuser or tiene_permiso_inventario(request.user)):
+        tecnico = usuarios.filter(pk=responsable).first() or request.user
+    url_ical = request.build_absolute_uri(
+        reverse('mantenimiento_ical', args=[token_ical(tecnico)]))
+
+    return render(request, 'inventario/mantenimiento_calendario.html', {
+        'vista': vista,
+        'vistas': VISTAS,
+        'fecha': fecha,
+        'desde': desde,
+        'hasta': hasta,
+        'anterior': desplazar(vista, fecha, -1),
+        'siguiente': desplazar(vista, fecha, 1),
+        'semanas': semanas_calendario(desde, hasta, carga, mantenimientos),
+        'total': sum(dia['total'] for dia in carga),
+        'responsable': responsable,
+        'usuarios': usuarios,
+        'tecnico': tecnico,
+        'url_ical': url_ical,
+    })
+
+
+def mantenimiento_ical(request, token):
+    """Feed iCalendar de los mantenimientos de un técnico (sin sesión, URL firmada)"""
+    from django.http import Http404, HttpResponse
+    from .calendario import feed_ical, usuario_de_token
+
+    usuario = usuario_de_token(token)
+    if usuario is None:
+        raise Http404('Feed no encontrado')
+
+    contenido = feed_ical(usuario, lambda mantenimiento: request.build_absolute_uri(
+        reverse('mantenimiento_detail', args=[mantenimiento.pk])))
+    response = HttpResponse(contenido, content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = 'inline; filename="mantenimientos.ics"'
+    return response
+
+
 @login_required
 def mantenimiento_create(request):
     """Crear mantenimiento con enfoque directo"""
@@ -423,7 +555,7 @@ def mantenimiento_create(request):
 
             # Registrar actividad
             activo_nombre = Activo.objects.get(id=activo_id).nombre
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion=f"Creación de mantenimiento para: {activo_nombre}",
                 detalles=f"Mantenimiento {mantenimiento.get_tipo_display()}, programado para {mantenimiento.fecha_programada}"
@@ -453,7 +585,7 @@ def mantenimiento_detail(request, pk):
     mantenimiento = get_object_or_404(Mantenimiento, pk=pk)
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de mantenimiento de: {mantenimiento.activo.nombre}",
         detalles=f"Mantenimiento {mantenimiento.get_tipo_display()}, programado para {mantenimiento.fecha_programada}"
@@ -496,7 +628,7 @@ def mantenimiento_update(request, pk):
             mantenimiento.save()
 
             # Registrar actividad
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion=f"Actualización de mantenimiento para: {mantenimiento.activo.nombre}",
                 detalles=f"Mantenimiento {mantenimiento.get_tipo_display()}, programado para {mantenimiento.fecha_programada}"
@@ -536,7 +668,7 @@ def mantenimiento_delete(request, pk):
         mantenimiento.delete()
 
         # Registrar actividad
-        LogActividad.objects.create(
+        registrar_actividad(
             usuario=request.user,
             accion=f"Eliminación de mantenimiento para: {activo_nombre}",
             detalles=f"ID de mantenimiento: {mantenimiento_id}, tipo: {mantenimiento_tipo}"
@@ -21,22 +21,27 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'rest_framework',
     'usuarios.apps.UsuariosConfig',
     'inventario.apps.InventarioConfig',
     'locales.apps.LocalesConfig',
     'diagnostico.apps.DiagnosticoConfig',
     'reportes.apps.ReportesConfig',
+    'busqueda.apps.BusquedaConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'usuarios.middleware.SesionDeslizanteMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'usuarios.middleware.PermisosMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'usuarios.middleware.ReportesPermissionMiddleware',
+    'usuarios.middleware.ControlAccesoMiddleware',
 ]
 
 ROOT_URLCONF = 'inventario_ucf.urls'
@@ -62,10 +67,19 @@ TEMPLATES = [
 WSGI_APPLICATION = 'inventario_ucf.wsgi.application'
 
 # Database
+# Los PRAGMA de SQLite (WAL, synchronous, busy_timeout...) se aplican al
+# abrir cada conexión; ver inventario/basedatos.py
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # atomic() toma el bloqueo de escritura al empezar
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Reutilizar la conexión entre peticiones del mismo hilo
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -109,6 +123,13 @@ LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'login'
 LOGIN_URL = 'login'
 
+# Control de acceso por prefijo de URL (ver usuarios/acceso.py)
+# prefijo -> capacidad requerida ('' solo exige sesión, None deja la ruta libre)
+ACCESO_RUTAS = {
+    '/reportes/': 'ver_reportes',
+    '/export/': 'ver_reportes',
+}
+
 # Crear directorio de logs si no existe
 LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 if not os.path.exists(LOGS_DIR):
@@ -158,18 +179,91 @@ LOGGING = {
 }
 
 # Configuración de caché
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# UCF_CACHE_BACKEND: 'locmem' (un solo proceso), 'file' o 'redis' (compartidas
+# entre procesos; 'redis' admite cualquier servidor compatible, p. ej. Valkey)
+CACHE_BACKEND = os.environ.get('UCF_CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        }
+    }
+elif CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('UCF_REDIS_URL', 'redis://127.0.0.1:6379/1'),
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
+    }
+
+# Caché de los dashboards (ver reportes/cache_dashboard.py)
+DASHBOARD_CACHE_ALIAS = 'default'
+DASHBOARD_CACHE_TIMEOUT = 300  # 5 minutos
+
+# Registro de actividad en segundo plano (ver usuarios/actividad.py)
+ACTIVIDAD_ASINCRONA = True
+ACTIVIDAD_TAMANO_LOTE = 100
+ACTIVIDAD_INTERVALO = 2.0  # segundos
+ACTIVIDAD_CAPACIDAD_COLA = 10000
+ACTIVIDAD_MUESTREO_CONSULTAS = 1.0  # 0 = no registrar consultas de detalle
+ACTIVIDAD_DIAS_RETENCION = 90  # el resto se mueve al archivo (archivar_logs)
+
+# Reportes en segundo plano (ver reportes/trabajos.py y procesar_reportes)
+REPORTES_CONCURRENCIA = 2
+REPORTES_MAX_PENDIENTES_USUARIO = 3
+REPORTES_DIAS_CONSERVACION = 7
+REPORTES_CACHE_MAX_BYTES = 256 * 1024 * 1024  # archivos en media/reportes/cache/
+REPORTES_GRAFICOS_VECTORIALES = False  # True: gráficos de ReportLab sin matplotlib
+REPORTES_PDF_FILAS_POR_PARTE = 10000  # filas por PDF; más filas se dividen en partes (ZIP)
+
+# Planificación de mantenimientos preventivos (ver inventario/planificador.py)
+MANTENIMIENTO_DIAS_ANTICIPACION = 15  # se generan los que vencen en estos días
+MANTENIMIENTO_PLANIFICADOR_AUTOMATICO = False  # True: hilo periódico en cada proceso web
+MANTENIMIENTO_PLANIFICADOR_INTERVALO = 3600  # segundos entre ejecuciones del hilo
+
+# API REST (ver api/)
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': ['api.permisos.PermisoInventario'],
+    'DEFAULT_PAGINATION_CLASS': 'api.paginacion.CursorPaginacion',
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
+    'ALLOWED_VERSIONS': ['v1'],
+    'DEFAULT_VERSION': 'v1',
 }
+API_TAMANO_PAGINA = 100
+API_TAMANO_PAGINA_MAXIMO = 1000
+# Más que la transacción de escritura más larga (ver api/sincronizacion.py)
+API_SINCRONIZACION_MARGEN = 30  # segundos
+API_DIAS_ELIMINADOS = 90
 
 # Configuración de sesiones
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# UCF_SESSION_MODE: 'cached_db' (lecturas desde la caché, escrituras también
+# en la base de datos), 'cookies' (firmadas en el navegador, sin tabla; no se
+# pueden revocar desde el servidor) o 'db'
+SESSION_MODE = os.environ.get('UCF_SESSION_MODE', 'cached_db')
+SESSION_ENGINE = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
+}[SESSION_MODE]
 SESSION_COOKIE_AGE = 3600  # 1 hora
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
-SESSION_SAVE_EVERY_REQUEST = True
+# La caducidad deslizante solo guarda la sesión cuando le quedan menos de
+# SESION_UMBRAL_RENOVACION segundos (ver usuarios/sesiones.py)
+SESSION_SAVE_EVERY_REQUEST = False
+SESION_UMBRAL_RENOVACION = 900  # 15 minutos
 
 # Configuración de seguridad adicional
 SECURE_BROWSER_XSS_FILTER = True
@@ -208,5 +302,8 @@ if 'test' in sys.argv:
         'reportes': None,
     }
 
+    # Escribir el registro de actividad dentro de la petición
+    ACTIVIDAD_ASINCRONA = False
+
     # Configuración para archivos de media en pruebas
     MEDIA_ROOT = tempfile.mkdtemp()
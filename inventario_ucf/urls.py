@@ -11,6 +11,8 @@ urlpatterns = [
     path('locales/', include('locales.urls')),
     path('diagnostico/', include('diagnostico.urls')),
     path('reportes/', include('reportes.urls')),
+    path('busqueda/', include('busqueda.urls')),
+    path('api/', include('api.urls')),
     path('', include('usuarios.urls')),  # La ruta raíz redirigirá a usuarios
 ]
 
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0004_sincronizacion'),
+        ('locales', '0002_alter_local_options_local_fecha_actualizacion_and_more'),
+        ('usuarios', '0004_archivo_log_actividad'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipamiento',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='equipamiento',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='equipamiento_cambio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='local',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='local_cambio_idx'),
+        ),
+    ]
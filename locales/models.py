@@ -41,6 +41,11 @@ class Local(models.Model):
         verbose_name = "Local"
         verbose_name_plural = "Locales"
         ordering = ['nombre']
+        indexes = [
+            # Sincronización incremental (api/sincronizacion.py)
+            models.Index(fields=['fecha_actualizacion', 'id'],
+                         name='local_cambio_idx'),
+        ]
 
 
 class Equipamiento(models.Model):
@@ -58,6 +63,7 @@ class Equipamiento(models.Model):
     estado = models.CharField(
         max_length=50, choices=ESTADO_CHOICES, default='operativo')
     notas = models.TextField(blank=True, null=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.hardware.activo.nombre} en {self.local.nombre}"
@@ -66,3 +72,7 @@ class Equipamiento(models.Model):
         verbose_name = "Equipamiento"
         verbose_name_plural = "Equipamientos"
         unique_together = ['local', 'hardware']
+        indexes = [
+            models.Index(fields=['fecha_actualizacion', 'id'],
+                         name='equipamiento_cambio_idx'),
+        ]
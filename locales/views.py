@@ -5,7 +5,8 @@ from django.contrib import messages
 from .models import Local, Equipamiento
 from .forms import LocalForm, EquipamientoForm, EquipamientoUpdateForm
 from inventario.models import Hardware
-from usuarios.models import Departamento, LogActividad
+from usuarios.models import Departamento
+from usuarios.actividad import registrar_actividad
 
 
 @login_required
@@ -20,7 +21,7 @@ def local_update(request, pk):
                 local = form.save()
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion=f"Actualización de local: {local.nombre}",
                     detalles=f"Local tipo {local.get_tipo_display()}"
@@ -61,7 +62,7 @@ def local_create(request):
                 local = form.save()
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion=f"Creación de local: {local.nombre}",
                     detalles=f"Local tipo {local.get_tipo_display()}"
@@ -103,7 +104,7 @@ def equipamiento_update(request, pk):
                 equipamiento = form.save()
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion=f"Actualización de equipamiento: {equipamiento.hardware.activo.nombre} en {equipamiento.local.nombre}",
                     detalles=f"Estado: {equipamiento.get_estado_display()}"
@@ -142,7 +143,7 @@ def equipamiento_create(request):
                 equipamiento = form.save()
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion=f"Asignación de hardware a local: {equipamiento.hardware.activo.nombre} en {equipamiento.local.nombre}",
                     detalles=f"Estado: {equipamiento.get_estado_display()}"
@@ -211,7 +212,7 @@ def local_detail(request, pk):
         local=local).select_related('hardware', 'hardware__activo')
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de local: {local.nombre}",
         detalles=f"Local tipo {local.get_tipo_display()}"
@@ -236,7 +237,7 @@ def local_delete(request, pk):
         local.delete()
 
         # Registrar actividad
-        LogActividad.objects.create(
+        registrar_actividad(
             usuario=request.user,
             accion=f"Eliminación de local: {local_nombre}",
             detalles=f"ID de local: {local_id}"
@@ -286,7 +287,7 @@ def equipamiento_detail(request, pk):
     equipamiento = get_object_or_404(Equipamiento, pk=pk)
 
     # Registrar actividad
-    LogActividad.objects.create(
+    registrar_actividad(
         usuario=request.user,
         accion=f"Consulta de equipamiento: {equipamiento.hardware.activo.nombre} en {equipamiento.local.nombre}",
         detalles=f"Estado: {equipamiento.get_estado_display()}"
@@ -308,7 +309,7 @@ def equipamiento_delete(request, pk):
         equipamiento.delete()
 
         # Registrar actividad
-        LogActividad.objects.create(
+        registrar_actividad(
             usuario=request.user,
             accion=f"Des-asignación de hardware de local: {hardware_nombre} de {local_nombre}",
             detalles=f"Hardware liberado para asignación"
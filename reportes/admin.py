@@ -1,13 +1,17 @@
 from django.contrib import admin
-from .models import Reporte, ConfiguracionDashboard
+from .models import (
+    Reporte, ConfiguracionDashboard, EstadisticaMensual, EstadisticaMantenimiento, VersionDatos
+)
 
 
 @admin.register(Reporte)
 class ReporteAdmin(admin.ModelAdmin):
-    list_display = ('nombre', 'tipo', 'usuario', 'fecha_creacion', 'formato')
-    list_filter = ('tipo', 'formato', 'fecha_creacion')
+    list_display = ('nombre', 'tipo', 'usuario', 'fecha_creacion', 'formato',
+                    'estado', 'progreso')
+    list_filter = ('tipo', 'formato', 'estado', 'fecha_creacion')
     search_fields = ('nombre', 'descripcion')
-    readonly_fields = ('fecha_creacion', 'archivo')
+    readonly_fields = ('fecha_creacion', 'archivo', 'estado', 'progreso',
+                       'mensaje_error', 'fecha_inicio', 'fecha_fin')
     autocomplete_fields = ['usuario']
 
 
@@ -17,3 +21,22 @@ class ConfiguracionDashboardAdmin(admin.ModelAdmin):
     search_fields = ('usuario__username',)
     readonly_fields = ('actualizado',)
     autocomplete_fields = ['usuario']
+
+
+@admin.register(EstadisticaMensual)
+class EstadisticaMensualAdmin(admin.ModelAdmin):
+    list_display = ('departamento', 'tipo', 'estado', 'mes', 'total')
+    list_filter = ('tipo', 'estado', 'departamento')
+    date_hierarchy = 'mes'
+
+
+@admin.register(EstadisticaMantenimiento)
+class EstadisticaMantenimientoAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'estado', 'total')
+    list_filter = ('tipo', 'estado')
+
+
+@admin.register(VersionDatos)
+class VersionDatosAdmin(admin.ModelAdmin):
+    list_display = ('dominio', 'version')
+    readonly_fields = ('dominio', 'version')
@@ -5,3 +5,6 @@ class ReportesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reportes'
     verbose_name = 'Reportes y Dashboards'
+
+    def ready(self):
+        import reportes.signals  # Importa las señales
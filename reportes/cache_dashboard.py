@@ -0,0 +1,67 @@
+# reportes/cache_dashboard.py
+"""
+Caché de fragmentos de los dashboards.
+
+Las claves incluyen un número de versión global que las señales de
+reportes/signals.py incrementan al guardar o eliminar datos de inventario,
+mantenimiento o diagnóstico; así todas las entradas anteriores quedan
+invalidadas sin tener que borrarlas una a una.
+
+El backend se elige en settings (CACHES / UCF_CACHE_BACKEND). Con varios
+procesos de trabajo debe usarse uno compartido (archivo o Redis) para que la
+versión sea la misma en todos.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+ALIAS_CACHE = getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')
+TIEMPO_CACHE = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300)
+CLAVE_VERSION = 'dashboard:version'
+
+
+def _cache():
+    return caches[ALIAS_CACHE]
+
+
+def obtener_version():
+    """Versión actual de los datos de los dashboards"""
+    cache = _cache()
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, 1, None)
+        version = cache.get(CLAVE_VERSION, 1)
+    return version
+
+
+def invalidar():
+    """Invalidar todos los fragmentos incrementando la versión"""
+    cache = _cache()
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        # La clave no existe todavía (o fue desalojada)
+        cache.add(CLAVE_VERSION, 2, None)
+
+
+def construir_clave(fragmento, alcance=()):
+    """
+    Construir la clave de un fragmento.
+
+    Args:
+        fragmento: nombre del fragmento ('resumen', 'reportes', ...)
+        alcance: partes que distinguen variantes del fragmento, como el rol,
+                 el departamento del usuario o la fecha del cálculo
+    """
+    partes = ':'.join(str(parte) for parte in alcance)
+    return f"dashboard:v{obtener_version()}:{fragmento}:{partes}"
+
+
+def obtener_fragmento(fragmento, alcance, calcular, timeout=None):
+    """Devolver el fragmento desde la caché o calcularlo y guardarlo"""
+    cache = _cache()
+    clave = construir_clave(fragmento, alcance)
+    valor = cache.get(clave)
+    if valor is None:
+        valor = calcular()
+        cache.set(clave, valor, TIEMPO_CACHE if timeout is None else timeout)
+    return valor
@@ -0,0 +1,218 @@
+# reportes/cache_reportes.py
+"""
+Caché en disco de los archivos de reportes exportados.
+
+Cada archivo se identifica por un HMAC con SECRET_KEY de (tipo de reporte,
+filtros normalizados, formato, sello de datos). El directorio está dentro de
+MEDIA_ROOT, que se sirve sin control de acceso: sin la clave no se puede
+calcular el nombre de un archivo. El sello se forma con las versiones de
+VersionDatos de las tablas que usa el reporte, que las señales de
+reportes/signals.py incrementan en cada cambio; así un archivo nunca se
+reutiliza después de modificar los datos.
+
+Los archivos se guardan en REPORTES_CACHE_DIR y se eliminan los menos usados
+recientemente cuando el total supera REPORTES_CACHE_MAX_BYTES. Las descargas
+repetidas se sirven desde disco con ETag y responden 304 a If-None-Match.
+"""
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db.models import F, Model
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .exportaciones import EXPORTACIONES, EXTENSIONES, exportar, extension_respuesta
+from .models import VersionDatos
+
+DIRECTORIO = getattr(settings, 'REPORTES_CACHE_DIR',
+                     os.path.join(settings.MEDIA_ROOT, 'reportes', 'cache'))
+TAMANO_MAXIMO = getattr(settings, 'REPORTES_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+
+# Grupos de tablas que usa cada tipo de reporte
+DEPENDENCIAS = {
+    'inventario': ['inventario', 'catalogos'],
+    'mantenimiento': ['mantenimiento', 'inventario', 'catalogos'],
+    'diagnostico': ['diagnostico', 'catalogos'],
+}
+
+# Tipo de contenido por extensión del archivo
+CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'zip': 'application/zip',
+}
+
+
+def incrementar_version(dominio):
+    """Registrar un cambio en un grupo de tablas"""
+    actualizados = VersionDatos.objects.filter(dominio=dominio).update(
+        version=F('version') + 1)
+    if not actualizados:
+        _, creado = VersionDatos.objects.get_or_create(
+            dominio=dominio, defaults={'version': 1})
+        if not creado:
+            VersionDatos.objects.filter(dominio=dominio).update(
+                version=F('version') + 1)
+
+
+def sello_dominios(dominios):
+    """Versiones actuales de un conjunto de grupos de tablas, como texto"""
+    versiones = dict(VersionDatos.objects.filter(
+        dominio__in=dominios).values_list('dominio', 'version'))
+    return '|'.join(f"{dominio}:{versiones.get(dominio, 0)}" for dominio in dominios)
+
+
+def sello_datos(tipo):
+    """Versiones de las tablas de las que depende un tipo de reporte"""
+    return sello_dominios(DEPENDENCIAS[tipo])
+
+
+def _normalizar(valor):
+    if isinstance(valor, Model):
+        return valor.pk
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def clave_reporte(tipo, datos, formato):
+    """HMAC que identifica el contenido de un reporte exportado"""
+    filtros = {
+        campo: _normalizar(valor)
+        for campo, valor in datos.items()
+        if campo != 'formato' and valor not in (None, '')
+    }
+    contenido = json.dumps(
+        [tipo, formato, filtros, sello_datos(tipo)], sort_keys=True, default=str)
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), contenido.encode('utf-8'),
+                    hashlib.sha256).hexdigest()
+
+
+def ruta_archivo(clave, extension):
+    return os.path.join(DIRECTORIO, f"{clave}.{extension}")
+
+
+def buscar_archivo(clave):
+    """Ruta y extensión del archivo guardado para una clave, o (None, None)"""
+    for extension in CONTENT_TYPES:
+        ruta = ruta_archivo(clave, extension)
+        if os.path.exists(ruta):
+            return ruta, extension
+    return None, None
+
+
+def desalojar(tamano_maximo=TAMANO_MAXIMO):
+    """
+    Eliminar los archivos usados hace más tiempo hasta quedar bajo el límite.
+
+    Returns:
+        Número de archivos eliminados
+    """
+    if not os.path.isdir(DIRECTORIO):
+        return 0
+
+    archivos = []
+    for entrada in os.scandir(DIRECTORIO):
+        if entrada.is_file() and not entrada.name.startswith('.'):
+            estado = entrada.stat()
+            archivos.append((estado.st_mtime, estado.st_size, entrada.path))
+
+    total = sum(tamano for _, tamano, _ in archivos)
+    eliminados = 0
+    for _, tamano, ruta in sorted(archivos):
+        if total <= tamano_maximo:
+            break
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+        total -= tamano
+        eliminados += 1
+    return eliminados
+
+
+def _respuesta_archivo(ruta, nombre, extension, etag):
+    respuesta = FileResponse(
+        open(ruta, 'rb'), as_attachment=True, filename=nombre,
+        content_type=CONTENT_TYPES[extension])
+    return _cabeceras(respuesta, etag)
+
+
+def _cabeceras(respuesta, etag):
+    respuesta['ETag'] = etag
+    # El navegador puede guardar el archivo pero debe revalidarlo siempre
+    respuesta['Cache-Control'] = 'private, no-cache'
+    return respuesta
+
+
+def _guardar_mientras_envia(respuesta, ruta):
+    """Escribir el contenido en un temporal mientras se envía y publicarlo al terminar"""
+    descriptor, temporal = tempfile.mkstemp(dir=DIRECTORIO, prefix='.')
+    completo = False
+    try:
+        bloques = respuesta.streaming_content if respuesta.streaming else [respuesta.content]
+        with os.fdopen(descriptor, 'wb') as destino:
+            for bloque in bloques:
+                destino.write(bloque)
+                yield bloque
+        os.replace(temporal, ruta)
+        completo = True
+        desalojar()
+    finally:
+        respuesta.close()
+        if not completo and os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def _nombre_descarga(tipo, extension):
+    return f"reporte_{tipo}_{datetime.now():%Y%m%d}.{extension}"
+
+
+def exportar_con_cache(request, tipo, datos, formato):
+    """
+    Devolver el reporte desde la caché o generarlo y guardarlo.
+
+    Raises:
+        ValueError: si el formato no es válido
+    """
+    formato = formato.lower()
+    if formato not in EXTENSIONES:
+        raise ValueError(f"Formato de exportación no válido: {formato}")
+
+    clave = clave_reporte(tipo, datos, formato)
+    etag = quote_etag(clave)
+
+    no_modificado = get_conditional_response(request, etag=etag)
+    if no_modificado is not None:
+        return _cabeceras(no_modificado, etag)
+
+    ruta, extension = buscar_archivo(clave)
+    if ruta:
+        # Marcar como usado recientemente para el desalojo LRU
+        os.utime(ruta)
+        return _respuesta_archivo(ruta, _nombre_descarga(tipo, extension), extension, etag)
+
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    preparar = EXPORTACIONES[tipo][1]
+    respuesta = exportar(preparar(datos), formato)
+
+    extension = extension_respuesta(respuesta, formato)
+    ruta = ruta_archivo(clave, extension)
+    nombre = _nombre_descarga(tipo, extension)
+
+    if respuesta.streaming:
+        streaming = StreamingHttpResponse(
+            _guardar_mientras_envia(respuesta, ruta), content_type=CONTENT_TYPES[extension])
+        streaming['Content-Disposition'] = f'attachment; filename="{nombre}"'
+        return _cabeceras(streaming, etag)
+
+    for _ in _guardar_mientras_envia(respuesta, ruta):
+        pass
+    return _respuesta_archivo(ruta, nombre, extension, etag)
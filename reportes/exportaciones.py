@@ -0,0 +1,261 @@
+# reportes/exportaciones.py
+"""
+Definición de las exportaciones de reportes.
+
+Cada exportación convierte los datos validados de su formulario en el
+queryset, los campos, el título y los filtros del archivo. Las usan tanto
+las vistas de exportación como los trabajos en segundo plano.
+"""
+from .forms import InventarioReportForm, MantenimientoReportForm, TransformacionDigitalReportForm
+
+FORMATOS = ('pdf', 'excel', 'csv')
+
+EXTENSIONES = {
+    'pdf': 'pdf',
+    'excel': 'xlsx',
+    'csv': 'csv',
+}
+
+
+def extension_respuesta(respuesta, formato):
+    """Extensión del archivo generado (los PDF divididos en partes llegan en un ZIP)"""
+    if respuesta.get('Content-Type', '').startswith('application/zip'):
+        return 'zip'
+    return EXTENSIONES[formato]
+
+
+def preparar_inventario(datos):
+    """Exportación del inventario de activos"""
+    from inventario.models import Activo, Hardware, Software
+
+    queryset = Activo.objects.all()
+
+    # Filtrar por tipo
+    tipo = datos.get('tipo')
+    if tipo == 'hardware':
+        hardware_ids = Hardware.objects.values_list('activo_id', flat=True)
+        queryset = queryset.filter(id__in=hardware_ids)
+    elif tipo == 'software':
+        software_ids = Software.objects.values_list('activo_id', flat=True)
+        queryset = queryset.filter(id__in=software_ids)
+
+    # Filtrar por departamento
+    departamento = datos.get('departamento')
+    if departamento:
+        queryset = queryset.filter(departamento=departamento)
+
+    # Filtrar por estado
+    estado = datos.get('estado')
+    if estado:
+        queryset = queryset.filter(estado=estado)
+
+    # Filtrar por fechas
+    fecha_inicio = datos.get('fecha_inicio')
+    fecha_fin = datos.get('fecha_fin')
+
+    if fecha_inicio:
+        queryset = queryset.filter(fecha_adquisicion__gte=fecha_inicio)
+    if fecha_fin:
+        queryset = queryset.filter(fecha_adquisicion__lte=fecha_fin)
+
+    queryset = queryset.select_related(
+        'departamento').order_by('-fecha_adquisicion')
+
+    # Definir campos para el reporte
+    fields = [
+        {'name': 'id', 'label': 'ID'},
+        {'name': 'nombre', 'label': 'Nombre'},
+        {'name': 'get_tipo_display', 'label': 'Tipo'},
+        {'name': 'departamento.nombre', 'label': 'Departamento'},
+        {'name': 'get_estado_display', 'label': 'Estado'},
+        {'name': 'valor_adquisicion', 'label': 'Valor Adquisición'},
+        {'name': 'fecha_adquisicion', 'label': 'Fecha Adquisición'},
+    ]
+
+    # Filtros aplicados para el encabezado del reporte
+    filtros = {}
+
+    if tipo:
+        filtros['Tipo'] = tipo.title()
+    if departamento:
+        filtros['Departamento'] = departamento.nombre
+    if estado:
+        filtros['Estado'] = estado.replace('_', ' ').title()
+    if fecha_inicio:
+        filtros['Fecha desde'] = fecha_inicio.strftime('%d/%m/%Y')
+    if fecha_fin:
+        filtros['Fecha hasta'] = fecha_fin.strftime('%d/%m/%Y')
+
+    return {
+        'queryset': queryset,
+        'fields': fields,
+        'title': "Reporte de Inventario",
+        'filters': filtros,
+    }
+
+
+def preparar_mantenimiento(datos):
+    """Exportación de mantenimientos"""
+    from inventario.models import Mantenimiento
+
+    queryset = Mantenimiento.objects.select_related('activo', 'responsable')
+
+    # Filtros del formulario
+    tipo = datos.get('tipo')
+    if tipo:
+        queryset = queryset.filter(tipo=tipo)
+
+    estado = datos.get('estado')
+    if estado:
+        queryset = queryset.filter(estado=estado)
+
+    responsable = datos.get('responsable')
+    if responsable:
+        queryset = queryset.filter(responsable=responsable)
+
+    fecha_inicio = datos.get('fecha_inicio')
+    fecha_fin = datos.get('fecha_fin')
+
+    if fecha_inicio:
+        queryset = queryset.filter(fecha_programada__gte=fecha_inicio)
+    if fecha_fin:
+        queryset = queryset.filter(fecha_programada__lte=fecha_fin)
+
+    queryset = queryset.order_by('-fecha_programada')
+
+    # Definir campos para el reporte
+    fields = [
+        {'name': 'id', 'label': 'ID'},
+        {'name': 'activo.nombre', 'label': 'Activo'},
+        {'name': 'get_tipo_display', 'label': 'Tipo'},
+        {'name': 'fecha_programada', 'label': 'Fecha Programada'},
+        {'name': 'fecha_realizacion', 'label': 'Fecha Realización'},
+        {'name': 'responsable.get_full_name', 'label': 'Responsable'},
+        {'name': 'get_estado_display', 'label': 'Estado'},
+        {'name': 'costo', 'label': 'Costo'},
+        {'name': 'descripcion', 'label': 'Descripción'},
+    ]
+
+    # Filtros aplicados para el encabezado del reporte
+    filtros = {}
+
+    if tipo:
+        filtros['Tipo'] = tipo.title()
+    if estado:
+        filtros['Estado'] = estado.replace('_', ' ').title()
+    if responsable:
+        filtros['Responsable'] = responsable.get_full_name()
+    if fecha_inicio:
+        filtros['Fecha desde'] = fecha_inicio.strftime('%d/%m/%Y')
+    if fecha_fin:
+        filtros['Fecha hasta'] = fecha_fin.strftime('%d/%m/%Y')
+
+    return {
+        'queryset': queryset,
+        'fields': fields,
+        'title': "Reporte de Mantenimientos",
+        'filters': filtros,
+    }
+
+
+def preparar_diagnostico(datos):
+    """Exportación de diagnósticos de transformación digital"""
+    from diagnostico.models import Diagnostico
+
+    queryset = Diagnostico.objects.select_related(
+        'departamento', 'cuestionario', 'responsable'
+    )
+
+    departamento = datos.get('departamento')
+    if departamento:
+        queryset = queryset.filter(departamento=departamento)
+
+    fecha_inicio = datos.get('fecha_inicio')
+    fecha_fin = datos.get('fecha_fin')
+
+    if fecha_inicio:
+        queryset = queryset.filter(fecha__gte=fecha_inicio)
+    if fecha_fin:
+        queryset = queryset.filter(fecha__lte=fecha_fin)
+
+    queryset = queryset.order_by('-fecha')
+
+    # Definir campos para el reporte
+    fields = [
+        {'name': 'id', 'label': 'ID'},
+        {'name': 'departamento.nombre', 'label': 'Departamento'},
+        {'name': 'cuestionario.titulo', 'label': 'Cuestionario'},
+        {'name': 'fecha', 'label': 'Fecha'},
+        {'name': 'nivel_general', 'label': 'Nivel General'},
+        {'name': 'responsable.get_full_name', 'label': 'Responsable'},
+        {'name': 'observaciones', 'label': 'Observaciones'},
+    ]
+
+    # Filtros aplicados para el encabezado del reporte
+    filtros = {}
+
+    if departamento:
+        filtros['Departamento'] = departamento.nombre
+    if fecha_inicio:
+        filtros['Fecha desde'] = fecha_inicio.strftime('%d/%m/%Y')
+    if fecha_fin:
+        filtros['Fecha hasta'] = fecha_fin.strftime('%d/%m/%Y')
+
+    return {
+        'queryset': queryset,
+        'fields': fields,
+        'title': "Reporte de Transformación Digital",
+        'filters': filtros,
+    }
+
+
+# tipo de reporte -> (formulario de filtros, preparación, vista del formulario)
+EXPORTACIONES = {
+    'inventario': (InventarioReportForm, preparar_inventario, 'inventario_report'),
+    'mantenimiento': (MantenimientoReportForm, preparar_mantenimiento, 'mantenimiento_report'),
+    'diagnostico': (TransformacionDigitalReportForm, preparar_diagnostico,
+                    'transformacion_digital_report'),
+}
+
+
+def exportar(preparado, formato, progreso=None):
+    """
+    Generar la respuesta con el archivo del reporte.
+
+    Args:
+        progreso: función que recibe el número de filas leídas
+
+    Raises:
+        ValueError: si el formato no es válido
+    """
+    # utils carga ReportLab y xlsxwriter: solo al exportar
+    from .utils import export_queryset_to_pdf, export_queryset_to_excel, export_queryset_to_csv
+
+    formato = formato.lower()
+
+    if formato == 'pdf':
+        return export_queryset_to_pdf(
+            queryset=preparado['queryset'],
+            fields=preparado['fields'],
+            title=preparado['title'],
+            filters=preparado['filters'],
+            landscape=True,
+            progress=progreso
+        )
+    elif formato == 'excel':
+        return export_queryset_to_excel(
+            queryset=preparado['queryset'],
+            fields=preparado['fields'],
+            title=preparado['title'],
+            filters=preparado['filters'],
+            progress=progreso
+        )
+    elif formato == 'csv':
+        return export_queryset_to_csv(
+            queryset=preparado['queryset'],
+            fields=preparado['fields'],
+            title=preparado['title'],
+            progress=progreso
+        )
+
+    raise ValueError(f"Formato de exportación no válido: {formato}")
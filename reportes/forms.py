@@ -24,6 +24,7 @@ class InventarioReportForm(forms.Form):
     FORMATO_CHOICES = [
         ('pdf', 'PDF'),
         ('excel', 'Excel'),
+        ('csv', 'CSV'),
     ]
 
     tipo = forms.ChoiceField(
@@ -90,6 +91,7 @@ class MantenimientoReportForm(forms.Form):
     FORMATO_CHOICES = [
         ('pdf', 'PDF'),
         ('excel', 'Excel'),
+        ('csv', 'CSV'),
     ]
 
     tipo = forms.ChoiceField(
@@ -143,6 +145,7 @@ class TransformacionDigitalReportForm(forms.Form):
     FORMATO_CHOICES = [
         ('pdf', 'PDF'),
         ('excel', 'Excel'),
+        ('csv', 'CSV'),
     ]
 
     departamento = forms.ModelChoiceField(
@@ -177,3 +180,32 @@ class TransformacionDigitalReportForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-control'}),
         label='Formato de exportación'
     )
+
+
+class ActividadReportForm(forms.Form):
+    """Formulario para filtros del reporte de actividad (incluye el archivo)"""
+
+    usuario = forms.ModelChoiceField(
+        queryset=User.objects.order_by('username'),
+        required=False,
+        empty_label="Todos",
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+
+    fecha_inicio = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={
+            'class': 'form-control',
+            'type': 'date'
+        }),
+        label='Desde'
+    )
+
+    fecha_fin = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={
+            'class': 'form-control',
+            'type': 'date'
+        }),
+        label='Hasta'
+    )
@@ -0,0 +1,184 @@
+# reportes/kpis.py
+"""
+Indicadores materializados para el dashboard de reportes.
+
+Las tablas EstadisticaMensual y EstadisticaMantenimiento guardan conteos
+pre-agregados. Las señales aplican incrementos (+1/-1) al guardar o eliminar
+registros; recalcular_estadisticas() reconstruye todo desde cero y corrige
+cualquier desviación causada por operaciones masivas (update/bulk_create).
+"""
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Sum, Value, When
+from django.db.models.functions import TruncMonth
+
+from inventario.estadisticas import ES_INVENTARIO, ESTADOS_PENDIENTES, ESTADOS_VIGENTES
+from inventario.models import Activo, Hardware, Software, Mantenimiento
+from .models import EstadisticaMensual, EstadisticaMantenimiento
+
+
+def primer_dia_mes(fecha):
+    """Normalizar una fecha al primer día de su mes"""
+    if isinstance(fecha, str):
+        fecha = date.fromisoformat(fecha)
+    return fecha.replace(day=1)
+
+
+def clave_activo(activo, tipo):
+    """Dimensiones de la estadística a la que pertenece un activo"""
+    return {
+        'departamento_id': activo.departamento_id,
+        'tipo': tipo,
+        'estado': activo.estado,
+        'mes': primer_dia_mes(activo.fecha_adquisicion),
+    }
+
+
+def tipo_inventario(activo_id):
+    """Tipo de detalle del activo ('hardware', 'software' o None)"""
+    if Hardware.objects.filter(activo_id=activo_id).exists():
+        return 'hardware'
+    if Software.objects.filter(activo_id=activo_id).exists():
+        return 'software'
+    return None
+
+
+def _ajustar(modelo, clave, delta):
+    """Sumar delta al contador identificado por clave"""
+    actualizados = modelo.objects.filter(**clave).update(total=F('total') + delta)
+    if not actualizados and delta > 0:
+        _, creado = modelo.objects.get_or_create(defaults={'total': delta}, **clave)
+        if not creado:
+            modelo.objects.filter(**clave).update(total=F('total') + delta)
+
+
+def ajustar_activo(clave, delta):
+    _ajustar(EstadisticaMensual, clave, delta)
+
+
+def ajustar_mantenimiento(tipo, estado, delta):
+    _ajustar(EstadisticaMantenimiento, {'tipo': tipo, 'estado': estado}, delta)
+
+
+def agrupar_activos(queryset):
+    """Conteo de los activos del queryset por dimensiones de la estadística"""
+    return queryset.filter(ES_INVENTARIO).annotate(
+        mes=TruncMonth('fecha_adquisicion'),
+        tipo_detalle=Case(
+            When(hardware__isnull=False, then=Value('hardware')),
+            default=Value('software'),
+        ),
+    ).values('departamento_id', 'tipo_detalle', 'estado', 'mes').annotate(
+        cantidad=Count('id')
+    ).order_by()
+
+
+def mover_activos(queryset, cambios):
+    """
+    Trasladar entre contadores los activos del queryset antes de aplicarles
+    un update() masivo, que no envía señales.
+
+    Args:
+        cambios: nuevos valores de 'estado' y/o 'departamento_id'
+    """
+    for fila in agrupar_activos(queryset):
+        anterior = {
+            'departamento_id': fila['departamento_id'],
+            'tipo': fila['tipo_detalle'],
+            'estado': fila['estado'],
+            'mes': fila['mes'],
+        }
+        nueva = {**anterior, **{
+            campo: valor for campo, valor in cambios.items()
+            if campo in ('estado', 'departamento_id')
+        }}
+        if nueva != anterior:
+            ajustar_activo(anterior, -fila['cantidad'])
+            ajustar_activo(nueva, fila['cantidad'])
+
+
+def recalcular_estadisticas():
+    """
+    Reconstruir las tablas de estadísticas desde las tablas de origen.
+
+    Returns:
+        Tupla (filas de activos, filas de mantenimiento) generadas
+    """
+    filas_activos = agrupar_activos(Activo.objects.all())
+
+    filas_mantenimiento = Mantenimiento.objects.values(
+        'tipo', 'estado'
+    ).annotate(cantidad=Count('id')).order_by()
+
+    with transaction.atomic():
+        EstadisticaMensual.objects.all().delete()
+        EstadisticaMantenimiento.objects.all().delete()
+
+        estadisticas = EstadisticaMensual.objects.bulk_create([
+            EstadisticaMensual(
+                departamento_id=fila['departamento_id'],
+                tipo=fila['tipo_detalle'],
+                estado=fila['estado'],
+                mes=fila['mes'],
+                total=fila['cantidad'],
+            )
+            for fila in filas_activos
+        ])
+        mantenimientos = EstadisticaMantenimiento.objects.bulk_create([
+            EstadisticaMantenimiento(
+                tipo=fila['tipo'], estado=fila['estado'], total=fila['cantidad'])
+            for fila in filas_mantenimiento
+        ])
+
+    return len(estadisticas), len(mantenimientos)
+
+
+def _sumar(queryset):
+    return queryset.aggregate(suma=Sum('total'))['suma'] or 0
+
+
+def meses_anteriores(cantidad, hoy):
+    """Primer día de los últimos `cantidad` meses, del más antiguo al actual"""
+    meses = []
+    anio, mes = hoy.year, hoy.month
+    for _ in range(cantidad):
+        meses.append(date(anio, mes, 1))
+        mes -= 1
+        if mes == 0:
+            anio, mes = anio - 1, 12
+    return meses[::-1]
+
+
+def obtener_kpis(hoy, limite_departamentos=10, meses=12):
+    """Leer los indicadores del dashboard desde las tablas materializadas"""
+    estadisticas = EstadisticaMensual.objects.filter(total__gt=0)
+    vigentes = estadisticas.exclude(estado='baja')
+
+    por_departamento = list(
+        vigentes.values('departamento__nombre').annotate(
+            total=Sum('total')).order_by('-total')[:limite_departamentos]
+    )
+    por_estado = list(
+        estadisticas.values('estado').annotate(
+            total=Sum('total')).order_by('-total')
+    )
+
+    serie_meses = meses_anteriores(meses, hoy)
+    por_mes = dict(
+        estadisticas.filter(mes__gte=serie_meses[0], mes__lte=serie_meses[-1])
+        .values('mes').annotate(total=Sum('total')).values_list('mes', 'total')
+    )
+
+    return {
+        'total_activos': _sumar(vigentes),
+        'total_hardware': _sumar(estadisticas.filter(
+            tipo='hardware', estado__in=ESTADOS_VIGENTES)),
+        'total_software': _sumar(estadisticas.filter(
+            tipo='software', estado__in=ESTADOS_VIGENTES)),
+        'mantenimientos_pendientes': _sumar(
+            EstadisticaMantenimiento.objects.filter(estado__in=ESTADOS_PENDIENTES)),
+        'por_departamento': por_departamento,
+        'por_estado': por_estado,
+        'por_mes': [(mes, por_mes.get(mes, 0)) for mes in serie_meses],
+    }
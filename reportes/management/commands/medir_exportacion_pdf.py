@@ -0,0 +1,75 @@
+# reportes/management/commands/medir_exportacion_pdf.py
+import resource
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from reportes.utils import PDF_ROWS_PER_PART, PDFExporter
+
+
+class Command(BaseCommand):
+    help = 'Mide el tiempo y el pico de memoria de la exportación PDF de tablas grandes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--filas',
+            type=int,
+            default=100000,
+            help='Filas de prueba generadas en memoria (por defecto 100000)',
+        )
+        parser.add_argument(
+            '--filas-por-parte',
+            type=int,
+            default=PDF_ROWS_PER_PART,
+            help=f'Filas por archivo PDF (por defecto {PDF_ROWS_PER_PART})',
+        )
+        parser.add_argument(
+            '--tracemalloc',
+            action='store_true',
+            help='Medir el pico de memoria de Python con tracemalloc (bastante más lento)',
+        )
+
+    def filas_prueba(self, total):
+        inicio = date(2020, 1, 1)
+        for numero in range(1, total + 1):
+            yield [
+                str(numero),
+                f'Activo de prueba {numero}',
+                'Hardware' if numero % 3 else 'Software',
+                f'Departamento {numero % 25}',
+                'Operativo',
+                f'{numero % 5000}.00',
+                str(inicio + timedelta(days=numero % 1800)),
+            ]
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'📄 Generando un PDF de {options["filas"]} filas '
+            f'({options["filas_por_parte"]} por parte)...')
+
+        exporter = PDFExporter()
+        data_config = {
+            'title': 'Prueba de rendimiento',
+            'headers': ['ID', 'Nombre', 'Tipo', 'Departamento', 'Estado',
+                        'Valor Adquisición', 'Fecha Adquisición'],
+            'landscape': True,
+        }
+        respuesta = exporter.export_rows_to_pdf(
+            data_config, self.filas_prueba(options['filas']), 'prueba_rendimiento.pdf',
+            rows_per_part=options['filas_por_parte'], measure_memory=options['tracemalloc'])
+        tamano = sum(len(bloque) for bloque in respuesta.streaming_content)
+        respuesta.close()
+
+        estadisticas = exporter.build_stats
+        self.stdout.write(f'   ✓ Filas: {estadisticas["rows"]}')
+        self.stdout.write(f'   ✓ Partes: {estadisticas["parts"]}')
+        self.stdout.write(f'   ✓ Tiempo: {estadisticas["seconds"]:.2f} segundos')
+        if estadisticas['peak_memory'] is not None:
+            self.stdout.write(
+                f'   ✓ Pico de memoria (tracemalloc): {estadisticas["peak_memory"] / (1024 * 1024):.1f} MB')
+        # ru_maxrss está en KB en Linux
+        self.stdout.write(
+            f'   ✓ Pico de memoria del proceso: '
+            f'{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB')
+        self.stdout.write(f'   ✓ Tamaño: {tamano / 1024:.0f} KB')
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Medición completada'))
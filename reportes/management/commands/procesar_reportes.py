@@ -0,0 +1,73 @@
+# reportes/management/commands/procesar_reportes.py
+import time
+
+from django.core.management.base import BaseCommand
+from reportes.trabajos import (
+    CONCURRENCIA, DIAS_CONSERVACION, limpiar_reportes, procesar_pendientes, recuperar_bloqueados
+)
+
+# Segundos entre limpiezas de archivos antiguos en modo continuo
+INTERVALO_LIMPIEZA = 3600
+
+
+class Command(BaseCommand):
+    help = 'Genera en segundo plano los reportes solicitados por los usuarios'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=CONCURRENCIA,
+            help=f'Reportes generados a la vez (por defecto {CONCURRENCIA})',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5,
+            help='Segundos de espera cuando no hay reportes pendientes',
+        )
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Procesar los pendientes y terminar',
+        )
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=DIAS_CONSERVACION,
+            help=f'Días que se conservan los reportes generados (por defecto {DIAS_CONSERVACION})',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'📄 Procesando reportes con {options["workers"]} worker(s)...')
+
+        ultima_limpieza = 0
+        try:
+            while True:
+                if time.time() - ultima_limpieza >= INTERVALO_LIMPIEZA:
+                    recuperados = recuperar_bloqueados()
+                    if recuperados:
+                        self.stdout.write(
+                            self.style.WARNING(f'   ⚠ {recuperados} reportes bloqueados reiniciados'))
+                    eliminados = limpiar_reportes(options['dias'])
+                    if eliminados:
+                        self.stdout.write(f'   🗑️  {eliminados} reportes antiguos eliminados')
+                    ultima_limpieza = time.time()
+
+                inicio = time.time()
+                procesados = procesar_pendientes(concurrencia=options['workers'])
+                if procesados:
+                    self.stdout.write(
+                        f'   ✓ {procesados} reportes generados en {time.time() - inicio:.2f} segundos')
+
+                if options['una_vez']:
+                    break
+                if not procesados:
+                    time.sleep(options['intervalo'])
+
+        except KeyboardInterrupt:
+            self.stdout.write('\n⏹️  Procesamiento detenido')
+            return
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Reportes pendientes procesados'))
@@ -0,0 +1,23 @@
+# reportes/management/commands/recompute_kpis.py
+import time
+
+from django.core.management.base import BaseCommand
+from reportes.kpis import recalcular_estadisticas
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye las estadísticas materializadas del dashboard de reportes'
+
+    def handle(self, *args, **options):
+        self.stdout.write('📊 Recalculando estadísticas...')
+
+        inicio = time.time()
+        filas_activos, filas_mantenimiento = recalcular_estadisticas()
+
+        self.stdout.write(f'   ✓ Estadísticas de activos: {filas_activos} filas')
+        self.stdout.write(
+            f'   ✓ Estadísticas de mantenimiento: {filas_mantenimiento} filas')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Estadísticas recalculadas en {time.time() - inicio:.2f} segundos')
+        )
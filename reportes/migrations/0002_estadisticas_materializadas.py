@@ -0,0 +1,89 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, Count, Q, Value, When
+from django.db.models.functions import TruncMonth
+
+
+def poblar_estadisticas(apps, schema_editor):
+    """Calcular los contadores iniciales a partir de los datos existentes"""
+    Activo = apps.get_model('inventario', 'Activo')
+    Mantenimiento = apps.get_model('inventario', 'Mantenimiento')
+    EstadisticaMensual = apps.get_model('reportes', 'EstadisticaMensual')
+    EstadisticaMantenimiento = apps.get_model(
+        'reportes', 'EstadisticaMantenimiento')
+
+    filas = Activo.objects.filter(
+        Q(hardware__isnull=False) | Q(software__isnull=False)
+    ).annotate(
+        mes=TruncMonth('fecha_adquisicion'),
+        tipo_detalle=Case(
+            When(hardware__isnull=False, then=Value('hardware')),
+            default=Value('software'),
+        ),
+    ).values('departamento_id', 'tipo_detalle', 'estado', 'mes').annotate(
+        cantidad=Count('id')
+    ).order_by()
+
+    EstadisticaMensual.objects.bulk_create([
+        EstadisticaMensual(
+            departamento_id=fila['departamento_id'],
+            tipo=fila['tipo_detalle'],
+            estado=fila['estado'],
+            mes=fila['mes'],
+            total=fila['cantidad'],
+        )
+        for fila in filas
+    ])
+
+    EstadisticaMantenimiento.objects.bulk_create([
+        EstadisticaMantenimiento(
+            tipo=fila['tipo'], estado=fila['estado'], total=fila['cantidad'])
+        for fila in Mantenimiento.objects.values('tipo', 'estado').annotate(
+            cantidad=Count('id')).order_by()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reportes', '0001_initial'),
+        ('inventario', '0003_indices_listado'),
+        ('usuarios', '0002_remove_perfilusuario_cargo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticaMantenimiento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=20)),
+                ('estado', models.CharField(max_length=20)),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Estadística de Mantenimiento',
+                'verbose_name_plural': 'Estadísticas de Mantenimiento',
+                'unique_together': {('tipo', 'estado')},
+            },
+        ),
+        migrations.CreateModel(
+            name='EstadisticaMensual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=20)),
+                ('estado', models.CharField(max_length=20)),
+                ('mes', models.DateField(help_text='Primer día del mes de adquisición')),
+                ('total', models.IntegerField(default=0)),
+                ('departamento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='estadisticas', to='usuarios.departamento')),
+            ],
+            options={
+                'verbose_name': 'Estadística Mensual',
+                'verbose_name_plural': 'Estadísticas Mensuales',
+                'indexes': [models.Index(fields=['mes'], name='estadistica_mes_idx')],
+                'unique_together': {('departamento', 'tipo', 'estado', 'mes')},
+            },
+        ),
+        migrations.RunPython(poblar_estadisticas, migrations.RunPython.noop),
+    ]
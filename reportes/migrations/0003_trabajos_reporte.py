@@ -0,0 +1,51 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def marcar_existentes(apps, schema_editor):
+    """Los reportes anteriores no son trabajos pendientes"""
+    Reporte = apps.get_model('reportes', 'Reporte')
+    Reporte.objects.update(estado='completado', progreso=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reportes', '0002_estadisticas_materializadas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reporte',
+            name='estado',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('en_proceso', 'En proceso'), ('completado', 'Completado'), ('error', 'Error')], default='pendiente', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='reporte',
+            name='fecha_fin',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporte',
+            name='fecha_inicio',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporte',
+            name='mensaje_error',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporte',
+            name='progreso',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='reporte',
+            index=models.Index(fields=['estado', 'fecha_creacion'], name='reporte_estado_fecha_idx'),
+        ),
+        migrations.RunPython(marcar_existentes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reportes', '0003_trabajos_reporte'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionDatos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dominio', models.CharField(max_length=30, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Versión de Datos',
+                'verbose_name_plural': 'Versiones de Datos',
+            },
+        ),
+    ]
@@ -15,6 +15,12 @@ class Reporte(models.Model):
         ('csv', 'CSV'),
         ('excel', 'Excel'),
     ]
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('en_proceso', 'En proceso'),
+        ('completado', 'Completado'),
+        ('error', 'Error'),
+    ]
 
     nombre = models.CharField(max_length=200)
     tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
@@ -27,6 +33,14 @@ class Reporte(models.Model):
         max_length=10, choices=FORMATO_CHOICES, default='pdf')
     archivo = models.FileField(upload_to='reportes/', blank=True, null=True)
 
+    # Generación en segundo plano (ver reportes/trabajos.py)
+    estado = models.CharField(
+        max_length=20, choices=ESTADO_CHOICES, default='pendiente')
+    progreso = models.PositiveSmallIntegerField(default=0)
+    mensaje_error = models.TextField(blank=True, null=True)
+    fecha_inicio = models.DateTimeField(blank=True, null=True)
+    fecha_fin = models.DateTimeField(blank=True, null=True)
+
     def __str__(self):
         return f"{self.nombre} ({self.get_tipo_display()})"
 
@@ -34,6 +48,10 @@ class Reporte(models.Model):
         verbose_name = "Reporte"
         verbose_name_plural = "Reportes"
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion'],
+                         name='reporte_estado_fecha_idx'),
+        ]
 
 
 class ConfiguracionDashboard(models.Model):
@@ -49,3 +67,56 @@ class ConfiguracionDashboard(models.Model):
     class Meta:
         verbose_name = "Configuración de Dashboard"
         verbose_name_plural = "Configuraciones de Dashboard"
+
+
+class EstadisticaMensual(models.Model):
+    """
+    Conteo materializado de activos del inventario por departamento, tipo,
+    estado y mes de adquisición. Se mantiene con señales (reportes/signals.py)
+    y se reconstruye con el comando recompute_kpis.
+    """
+    departamento = models.ForeignKey(
+        'usuarios.Departamento', on_delete=models.CASCADE, related_name='estadisticas')
+    tipo = models.CharField(max_length=20)
+    estado = models.CharField(max_length=20)
+    mes = models.DateField(help_text="Primer día del mes de adquisición")
+    total = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.departamento} - {self.tipo} {self.estado} {self.mes:%m/%Y}: {self.total}"
+
+    class Meta:
+        verbose_name = "Estadística Mensual"
+        verbose_name_plural = "Estadísticas Mensuales"
+        unique_together = ['departamento', 'tipo', 'estado', 'mes']
+        indexes = [
+            models.Index(fields=['mes'], name='estadistica_mes_idx'),
+        ]
+
+
+class EstadisticaMantenimiento(models.Model):
+    """Conteo materializado de mantenimientos por tipo y estado"""
+    tipo = models.CharField(max_length=20)
+    estado = models.CharField(max_length=20)
+    total = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.tipo} {self.estado}: {self.total}"
+
+    class Meta:
+        verbose_name = "Estadística de Mantenimiento"
+        verbose_name_plural = "Estadísticas de Mantenimiento"
+        unique_together = ['tipo', 'estado']
+
+
+class VersionDatos(models.Model):
+    """Contador de cambios de un grupo de tablas (sello de los reportes cacheados)"""
+    dominio = models.CharField(max_length=30, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.dominio}: {self.version}"
+
+    class Meta:
+        verbose_name = "Versión de Datos"
+        verbose_name_plural = "Versiones de Datos"
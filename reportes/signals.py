@@ -0,0 +1,130 @@
+# reportes/signals.py
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.contrib.auth.models import User
+from django.dispatch import receiver
+from inventario.models import Activo, Hardware, Software, Mantenimiento
+from diagnostico.models import Cuestionario, Diagnostico
+from usuarios.models import Departamento
+from locales.models import Local, Equipamiento
+from . import kpis, cache_dashboard, cache_reportes
+
+
+@receiver(pre_save, sender=Activo)
+def capturar_activo_anterior(sender, instance, **kwargs):
+    """Guardar la clave estadística previa del activo antes de modificarlo"""
+    instance._clave_kpi_anterior = None
+    if instance.pk is None:
+        return
+
+    anterior = Activo.objects.filter(pk=instance.pk).only(
+        'departamento_id', 'estado', 'fecha_adquisicion').first()
+    if anterior:
+        tipo = kpis.tipo_inventario(instance.pk)
+        if tipo:
+            instance._clave_kpi_anterior = kpis.clave_activo(anterior, tipo)
+
+
+@receiver(post_save, sender=Activo)
+def actualizar_kpi_activo(sender, instance, created, **kwargs):
+    """Mover el activo entre contadores si cambió su departamento, estado o fecha"""
+    anterior = getattr(instance, '_clave_kpi_anterior', None)
+    if created or anterior is None:
+        return
+
+    nueva = kpis.clave_activo(instance, anterior['tipo'])
+    if nueva != anterior:
+        kpis.ajustar_activo(anterior, -1)
+        kpis.ajustar_activo(nueva, 1)
+
+
+@receiver(post_save, sender=Hardware)
+@receiver(post_save, sender=Software)
+def alta_kpi_detalle(sender, instance, created, **kwargs):
+    """Un activo entra en las estadísticas al crear su detalle"""
+    if created:
+        tipo = 'hardware' if sender is Hardware else 'software'
+        kpis.ajustar_activo(kpis.clave_activo(instance.activo, tipo), 1)
+
+
+@receiver(post_delete, sender=Hardware)
+@receiver(post_delete, sender=Software)
+def baja_kpi_detalle(sender, instance, **kwargs):
+    """Un activo sale de las estadísticas al eliminar su detalle"""
+    tipo = 'hardware' if sender is Hardware else 'software'
+    kpis.ajustar_activo(kpis.clave_activo(instance.activo, tipo), -1)
+
+
+@receiver(pre_save, sender=Mantenimiento)
+def capturar_mantenimiento_anterior(sender, instance, **kwargs):
+    """Guardar tipo y estado previos del mantenimiento"""
+    instance._kpi_anterior = None
+    if instance.pk is not None:
+        instance._kpi_anterior = Mantenimiento.objects.filter(
+            pk=instance.pk).values_list('tipo', 'estado').first()
+
+
+@receiver(post_save, sender=Mantenimiento)
+def actualizar_kpi_mantenimiento(sender, instance, created, **kwargs):
+    anterior = getattr(instance, '_kpi_anterior', None)
+    actual = (instance.tipo, instance.estado)
+    if anterior == actual:
+        return
+    if anterior:
+        kpis.ajustar_mantenimiento(*anterior, -1)
+    kpis.ajustar_mantenimiento(*actual, 1)
+
+
+@receiver(post_delete, sender=Mantenimiento)
+def baja_kpi_mantenimiento(sender, instance, **kwargs):
+    kpis.ajustar_mantenimiento(instance.tipo, instance.estado, -1)
+
+
+@receiver(post_save, sender=Activo)
+@receiver(post_save, sender=Hardware)
+@receiver(post_save, sender=Software)
+@receiver(post_save, sender=Mantenimiento)
+@receiver(post_save, sender=Diagnostico)
+@receiver(post_save, sender=Departamento)
+@receiver(post_delete, sender=Activo)
+@receiver(post_delete, sender=Hardware)
+@receiver(post_delete, sender=Software)
+@receiver(post_delete, sender=Mantenimiento)
+@receiver(post_delete, sender=Diagnostico)
+@receiver(post_delete, sender=Departamento)
+def invalidar_cache_dashboard(sender, **kwargs):
+    """Cualquier cambio en los datos mostrados invalida los dashboards cacheados"""
+    # Tras confirmar: invalidar antes dejaría que otra petición volviera a
+    # cachear los datos antiguos mientras la transacción sigue abierta
+    transaction.on_commit(cache_dashboard.invalidar)
+
+
+# Grupo de tablas (ver cache_reportes.DEPENDENCIAS) de cada modelo exportado o publicado en la API
+DOMINIOS_REPORTES = {
+    Activo: 'inventario',
+    Hardware: 'inventario',
+    Software: 'inventario',
+    Mantenimiento: 'mantenimiento',
+    Diagnostico: 'diagnostico',
+    Cuestionario: 'diagnostico',
+    Departamento: 'catalogos',
+    User: 'catalogos',
+    # Sin reportes propios; versionan las respuestas de la API
+    Local: 'locales',
+    Equipamiento: 'locales',
+}
+
+
+def versionar_reportes(sender, update_fields=None, **kwargs):
+    """Cambiar el sello de los reportes cacheados que usan el modelo modificado"""
+    # El inicio de sesión solo actualiza last_login, que no aparece en los reportes
+    if sender is User and update_fields and set(update_fields) <= {'last_login'}:
+        return
+    cache_reportes.incrementar_version(DOMINIOS_REPORTES[sender])
+
+
+for modelo in DOMINIOS_REPORTES:
+    post_save.connect(versionar_reportes, sender=modelo,
+                      dispatch_uid=f'versionar_reportes_{modelo.__name__}_save')
+    post_delete.connect(versionar_reportes, sender=modelo,
+                        dispatch_uid=f'versionar_reportes_{modelo.__name__}_delete')
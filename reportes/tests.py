@@ -1,3 +1,521 @@
+# reportes/tests.py
+"""
+Pruebas del módulo de reportes
+"""
+
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from inventario.models import Activo, Hardware, Software, Mantenimiento
+from reportes.kpis import obtener_kpis, recalcular_estadisticas
+from reportes.models import EstadisticaMensual, EstadisticaMantenimiento
+from usuarios.models import Departamento
+
+
+class EstadisticasMaterializadasTestCase(TestCase):
+    """
+    Pruebas de las estadísticas materializadas del dashboard
+    """
+
+    def setUp(self):
+        """Configuración inicial para las pruebas"""
+        self.ti = Departamento.objects.create(nombre="TI")
+        self.admin = Departamento.objects.create(nombre="Administración")
+
+    def crear_hardware(self, numero, estado='activo', fecha=date(2025, 3, 15)):
+        activo = Activo.objects.create(
+            tipo='hardware',
+            nombre=f'PC {numero}',
+            fecha_adquisicion=fecha,
+            valor_adquisicion=Decimal('100.00'),
+            estado=estado,
+            departamento=self.ti
+        )
+        Hardware.objects.create(
+            activo=activo, marca='HP', modelo='X', numero_serie=f'KPI-R-{numero}')
+        return activo
+
+    def contadores(self):
+        return sorted(EstadisticaMensual.objects.filter(total__gt=0).values_list(
+            'departamento__nombre', 'tipo', 'estado', 'mes', 'total'))
+
+    def test_senales_coinciden_con_recalculo(self):
+        """
+        CP-REP-01: Verificar que los incrementos por señales coinciden con el recálculo completo
+        """
+        primero = self.crear_hardware(1)
+        segundo = self.crear_hardware(2, estado='obsoleto')
+        self.crear_hardware(3, fecha=date(2025, 4, 2))
+
+        licencia = Activo.objects.create(
+            tipo='software',
+            nombre='Office',
+            fecha_adquisicion=date(2025, 3, 1),
+            valor_adquisicion=Decimal('20.00'),
+            departamento=self.admin
+        )
+        Software.objects.create(
+            activo=licencia, version='365', tipo_licencia='temporal')
+
+        # Cambios de estado, departamento y eliminaciones
+        primero.estado = 'baja'
+        primero.departamento = self.admin
+        primero.save()
+        segundo.delete()
+
+        mantenimiento = Mantenimiento.objects.create(
+            activo=licencia,
+            tipo='correctivo',
+            fecha_programada=date(2025, 5, 1),
+            descripcion='Reinstalación'
+        )
+        mantenimiento.estado = 'completado'
+        mantenimiento.save()
+
+        incremental = self.contadores()
+        incremental_mant = list(EstadisticaMantenimiento.objects.filter(
+            total__gt=0).values_list('tipo', 'estado', 'total'))
+
+        recalcular_estadisticas()
+
+        self.assertEqual(incremental, self.contadores())
+        self.assertEqual(incremental_mant, list(
+            EstadisticaMantenimiento.objects.values_list('tipo', 'estado', 'total')))
+
+    def test_obtener_kpis(self):
+        """
+        CP-REP-02: Verificar los indicadores leídos de las tablas materializadas
+        """
+        self.crear_hardware(1)
+        self.crear_hardware(2, estado='baja')
+        self.crear_hardware(3, fecha=date(2025, 1, 10))
+
+        indicadores = obtener_kpis(date(2025, 3, 31), meses=3)
+
+        self.assertEqual(indicadores['total_activos'], 2)
+        self.assertEqual(indicadores['total_hardware'], 2)
+        self.assertEqual(indicadores['por_mes'], [
+            (date(2025, 1, 1), 1), (date(2025, 2, 1), 0), (date(2025, 3, 1), 2)])
+
+
+class CacheDashboardTestCase(TestCase):
+    """
+    Pruebas de la caché versionada de los dashboards
+    """
+
+    def test_senales_invalidan_fragmentos(self):
+        """
+        CP-REP-03: Verificar que guardar datos del inventario invalida los fragmentos cacheados
+        """
+        from reportes.cache_dashboard import obtener_fragmento
+
+        llamadas = []
+
+        def calcular():
+            llamadas.append(1)
+            return len(llamadas)
+
+        self.assertEqual(obtener_fragmento('prueba', ('x',), calcular), 1)
+        self.assertEqual(obtener_fragmento('prueba', ('x',), calcular), 1)
+
+        # La invalidación espera a que se confirme la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            Departamento.objects.create(nombre="Invalida caché")
+            self.assertEqual(obtener_fragmento('prueba', ('x',), calcular), 1)
+        self.assertEqual(obtener_fragmento('prueba', ('x',), calcular), 2)
+        self.assertEqual(len(llamadas), 2)
+
+
+class ExportacionCSVTestCase(TestCase):
+    """
+    Pruebas de la exportación CSV en streaming
+    """
+
+    def test_exportacion_csv_streaming(self):
+        """
+        CP-REP-04: Verificar que el CSV resuelve campos anidados y de visualización sin instanciar modelos
+        """
+        from django.contrib.auth.models import User
+        from reportes.utils import export_queryset_to_csv
+
+        departamento = Departamento.objects.create(nombre="TI")
+        activo = Activo.objects.create(
+            tipo='hardware',
+            nombre='Servidor, principal',
+            fecha_adquisicion=date(2025, 2, 1),
+            valor_adquisicion=Decimal('900.00'),
+            departamento=departamento
+        )
+        responsable = User.objects.create_user(
+            username='tecnico', first_name='Ana', last_name='Pérez')
+        Mantenimiento.objects.create(
+            activo=activo, tipo='preventivo', fecha_programada=date(2025, 6, 1),
+            descripcion='Limpieza', responsable=responsable)
+        Mantenimiento.objects.create(
+            activo=activo, tipo='correctivo', fecha_programada=date(2025, 5, 1),
+            descripcion='Cambio de disco')
+
+        fields = [
+            {'name': 'activo.nombre', 'label': 'Activo'},
+            {'name': 'get_tipo_display', 'label': 'Tipo'},
+            {'name': 'fecha_programada', 'label': 'Fecha Programada'},
+            {'name': 'responsable.get_full_name', 'label': 'Responsable'},
+        ]
+        queryset = Mantenimiento.objects.order_by('-fecha_programada')
+
+        with self.assertNumQueries(1):
+            response = export_queryset_to_csv(queryset, fields, 'Mantenimientos')
+            contenido = b''.join(response.streaming_content).decode('utf-8-sig')
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(contenido.splitlines(), [
+            'Activo,Tipo,Fecha Programada,Responsable',
+            '"Servidor, principal",Preventivo,2025-06-01,Ana Pérez',
+            '"Servidor, principal",Correctivo,2025-05-01,',
+        ])
+
+
+class ExportacionExcelTestCase(TestCase):
+    """
+    Pruebas de la exportación Excel en modo constant_memory
+    """
+
+    def test_exportacion_excel_por_columnas(self):
+        """
+        CP-REP-05: Verificar que el Excel se genera desde el iterador con formato por columna
+        """
+        from io import BytesIO
+        from openpyxl import load_workbook
+        from reportes.utils import export_queryset_to_excel
+
+        departamento = Departamento.objects.create(nombre="TI")
+        for numero in range(3):
+            Activo.objects.create(
+                tipo='hardware',
+                nombre=f'PC {numero}',
+                fecha_adquisicion=date(2025, 1, numero + 1),
+                valor_adquisicion=Decimal('150.50'),
+                departamento=departamento
+            )
+
+        fields = [
+            {'name': 'nombre', 'label': 'Nombre'},
+            {'name': 'departamento.nombre', 'label': 'Departamento'},
+            {'name': 'get_estado_display', 'label': 'Estado'},
+            {'name': 'valor_adquisicion', 'label': 'Valor Adquisición'},
+            {'name': 'fecha_adquisicion', 'label': 'Fecha Adquisición'},
+        ]
+
+        with self.assertNumQueries(1):
+            response = export_queryset_to_excel(
+                Activo.objects.order_by('fecha_adquisicion'), fields,
+                'Inventario', filters={'Departamento': 'TI'})
+            contenido = b''.join(response.streaming_content)
+
+        hoja = load_workbook(BytesIO(contenido)).active
+        filas = [fila for fila in hoja.iter_rows(values_only=True) if fila[0]]
+        inicio = [fila[0] for fila in filas].index('Nombre')
+
+        self.assertEqual(len(filas) - inicio - 1, 3)
+        primera = filas[inicio + 1]
+        self.assertEqual(primera[:3], ('PC 0', 'TI', 'Activo'))
+        self.assertEqual(primera[3], 150.5)
+        self.assertEqual(primera[4].date(), date(2025, 1, 1))
+
+
+class TrabajosReporteTestCase(TestCase):
+    """
+    Pruebas de la generación de reportes en segundo plano
+    """
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        self.usuario = User.objects.create_user(username='supervisor')
+        self.departamento = departamento = Departamento.objects.create(nombre="TI")
+        Activo.objects.create(
+            tipo='hardware',
+            nombre='Servidor',
+            fecha_adquisicion=date(2025, 2, 1),
+            valor_adquisicion=Decimal('900.00'),
+            departamento=departamento
+        )
+
+    def test_solicitar_y_procesar_reporte(self):
+        """
+        CP-REP-06: Verificar el ciclo pendiente -> completado y el límite por usuario
+        """
+        from reportes.trabajos import (
+            LimiteReportesExcedido, MAX_PENDIENTES_USUARIO, procesar_pendientes, solicitar_reporte
+        )
+
+        reporte = solicitar_reporte(
+            self.usuario, 'inventario', 'csv', {'formato': 'csv', 'estado': 'activo'})
+        self.assertEqual(reporte.estado, 'pendiente')
+
+        for _ in range(MAX_PENDIENTES_USUARIO - 1):
+            solicitar_reporte(self.usuario, 'inventario', 'csv', {'formato': 'csv'})
+        with self.assertRaises(LimiteReportesExcedido):
+            solicitar_reporte(self.usuario, 'inventario', 'csv', {'formato': 'csv'})
+
+        self.assertEqual(procesar_pendientes(concurrencia=1), MAX_PENDIENTES_USUARIO)
+
+        reporte.refresh_from_db()
+        self.assertEqual((reporte.estado, reporte.progreso), ('completado', 100))
+        with reporte.archivo.open('rb') as archivo:
+            contenido = archivo.read().decode('utf-8-sig')
+        self.assertIn('Servidor', contenido)
+
+        # El nombre del archivo no se puede deducir del id del reporte
+        directorio, nombre = reporte.archivo.name.rsplit('/', 1)
+        self.assertEqual(nombre, f'inventario_{reporte.pk}.csv')
+        self.assertRegex(directorio, r'^reportes/[0-9a-f]{32}$')
+        self.assertNotEqual(reporte.archivo.name, f'reportes/inventario_{reporte.pk}.csv')
+
+        # Solo el propietario lo descarga, con el nombre legible
+        from django.contrib.auth.models import User
+        from django.urls import reverse
+        from usuarios.models import PerfilUsuario, Rol
+
+        rol = Rol.objects.create(nombre='Supervisor')
+        otro = User.objects.create_user(username='otro')
+        for usuario in (self.usuario, otro):
+            PerfilUsuario.objects.update_or_create(
+                usuario=usuario, defaults={'departamento': self.departamento, 'rol': rol})
+
+        url = reverse('descargar_reporte', kwargs={'pk': reporte.pk})
+        self.client.force_login(otro)
+        # Otro usuario no lo obtiene (el decorador redirige el 404 al dashboard)
+        respuesta = self.client.get(url)
+        self.assertRedirects(respuesta, reverse('dashboard'), fetch_redirect_response=False)
+        self.client.force_login(self.usuario)
+        respuesta = self.client.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn(f'inventario_{reporte.pk}.csv', respuesta['Content-Disposition'])
+        respuesta.close()
+
+    def test_progreso_por_filas(self):
+        """
+        CP-REP-06b: Verificar que el progreso avanza con las filas leídas por el exportador
+        """
+        from unittest.mock import patch
+        from reportes import trabajos
+        from reportes.utils import track_progress
+
+        avisos = []
+        filas = list(track_progress(iter(range(5)), avisos.append, every=2))
+        self.assertEqual(filas, list(range(5)))
+        self.assertEqual(avisos, [2, 4, 5])
+
+        for formato in ('csv', 'excel', 'pdf'):
+            reporte = trabajos.solicitar_reporte(
+                self.usuario, 'inventario', formato, {'formato': formato})
+            actualizaciones = []
+            with patch.object(trabajos, '_actualizar',
+                              side_effect=lambda pk, **campos: actualizaciones.append(campos)):
+                trabajos.generar_reporte(reporte)
+            self.assertEqual(
+                [campos['progreso'] for campos in actualizaciones],
+                [trabajos.PROGRESO_INICIO_FILAS, trabajos.PROGRESO_FIN_FILAS], formato)
+            self.assertEqual(reporte.progreso, 100)
+
+
+class CacheArchivosReporteTestCase(TestCase):
+    """
+    Pruebas de la caché de archivos de reportes
+    """
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from usuarios.models import PerfilUsuario, Rol
+
+        self.departamento = Departamento.objects.create(nombre="TI")
+        self.usuario = User.objects.create_user(username='supervisor', password='clave123')
+        PerfilUsuario.objects.update_or_create(
+            usuario=self.usuario,
+            defaults={'departamento': self.departamento,
+                      'rol': Rol.objects.create(nombre='Supervisor')})
+        self.client.force_login(self.usuario)
+
+    def crear_activo(self, nombre):
+        return Activo.objects.create(
+            tipo='hardware',
+            nombre=nombre,
+            fecha_adquisicion=date(2025, 2, 1),
+            valor_adquisicion=Decimal('900.00'),
+            departamento=self.departamento
+        )
+
+    def test_etag_y_sello_de_datos(self):
+        """
+        CP-REP-07: Verificar la reutilización del archivo, la respuesta 304 y la invalidación por cambios
+        """
+        from django.urls import reverse
+
+        self.crear_activo('Servidor')
+        url = reverse('export_inventario', kwargs={'format': 'csv'}) + '?formato=csv'
+
+        primera = self.client.get(url)
+        contenido = b''.join(primera.streaming_content)
+        etag = primera['ETag']
+        self.assertIn(b'Servidor', contenido)
+
+        repetida = self.client.get(url)
+        self.assertEqual(repetida['ETag'], etag)
+        self.assertEqual(b''.join(repetida.streaming_content), contenido)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Un cambio en el inventario genera un archivo nuevo
+        self.crear_activo('Portátil')
+        nueva = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(nueva.status_code, 200)
+        self.assertNotEqual(nueva['ETag'], etag)
+        self.assertIn('Portátil'.encode('utf-8'), b''.join(nueva.streaming_content))
+
+        # El nombre del archivo depende de SECRET_KEY: no se deduce de los filtros
+        from django.test import override_settings
+        from reportes.cache_reportes import clave_reporte
+
+        datos = {'formato': 'csv', 'estado': 'activo'}
+        clave = clave_reporte('inventario', datos, 'csv')
+        self.assertEqual(clave_reporte('inventario', datos, 'csv'), clave)
+        with override_settings(SECRET_KEY='otra-clave'):
+            self.assertNotEqual(clave_reporte('inventario', datos, 'csv'), clave)
+
+
+class GraficosPDFTestCase(TestCase):
+    """
+    Pruebas de los gráficos incluidos en los PDF
+    """
+
+    DATOS = [{'label': 'Operativo', 'value': 8}, {'label': 'En reparación', 'value': 2}]
+
+    def test_graficos_memorizados_y_vectoriales(self):
+        """
+        CP-REP-08: Verificar que un gráfico repetido no se vuelve a rasterizar y la alternativa vectorial
+        """
+        from unittest import mock
+        from django.core.cache import caches
+        from reportlab.graphics.shapes import Drawing
+        from reportes import utils
+
+        caches[utils.CHART_CACHE_ALIAS].clear()
+        exporter = utils.PDFExporter()
+
+        if utils.MATPLOTLIB_AVAILABLE:
+            with mock.patch.object(exporter, 'render_chart_png',
+                                   wraps=exporter.render_chart_png) as render:
+                exporter.create_chart_image('pie', self.DATOS, 'Estados')
+                exporter.create_chart_image('pie', self.DATOS, 'Estados')
+                exporter.create_chart_image('bar', self.DATOS, 'Estados')
+            self.assertEqual(render.call_count, 2)
+
+        for tipo in ('pie', 'bar'):
+            self.assertIsInstance(exporter.create_vector_chart(tipo, self.DATOS, 'Estados'), Drawing)
+        linea = [{'x': 'Ene', 'y': 3}, {'x': 'Feb', 'y': 5}]
+        self.assertIsInstance(exporter.create_vector_chart('line', linea), Drawing)
+
+        response = exporter.export_data_to_pdf({
+            'title': 'Gráficos',
+            'charts': [{'type': 'bar', 'data': self.DATOS, 'title': 'Estados', 'vector': True}],
+        }, 'graficos.pdf')
+        self.assertTrue(response.content.startswith(b'%PDF'))
+
+
+class ExportacionPDFPorPartesTestCase(TestCase):
+    """
+    Pruebas de la exportación PDF por bloques y partes
+    """
+
+    def test_pdf_dividido_en_partes(self):
+        """
+        CP-REP-09: Verificar que un PDF con más filas que el límite se entrega como ZIP de partes
+        """
+        import zipfile
+        from io import BytesIO
+        from reportes.utils import export_queryset_to_pdf
+
+        departamento = Departamento.objects.create(nombre="TI")
+        for numero in range(5):
+            Activo.objects.create(
+                tipo='hardware',
+                nombre=f'PC {numero}',
+                fecha_adquisicion=date(2025, 1, numero + 1),
+                valor_adquisicion=Decimal('100.00'),
+                departamento=departamento
+            )
+
+        fields = [
+            {'name': 'nombre', 'label': 'Nombre'},
+            {'name': 'departamento.nombre', 'label': 'Departamento'},
+            {'name': 'get_estado_display', 'label': 'Estado'},
+        ]
+        queryset = Activo.objects.order_by('fecha_adquisicion')
+
+        completo = export_queryset_to_pdf(queryset, fields, 'Inventario')
+        self.assertEqual(completo['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(completo.streaming_content).startswith(b'%PDF'))
+
+        with self.assertNumQueries(1):
+            respuesta = export_queryset_to_pdf(queryset, fields, 'Inventario',
+                                               filename='inventario.pdf', rows_per_part=2)
+        self.assertEqual(respuesta['Content-Type'], 'application/zip')
+        self.assertIn('inventario.zip', respuesta['Content-Disposition'])
+
+        with zipfile.ZipFile(BytesIO(b''.join(respuesta.streaming_content))) as archivo:
+            nombres = archivo.namelist()
+            self.assertEqual(nombres, ['inventario_parte_1.pdf', 'inventario_parte_2.pdf',
+                                       'inventario_parte_3.pdf'])
+            self.assertTrue(archivo.read(nombres[-1]).startswith(b'%PDF'))
+
+
+class PlanCamposTestCase(TestCase):
+    """
+    Pruebas del compilador de campos de exportación
+    """
+
+    def test_plan_de_campos(self):
+        """
+        CP-REP-10: Verificar el plan con values_list y la lectura de objetos con select_related/only
+        """
+        from reportes.utils import compile_fields
+
+        departamento = Departamento.objects.create(nombre="TI")
+        Activo.objects.create(
+            tipo='hardware',
+            nombre='Servidor',
+            fecha_adquisicion=date(2025, 1, 1),
+            valor_adquisicion=Decimal('900.00'),
+            departamento=departamento
+        )
+
+        fields = [
+            {'name': 'nombre', 'label': 'Nombre'},
+            {'name': 'get_tipo_display', 'label': 'Tipo'},
+            {'name': 'tipo', 'label': 'Código'},
+            {'name': 'departamento.nombre', 'label': 'Departamento'},
+            {'name': 'valor_adquisicion', 'label': 'Valor'},
+        ]
+        plan = compile_fields(Activo, fields)
+        self.assertIs(plan, compile_fields(Activo, fields))
+        self.assertTrue(plan.uses_values)
+        self.assertEqual(plan.columns, ['nombre', 'tipo', 'departamento__nombre', 'valor_adquisicion'])
+        self.assertEqual(plan.kinds, ['text', 'text', 'text', 'text', 'number'])
+
+        with self.assertNumQueries(1):
+            filas = list(plan.rows(Activo.objects.all()))
+        self.assertEqual(filas, [['Servidor', 'Hardware', 'hardware', 'TI', Decimal('900.00')]])
+
+        # Una relación mostrada con str() obliga a leer objetos
+        plan = compile_fields(Activo, [{'name': 'nombre', 'label': 'Nombre'},
+                                       {'name': 'departamento', 'label': 'Departamento'}])
+        self.assertFalse(plan.uses_values)
+        self.assertEqual(plan.select_related, {'departamento'})
+        self.assertEqual(plan.only, {'nombre', 'departamento'})
+
+        with self.assertNumQueries(1):
+            filas = list(plan.rows(Activo.objects.all()))
+        self.assertEqual(filas, [['Servidor', str(departamento)]])
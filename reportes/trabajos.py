@@ -0,0 +1,212 @@
+# reportes/trabajos.py
+"""
+Generación de reportes en segundo plano.
+
+Solicitar una exportación crea un Reporte 'pendiente' con los parámetros del
+formulario. El comando procesar_reportes reserva los pendientes y los genera
+con un pool de hilos, guardando el archivo en MEDIA_ROOT/reportes/<aleatorio>/.
+El directorio aleatorio impide adivinar la URL pública del archivo: el
+usuario lo descarga desde "Mis reportes" (descargar_reporte_view), que
+comprueba que el reporte es suyo.
+
+Configuración (settings):
+    REPORTES_CONCURRENCIA: reportes generados a la vez
+    REPORTES_MAX_PENDIENTES_USUARIO: solicitudes en curso por usuario
+    REPORTES_DIAS_CONSERVACION: días que se conservan los archivos generados
+"""
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import connection
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .exportaciones import EXPORTACIONES, FORMATOS, exportar, extension_respuesta
+from .models import Reporte
+
+CONCURRENCIA = getattr(settings, 'REPORTES_CONCURRENCIA', 2)
+MAX_PENDIENTES_USUARIO = getattr(settings, 'REPORTES_MAX_PENDIENTES_USUARIO', 3)
+DIAS_CONSERVACION = getattr(settings, 'REPORTES_DIAS_CONSERVACION', 7)
+# Un trabajo 'en_proceso' más antiguo se considera abandonado (worker caído)
+MINUTOS_BLOQUEO = 30
+
+ESTADOS_EN_CURSO = ['pendiente', 'en_proceso']
+
+# Tramo de la barra de progreso que corresponde a la lectura de filas; el
+# resto es la preparación y el guardado del archivo
+PROGRESO_INICIO_FILAS = 5
+PROGRESO_FIN_FILAS = 90
+
+
+class LimiteReportesExcedido(Exception):
+    """El usuario ya tiene demasiados reportes en curso"""
+
+
+def solicitar_reporte(usuario, tipo, formato, parametros):
+    """
+    Registrar un reporte para generarlo en segundo plano.
+
+    Args:
+        parametros: datos del formulario de filtros (diccionario de texto)
+
+    Raises:
+        ValueError: tipo, formato o filtros no válidos
+        LimiteReportesExcedido: demasiados reportes en curso para el usuario
+    """
+    formato = formato.lower()
+    if tipo not in EXPORTACIONES or formato not in FORMATOS:
+        raise ValueError('Tipo o formato de reporte no válido.')
+
+    formulario = EXPORTACIONES[tipo][0](parametros)
+    if not formulario.is_valid():
+        raise ValueError('Error en los filtros del reporte.')
+
+    en_curso = Reporte.objects.filter(
+        usuario=usuario, estado__in=ESTADOS_EN_CURSO).count()
+    if en_curso >= MAX_PENDIENTES_USUARIO:
+        raise LimiteReportesExcedido(
+            f'Ya tiene {en_curso} reportes en generación. Espere a que terminen.')
+
+    return Reporte.objects.create(
+        nombre=f"{dict(Reporte.TIPO_CHOICES)[tipo]} {timezone.localtime():%d/%m/%Y %H:%M}",
+        tipo=tipo,
+        formato=formato,
+        usuario=usuario,
+        parametros=parametros,
+        estado='pendiente',
+    )
+
+
+def _actualizar(reporte_id, **campos):
+    Reporte.objects.filter(pk=reporte_id).update(**campos)
+
+
+def _reservar(reporte_id):
+    """Pasar un reporte de 'pendiente' a 'en_proceso'; False si otro worker lo tomó"""
+    return Reporte.objects.filter(pk=reporte_id, estado='pendiente').update(
+        estado='en_proceso', progreso=0, fecha_inicio=timezone.now()) == 1
+
+
+def generar_reporte(reporte):
+    """Generar el archivo de un reporte y guardarlo en reporte.archivo"""
+    formulario_clase, preparar, _ = EXPORTACIONES[reporte.tipo]
+    formulario = formulario_clase(reporte.parametros or {})
+    if not formulario.is_valid():
+        raise ValueError('Los filtros guardados del reporte no son válidos.')
+
+    preparado = preparar(formulario.cleaned_data)
+    total = preparado['queryset'].count()
+    _actualizar(reporte.pk, progreso=PROGRESO_INICIO_FILAS)
+
+    def progreso(leidas):
+        # PDF y Excel leen las filas dentro de exportar(); CSV al escribir el archivo
+        tramo = PROGRESO_FIN_FILAS - PROGRESO_INICIO_FILAS
+        _actualizar(reporte.pk,
+                    progreso=PROGRESO_INICIO_FILAS + tramo * min(leidas, total) // max(total, 1))
+
+    respuesta = exportar(preparado, reporte.formato, progreso)
+
+    extension = extension_respuesta(respuesta, reporte.formato)
+    nombre = f"{uuid.uuid4().hex}/{slugify(reporte.get_tipo_display())}_{reporte.pk}.{extension}"
+
+    with tempfile.TemporaryFile() as temporal:
+        # Las respuestas en streaming se escriben por bloques
+        if respuesta.streaming:
+            for bloque in respuesta.streaming_content:
+                temporal.write(bloque)
+        else:
+            temporal.write(respuesta.content)
+        respuesta.close()
+
+        temporal.seek(0)
+        reporte.archivo.save(nombre, File(temporal), save=False)
+
+    reporte.estado = 'completado'
+    reporte.progreso = 100
+    reporte.fecha_fin = timezone.now()
+    reporte.save(update_fields=['archivo', 'estado', 'progreso', 'fecha_fin'])
+
+
+def ejecutar_trabajo(reporte_id):
+    """
+    Reservar y generar un reporte pendiente.
+
+    Returns:
+        True si este proceso generó (o intentó generar) el reporte
+    """
+    if not _reservar(reporte_id):
+        return False
+
+    reporte = Reporte.objects.get(pk=reporte_id)
+    try:
+        generar_reporte(reporte)
+    except Exception as e:
+        _actualizar(reporte_id, estado='error', mensaje_error=str(e),
+                    fecha_fin=timezone.now())
+    return True
+
+
+def _ejecutar_en_hilo(reporte_id):
+    try:
+        return ejecutar_trabajo(reporte_id)
+    finally:
+        # Cada hilo del pool abre su propia conexión
+        connection.close()
+
+
+def procesar_pendientes(concurrencia=CONCURRENCIA, limite=None):
+    """
+    Generar los reportes pendientes, los más antiguos primero.
+
+    Returns:
+        Número de reportes procesados
+    """
+    pendientes = Reporte.objects.filter(estado='pendiente').order_by(
+        'fecha_creacion').values_list('pk', flat=True)
+    ids = list(pendientes[:limite] if limite else pendientes)
+
+    if concurrencia <= 1:
+        return sum(ejecutar_trabajo(reporte_id) for reporte_id in ids)
+
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        return sum(pool.map(_ejecutar_en_hilo, ids))
+
+
+def recuperar_bloqueados(minutos=MINUTOS_BLOQUEO):
+    """Volver a 'pendiente' los trabajos abandonados por un worker detenido"""
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return Reporte.objects.filter(
+        estado='en_proceso', fecha_inicio__lt=limite
+    ).update(estado='pendiente', progreso=0)
+
+
+def limpiar_reportes(dias=DIAS_CONSERVACION):
+    """
+    Eliminar los reportes terminados hace más de `dias` días y sus archivos.
+
+    Returns:
+        Número de reportes eliminados
+    """
+    antiguos = Reporte.objects.filter(
+        estado__in=['completado', 'error'],
+        fecha_creacion__lt=timezone.now() - timedelta(days=dias)
+    )
+
+    total = 0
+    for reporte in antiguos.iterator():
+        if reporte.archivo:
+            directorio = os.path.dirname(reporte.archivo.path)
+            reporte.archivo.delete(save=False)
+            # Directorio aleatorio del archivo, ya vacío
+            try:
+                os.rmdir(directorio)
+            except OSError:
+                pass
+        reporte.delete()
+        total += 1
+    return total
@@ -25,6 +25,9 @@ urlpatterns = [
     path('mantenimiento/resultado/', views.mantenimiento_report_result_view,
          name='mantenimiento_report_result'),
 
+    # Actividad de usuarios (tabla activa y archivo)
+    path('actividad/', views.actividad_report_view, name='actividad_report'),
+
     # Reportes de transformación digital
     path('transformacion-digital/', views.transformacion_digital_report_view,
          name='transformacion_digital_report'),
@@ -38,4 +41,13 @@ urlpatterns = [
          views.export_mantenimiento_view, name='export_mantenimiento'),
     path('export/diagnostico/<str:format>/',
          views.export_diagnostico_view, name='export_diagnostico'),
+
+    # Reportes generados en segundo plano
+    path('solicitar/<str:tipo>/<str:format>/',
+         views.solicitar_reporte_view, name='solicitar_reporte'),
+    path('mis-reportes/', views.mis_reportes_view, name='mis_reportes'),
+    path('mis-reportes/<int:pk>/estado/',
+         views.estado_reporte_view, name='estado_reporte'),
+    path('mis-reportes/<int:pk>/descargar/',
+         views.descargar_reporte_view, name='descargar_reporte'),
 ]
@@ -1,10 +1,25 @@
 # reportes/utils.py
 import os
+import csv
+import functools
+import hashlib
+import importlib.util
+import itertools
 import json
+import logging
+import operator
+import shutil
+import tempfile
+import time
+import tracemalloc
+import zipfile
 from io import BytesIO
 from datetime import datetime
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
 from django.template.loader import get_template
 from django.template import Context
 import base64
@@ -17,7 +32,7 @@ try:
     from reportlab.lib.pagesizes import letter, landscape, A4
     from reportlab.lib.units import inch, cm
     from reportlab.lib.utils import ImageReader
-    from reportlab.graphics.shapes import Drawing
+    from reportlab.graphics.shapes import Drawing, String
     from reportlab.graphics.charts.piecharts import Pie
     from reportlab.graphics.charts.barcharts import VerticalBarChart
     from reportlab.graphics.charts.linecharts import HorizontalLineChart
@@ -34,15 +49,40 @@ try:
 except ImportError:
     XLSXWRITER_AVAILABLE = False
 
-# Importaciones para gráficos
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Use non-interactive backend
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+# Gráficos con matplotlib: se importa al generar el primer gráfico, no al
+# cargar el módulo (tarda alrededor de un segundo)
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+_pyplot = None
+
+# Gráficos renderizados (PNG) reutilizables entre exportaciones
+CHART_CACHE_ALIAS = getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')
+CHART_CACHE_TIMEOUT = 24 * 60 * 60
+# Usar gráficos vectoriales de ReportLab en lugar de imágenes de matplotlib
+VECTOR_CHARTS = getattr(settings, 'REPORTES_GRAFICOS_VECTORIALES', False)
+
+CHART_COLORS = ['#006699', '#3399CC', '#48A5C6', '#66B2CC', '#84C2D1']
+
+# PDF tabulares grandes: filas por archivo antes de dividir en partes (ZIP)
+PDF_ROWS_PER_PART = getattr(settings, 'REPORTES_PDF_FILAS_POR_PARTE', 10000)
+# Alto aproximado de una fila de tabla (fuente 9 + relleno) para calcular bloques por página
+PDF_ROW_HEIGHT = 24
+
+# Filas entre dos avisos de progreso de una exportación
+PROGRESS_EVERY = 500
+
+logger = logging.getLogger(__name__)
+
+
+def get_pyplot():
+    """Importar matplotlib.pyplot con el backend sin interfaz (una sola vez)"""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Use non-interactive backend
+        import matplotlib.pyplot as plt
+        plt.style.use('seaborn-v0_8')  # Estilo moderno
+        _pyplot = plt
+    return _pyplot
 
 
 class ExportManager:
@@ -169,8 +209,16 @@ class PDFExporter(ExportManager):
 
         table = Table(data, colWidths=col_widths, repeatRows=1)
 
-        # Estilo por defecto
-        default_style = TableStyle([
+        default_style = self.table_style()
+        if style:
+            default_style.add(*style)
+
+        table.setStyle(default_style)
+        return table
+
+    def table_style(self):
+        """Estilo por defecto de las tablas de datos"""
+        return TableStyle([
             # Encabezado
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#006699')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -197,29 +245,40 @@ class PDFExporter(ExportManager):
             ('RIGHTPADDING', (0, 0), (-1, -1), 8),
         ])
 
-        if style:
-            default_style.add(*style)
-
-        table.setStyle(default_style)
-        return table
-
     def create_chart_image(self, chart_type, data, title="", width=400, height=300):
         """Crear gráfico como imagen para incluir en PDF"""
         if not MATPLOTLIB_AVAILABLE:
             return None
 
         try:
-            plt.style.use('seaborn-v0_8')  # Estilo moderno
-            fig, ax = plt.subplots(figsize=(width/100, height/100))
+            # Los gráficos iguales se rasterizan una sola vez
+            key = 'chart:' + hashlib.sha256(repr(
+                (chart_type, data, title, width, height)).encode('utf-8')).hexdigest()
+            cache = caches[CHART_CACHE_ALIAS]
+            png = cache.get(key)
+            if png is None:
+                png = self.render_chart_png(chart_type, data, title, width, height)
+                cache.set(key, png, CHART_CACHE_TIMEOUT)
+
+            # Crear imagen para ReportLab
+            return Image(BytesIO(png), width=width, height=height)
+
+        except Exception as e:
+            print(f"Error creando gráfico: {e}")
+            return None
 
+    def render_chart_png(self, chart_type, data, title, width, height):
+        """Rasterizar un gráfico con matplotlib y devolver el PNG"""
+        plt = get_pyplot()
+        fig, ax = plt.subplots(figsize=(width/100, height/100))
+
+        try:
             if chart_type == 'pie':
                 labels = [item['label'] for item in data]
                 values = [item['value'] for item in data]
-                colors_list = ['#006699', '#3399CC',
-                               '#48A5C6', '#66B2CC', '#84C2D1']
 
                 wedges, texts, autotexts = ax.pie(values, labels=labels, autopct='%1.1f%%',
-                                                  colors=colors_list, startangle=90)
+                                                  colors=CHART_COLORS, startangle=90)
                 for autotext in autotexts:
                     autotext.set_color('white')
                     autotext.set_fontweight('bold')
@@ -236,7 +295,7 @@ class PDFExporter(ExportManager):
                             f'{int(height)}', ha='center', va='bottom')
 
                 ax.set_ylabel('Cantidad')
-                plt.xticks(rotation=45, ha='right')
+                ax.tick_params(axis='x', labelrotation=45)
 
             elif chart_type == 'line':
                 x_data = [item['x'] for item in data]
@@ -245,26 +304,65 @@ class PDFExporter(ExportManager):
                         marker='o', linewidth=2, markersize=6)
                 ax.set_ylabel('Valores')
                 ax.grid(True, alpha=0.3)
-                plt.xticks(rotation=45, ha='right')
+                ax.tick_params(axis='x', labelrotation=45)
 
             ax.set_title(title, fontsize=14,
                          fontweight='bold', color='#006699')
-            plt.tight_layout()
+            fig.tight_layout()
 
             # Guardar en memoria
             buffer = BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            buffer.seek(0)
-            plt.close()
-
-            # Crear imagen para ReportLab
-            image = Image(buffer, width=width, height=height)
-            return image
-
-        except Exception as e:
-            print(f"Error creando gráfico: {e}")
+            fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+            return buffer.getvalue()
+        finally:
+            plt.close(fig)
+
+    def create_vector_chart(self, chart_type, data, title="", width=400, height=300):
+        """Crear gráfico vectorial nativo de ReportLab (sin matplotlib)"""
+        drawing = Drawing(width, height)
+        margin = 40
+
+        if chart_type == 'pie':
+            chart = Pie()
+            size = min(width, height) - 2 * margin
+            chart.x, chart.y = (width - size) / 2, margin / 2
+            chart.width = chart.height = size
+            chart.data = [item['value'] for item in data]
+            chart.labels = [str(item['label']) for item in data]
+            chart.startAngle = 90
+            chart.slices.strokeColor = colors.white
+            for index in range(len(data)):
+                chart.slices[index].fillColor = colors.HexColor(
+                    CHART_COLORS[index % len(CHART_COLORS)])
+
+        elif chart_type in ('bar', 'line'):
+            if chart_type == 'bar':
+                chart = VerticalBarChart()
+                chart.data = [[item['value'] for item in data]]
+                chart.categoryAxis.categoryNames = [str(item['label']) for item in data]
+                chart.bars[0].fillColor = colors.HexColor('#006699')
+            else:
+                chart = HorizontalLineChart()
+                chart.data = [[item['y'] for item in data]]
+                chart.categoryAxis.categoryNames = [str(item['x']) for item in data]
+                chart.lines[0].strokeColor = colors.HexColor('#006699')
+                chart.lines[0].strokeWidth = 2
+            chart.x, chart.y = margin, margin
+            chart.width, chart.height = width - 2 * margin, height - 2 * margin
+            chart.valueAxis.valueMin = 0
+            chart.categoryAxis.labels.angle = 45
+            chart.categoryAxis.labels.boxAnchor = 'ne'
+
+        else:
             return None
 
+        drawing.add(chart)
+        if title:
+            drawing.add(String(width / 2, height - 15, title, textAnchor='middle',
+                               fontName='Helvetica-Bold', fontSize=12,
+                               fillColor=colors.HexColor('#006699')))
+        return drawing
+
     def export_data_to_pdf(self, data_config, filename):
         """Exportar datos a PDF con configuración completa"""
         response = self.create_pdf_response(filename)
@@ -310,7 +408,12 @@ class PDFExporter(ExportManager):
         # Gráficos
         if 'charts' in data_config:
             for chart_config in data_config['charts']:
-                chart_image = self.create_chart_image(
+                # Vectorial si se pide o si matplotlib no está instalado
+                if chart_config.get('vector', VECTOR_CHARTS) or not MATPLOTLIB_AVAILABLE:
+                    create_chart = self.create_vector_chart
+                else:
+                    create_chart = self.create_chart_image
+                chart_image = create_chart(
                     chart_config['type'],
                     chart_config['data'],
                     chart_config.get('title', ''),
@@ -352,6 +455,141 @@ class PDFExporter(ExportManager):
         response.write(pdf)
         return response
 
+    def build_pdf_part(self, output, data_config, rows, part=1, next_part=None):
+        """
+        Escribir en `output` una parte de un reporte tabular.
+
+        La tabla se divide en bloques del tamaño aproximado de una página con
+        anchos de columna fijos, así ReportLab no mide todas las celdas ni
+        parte una única tabla enorme.
+
+        Returns:
+            Número de filas escritas
+        """
+        pagesize = landscape(letter) if data_config.get(
+            'landscape', False) else letter
+        doc = SimpleDocTemplate(output, pagesize=pagesize,
+                                rightMargin=72, leftMargin=72,
+                                topMargin=72, bottomMargin=72)
+
+        headers = data_config['headers']
+        col_widths = data_config.get('col_widths') or [doc.width / len(headers)] * len(headers)
+        rows_per_chunk = max(10, int(doc.height // PDF_ROW_HEIGHT) - 1)
+
+        elements = []
+        self.add_header(elements)
+
+        title = data_config.get('title', 'Reporte')
+        if part > 1:
+            title = f"{title} (parte {part})"
+        elements.append(Paragraph(title, self.styles['CustomTitle']))
+        elements.append(Spacer(1, 20))
+
+        if data_config.get('filters'):
+            elements.append(Paragraph("Filtros aplicados:",
+                            self.styles['CustomSubtitle']))
+            for filter_name, filter_value in data_config['filters'].items():
+                elements.append(Paragraph(
+                    f"<b>{filter_name}:</b> {filter_value}", self.styles['CustomNormal']))
+            elements.append(Spacer(1, 15))
+
+        style = self.table_style()
+        written = 0
+        chunk = [headers]
+        for row in rows:
+            chunk.append(row)
+            written += 1
+            if len(chunk) > rows_per_chunk:
+                table = Table(chunk, colWidths=col_widths, repeatRows=1)
+                table.setStyle(style)
+                elements.append(table)
+                chunk = [headers]
+        if len(chunk) > 1 or not written:
+            table = Table(chunk, colWidths=col_widths, repeatRows=1)
+            table.setStyle(style)
+            elements.append(table)
+
+        if next_part:
+            elements.append(Spacer(1, 15))
+            elements.append(Paragraph(
+                f"<i>Continúa en la parte {next_part}</i>", self.styles['CustomNormal']))
+
+        self.add_footer_info(elements)
+        doc.build(elements)
+        return written
+
+    def export_rows_to_pdf(self, data_config, rows, filename, rows_per_part=None,
+                           measure_memory=False):
+        """
+        Exportar filas a PDF por partes, con memoria acotada.
+
+        Las filas se consumen del iterador de rows_per_part en rows_per_part.
+        Si hay más de una parte, cada una se guarda como un PDF ("Continúa en
+        la parte N") y se devuelven juntas en un ZIP. El tiempo de generación
+        y, con measure_memory, el pico de memoria quedan en self.build_stats.
+        """
+        rows_per_part = rows_per_part or PDF_ROWS_PER_PART
+        rows = iter(rows)
+
+        started = time.perf_counter()
+        tracing = measure_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        parts = []
+        total = 0
+        try:
+            while True:
+                part_rows = list(itertools.islice(rows, rows_per_part))
+                following = next(rows, None)
+                if following is not None:
+                    rows = itertools.chain([following], rows)
+
+                output = tempfile.TemporaryFile(suffix='.pdf')
+                parts.append(output)
+                total += self.build_pdf_part(
+                    output, data_config, part_rows, part=len(parts),
+                    next_part=len(parts) + 1 if following is not None else None)
+                del part_rows
+
+                if following is None:
+                    break
+
+            part_count = len(parts)
+            if part_count == 1:
+                output = parts.pop()
+                content_type = 'application/pdf'
+            else:
+                base_name = os.path.splitext(filename)[0]
+                output = tempfile.TemporaryFile(suffix='.zip')
+                with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+                    for number, part_file in enumerate(parts, 1):
+                        part_file.seek(0)
+                        with archive.open(f"{base_name}_parte_{number}.pdf", 'w') as destination:
+                            shutil.copyfileobj(part_file, destination)
+                filename = f"{base_name}.zip"
+                content_type = 'application/zip'
+        finally:
+            for part_file in parts:
+                part_file.close()
+            peak_memory = None
+            if tracing:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+        self.build_stats = {
+            'rows': total,
+            'parts': part_count,
+            'seconds': time.perf_counter() - started,
+            'peak_memory': peak_memory,
+        }
+        logger.info('PDF %s: %d filas, %d partes, %.2f s', filename, total,
+                    part_count, self.build_stats['seconds'])
+
+        output.seek(0)
+        return FileResponse(output, as_attachment=True, filename=filename,
+                            content_type=content_type)
+
 
 class ExcelExporter(ExportManager):
     """Exportador especializado en Excel"""
@@ -408,6 +646,15 @@ class ExcelExporter(ExportManager):
             'font_size': 10
         })
 
+        # Estilo para enteros (IDs, cantidades)
+        styles['integer'] = workbook.add_format({
+            'align': 'center',
+            'valign': 'vcenter',
+            'border': 1,
+            'num_format': '0',
+            'font_size': 10
+        })
+
         # Estilo para fechas
         styles['date'] = workbook.add_format({
             'align': 'center',
@@ -468,18 +715,8 @@ class ExcelExporter(ExportManager):
             print(f"Error añadiendo gráfico: {e}")
             return start_row
 
-    def export_data_to_excel(self, data_config, filename):
-        """Exportar datos a Excel con configuración completa"""
-        response = self.create_excel_response(filename)
-        output = BytesIO()
-
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        styles = self.create_workbook_styles(workbook)
-
-        # Hoja principal
-        worksheet = workbook.add_worksheet(
-            data_config.get('sheet_name', 'Datos'))
-
+    def write_report_header(self, worksheet, styles, data_config):
+        """Escribir título, fecha, filtros y resumen; devuelve la fila siguiente"""
         current_row = 0
 
         # Título del reporte
@@ -519,6 +756,22 @@ class ExcelExporter(ExportManager):
                 current_row += 1
             current_row += 1
 
+        return current_row
+
+    def export_data_to_excel(self, data_config, filename):
+        """Exportar datos a Excel con configuración completa"""
+        response = self.create_excel_response(filename)
+        output = BytesIO()
+
+        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        styles = self.create_workbook_styles(workbook)
+
+        # Hoja principal
+        worksheet = workbook.add_worksheet(
+            data_config.get('sheet_name', 'Datos'))
+
+        current_row = self.write_report_header(worksheet, styles, data_config)
+
         # Datos principales
         if 'headers' in data_config and 'data' in data_config:
             # Escribir encabezados
@@ -584,99 +837,365 @@ class ExcelExporter(ExportManager):
 
         return response
 
+    def export_rows_to_excel(self, data_config, rows, column_kinds, filename):
+        """
+        Exportar filas a Excel en modo constant_memory.
+
+        Las filas se escriben según llegan del iterador (cada fila se vuelca a
+        disco al empezar la siguiente) en un archivo temporal que se devuelve
+        con FileResponse. El formato de cada columna se resuelve una sola vez
+        a partir de column_kinds ('integer', 'number', 'date' o 'text').
+        """
+        output = tempfile.TemporaryFile(suffix='.xlsx')
+
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'remove_timezone': True,
+        })
+        styles = self.create_workbook_styles(workbook)
+
+        worksheet = workbook.add_worksheet(
+            data_config.get('sheet_name', 'Datos'))
+
+        headers = data_config['headers']
+        col_widths = data_config.get('col_widths', [15] * len(headers))
+        for col, width in enumerate(col_widths):
+            worksheet.set_column(col, col, width)
+
+        current_row = self.write_report_header(worksheet, styles, data_config)
+
+        header_row = current_row
+        for col, header in enumerate(headers):
+            worksheet.write(current_row, col, header, styles['header'])
+        current_row += 1
+
+        # Formatos por columna para filas pares e impares
+        column_styles = [
+            (styles['data'], styles['data_alt']) if kind == 'text'
+            else (styles[kind], styles[kind])
+            for kind in column_kinds
+        ]
+
+        for row_idx, row_data in enumerate(rows):
+            parity = row_idx % 2
+            for col, value in enumerate(row_data):
+                if value is None or value == '':
+                    worksheet.write_blank(current_row, col, None, column_styles[col][parity])
+                else:
+                    worksheet.write(current_row, col, value, column_styles[col][parity])
+            current_row += 1
+
+        worksheet.autofilter(header_row, 0, max(header_row, current_row - 1), len(headers) - 1)
+        worksheet.freeze_panes(header_row + 1, 0)
+
+        workbook.close()
+        output.seek(0)
+
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+
 
 # Funciones de utilidad globales
-def export_queryset_to_pdf(queryset, fields, title, filename=None, **kwargs):
-    """Función utilitaria para exportar QuerySet a PDF"""
+def export_queryset_to_pdf(queryset, fields, title, filename=None, chunk_size=2000,
+                           rows_per_part=None, progress=None, **kwargs):
+    """
+    Función utilitaria para exportar QuerySet a PDF.
+
+    Las filas se leen con el plan de compile_fields() y se maquetan por
+    bloques; los reportes con más de rows_per_part filas se dividen en varios
+    PDF comprimidos en un ZIP. progress recibe las filas leídas (ver
+    track_progress).
+    """
     if not filename:
         filename = f"{title.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
-    # Preparar datos para la tabla
     headers = [field['label'] for field in fields]
-    table_data = [headers]
-
-    for obj in queryset:
-        row = []
-        for field in fields:
-            # Manejar campos anidados como 'departamento.nombre'
-            field_name = field['name']
-            if '.' in field_name:
-                # Campo anidado
-                attrs = field_name.split('.')
-                value = obj
-                for attr in attrs:
-                    value = getattr(value, attr, '') if value else ''
-                    if callable(value):
-                        value = value()
-            else:
-                # Campo simple
-                value = getattr(obj, field_name, '')
-                if callable(value):
-                    value = value()
-
-            # Manejar valores None
-            if value is None:
-                value = ''
 
-            row.append(str(value))
-        table_data.append(row)
+    rows = compile_fields(queryset.model, fields).rows(queryset, chunk_size)
+    if progress:
+        rows = track_progress(rows, progress)
+    rows = (['' if value is None else str(value) for value in row] for row in rows)
 
     # Configuración del PDF
     data_config = {
         'title': title,
-        'table_data': table_data,
+        'headers': headers,
         'landscape': kwargs.get('landscape', len(headers) > 6),
         'filters': kwargs.get('filters', {}),
         **kwargs
     }
 
     exporter = PDFExporter()
-    return exporter.export_data_to_pdf(data_config, filename)
+    return exporter.export_rows_to_pdf(data_config, rows, filename, rows_per_part=rows_per_part)
 
 
-def export_queryset_to_excel(queryset, fields, title, filename=None, **kwargs):
-    """Función utilitaria para exportar QuerySet a Excel"""
+def export_queryset_to_excel(queryset, fields, title, filename=None, chunk_size=2000,
+                             progress=None, **kwargs):
+    """
+    Función utilitaria para exportar QuerySet a Excel.
+
+    Las filas se leen con el plan de compile_fields() y se escriben
+    directamente en el libro (modo constant_memory), sin construir la lista
+    completa. progress recibe las filas leídas (ver track_progress).
+    """
     if not filename:
         filename = f"{title.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
-    # Preparar datos
-    headers = [field['label'] for field in fields]
-    data = []
-
-    for obj in queryset:
-        row = []
-        for field in fields:
-            # Manejar campos anidados como 'departamento.nombre'
-            field_name = field['name']
-            if '.' in field_name:
-                # Campo anidado
-                attrs = field_name.split('.')
-                value = obj
-                for attr in attrs:
-                    value = getattr(value, attr, '') if value else ''
-                    if callable(value):
-                        value = value()
-            else:
-                # Campo simple
-                value = getattr(obj, field_name, '')
-                if callable(value):
-                    value = value()
-
-            # Manejar valores None
-            if value is None:
-                value = ''
-
-            row.append(value)
-        data.append(row)
+    plan = compile_fields(queryset.model, fields)
 
     # Configuración del Excel
     data_config = {
         'title': title,
-        'headers': headers,
-        'data': data,
+        'headers': [field['label'] for field in fields],
         'filters': kwargs.get('filters', {}),
         **kwargs
     }
 
+    rows = plan.rows(queryset, chunk_size)
+    if progress:
+        rows = track_progress(rows, progress)
+
     exporter = ExcelExporter()
-    return exporter.export_data_to_excel(data_config, filename)
+    return exporter.export_rows_to_excel(data_config, rows, plan.kinds, filename)
+
+
+def track_progress(rows, progress, every=PROGRESS_EVERY):
+    """
+    Pasar las filas sin cambios, llamando a progress(filas leídas) cada
+    `every` filas y al terminar.
+    """
+    read = 0
+    for row in rows:
+        yield row
+        read += 1
+        if read % every == 0:
+            progress(read)
+    progress(read)
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en lugar de guardarla"""
+
+    def write(self, value):
+        return value
+
+
+def _column_kind(model_field):
+    """Tipo de una columna del reporte ('integer', 'number', 'date' o 'text')"""
+    if model_field is None or model_field.choices:
+        return 'text'
+    if isinstance(model_field, (models.DecimalField, models.FloatField)):
+        return 'number'
+    if isinstance(model_field, models.IntegerField):
+        return 'integer'
+    if isinstance(model_field, models.DateField):
+        return 'date'
+    return 'text'
+
+
+def _attribute_getter(names):
+    """Función objeto -> valor que recorre una ruta de atributos y llama a los métodos"""
+    def getter(obj):
+        value = obj
+        for name in names:
+            if value is None:
+                return ''
+            value = getattr(value, name, '')
+            if callable(value):
+                value = value()
+        # Las relaciones se muestran con su str()
+        return str(value) if isinstance(value, models.Model) else value
+    return getter
+
+
+def _display_name(attr):
+    """Campo de un método get_X_display, o None"""
+    if attr.startswith('get_') and attr.endswith('_display'):
+        return attr[len('get_'):-len('_display')]
+    return None
+
+
+class FieldPlan:
+    """
+    Plan de extracción compilado a partir de la lista de campos de un reporte.
+
+    Cada campo ('departamento.nombre', 'get_estado_display',
+    'responsable.get_full_name', ...) se traduce una sola vez a columnas de
+    values_list y a una función fila -> valor: las opciones se resuelven con
+    diccionarios precalculados y las columnas repetidas se leen una vez. Si
+    algún campo necesita el objeto (propiedades, métodos o relaciones
+    mostradas con str()), se leen instancias con el select_related() y el
+    only() derivados de los campos.
+    """
+
+    def __init__(self, model, names):
+        self.model = model
+        self.names = names
+        self.columns = []
+        self.getters = []
+        self.kinds = []
+        self.select_related = set()
+        self.only = set()
+        self.uses_values = True
+
+        positions = {}
+
+        def column(path):
+            if path not in positions:
+                positions[path] = len(self.columns)
+                self.columns.append(path)
+            return positions[path]
+
+        resolved = []
+        for name in names:
+            *relations, attr = name.split('.')
+            current = model
+            for relation in relations:
+                field = self._concrete_field(current, relation)
+                current = field.related_model if field is not None and field.is_relation else None
+            prefix = '__'.join(relations)
+
+            def path(field_name, prefix=prefix):
+                return f'{prefix}__{field_name}' if prefix else field_name
+
+            model_field = self._concrete_field(current, attr)
+            display_field = self._concrete_field(current, _display_name(attr) or '')
+            self.kinds.append(_column_kind(model_field))
+            resolved.append((relations, attr, current, model_field, display_field))
+
+            if model_field is not None and not model_field.is_relation:
+                self.getters.append(operator.itemgetter(column(path(attr))))
+            elif attr == 'get_full_name' and self._concrete_field(current, 'first_name'):
+                first, last = column(path('first_name')), column(path('last_name'))
+                self.getters.append(
+                    lambda row, first=first, last=last:
+                        f"{row[first] or ''} {row[last] or ''}".strip())
+            elif display_field is not None:
+                choices = dict(display_field.flatchoices)
+                index = column(path(display_field.name))
+                self.getters.append(
+                    lambda row, index=index, choices=choices: choices.get(row[index], row[index]))
+            else:
+                self.uses_values = False
+
+        if not self.uses_values:
+            self._compile_instances(resolved)
+
+    @staticmethod
+    def _concrete_field(model, name):
+        if model is None or not name:
+            return None
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        return field if field.concrete else None
+
+    def _compile_instances(self, resolved):
+        """Leer objetos: select_related() de las relaciones y only() de las columnas usadas"""
+        self.columns = []
+        self.getters = []
+        # Rutas de los modelos que se cargan completos ('' es el modelo principal)
+        full_models = set()
+
+        for relations, attr, current, model_field, display_field in resolved:
+            prefix = '__'.join(relations)
+
+            def path(field_name, prefix=prefix):
+                return f'{prefix}__{field_name}' if prefix else field_name
+
+            self.getters.append(_attribute_getter(relations + [attr]))
+            if current is None:
+                # Ruta que no es una relación del modelo: se resuelve sobre el objeto
+                full_models.add('')
+                continue
+            if relations:
+                self.select_related.add(prefix)
+
+            if model_field is not None and model_field.is_relation:
+                # Relación mostrada con str(): se necesita el objeto relacionado
+                self.select_related.add(path(attr))
+                full_models.add(path(attr))
+            elif model_field is not None:
+                self.only.add(path(attr))
+            elif attr == 'get_full_name' and self._concrete_field(current, 'first_name'):
+                self.only.update((path('first_name'), path('last_name')))
+            elif display_field is not None:
+                self.only.add(path(display_field.name))
+            else:
+                # Propiedades o métodos: no se difiere ningún campo de ese modelo
+                full_models.add(prefix)
+
+        if '' in full_models:
+            self.only = None
+            return
+
+        # Nombrar solo la relación en only() carga todos los campos de ese modelo
+        self.only = {
+            path for path in self.only
+            if not any(path.startswith(f'{prefix}__') for prefix in full_models)
+        } | full_models
+
+    def rows(self, queryset, chunk_size=2000):
+        """Filas del reporte (listas de valores) leídas con una sola consulta"""
+        if self.uses_values:
+            for row in queryset.values_list(*self.columns).iterator(chunk_size=chunk_size):
+                yield [getter(row) for getter in self.getters]
+            return
+
+        queryset = queryset.select_related(None)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.only is not None:
+            queryset = queryset.only(*self.only)
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            yield [getter(obj) for getter in self.getters]
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_fields(model, names):
+    return FieldPlan(model, names)
+
+
+def compile_fields(model, fields):
+    """Plan de extracción (memorizado) para los campos de un reporte"""
+    return _compile_fields(model, tuple(field['name'] for field in fields))
+
+
+def export_queryset_to_csv(queryset, fields, title, filename=None, chunk_size=2000,
+                           progress=None, **kwargs):
+    """
+    Función utilitaria para exportar QuerySet a CSV en streaming.
+
+    Las filas se leen con el plan de compile_fields() y se envían por
+    bloques de chunk_size, sin cargar el resultado completo. progress recibe
+    las filas leídas a medida que se consume la respuesta (ver track_progress).
+    """
+    if not filename:
+        filename = f"{title.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+    rows = compile_fields(queryset.model, fields).rows(queryset, chunk_size)
+    if progress:
+        rows = track_progress(rows, progress)
+
+    def generate():
+        writer = csv.writer(_Eco())
+        # BOM para que Excel reconozca UTF-8 (acentos)
+        yield ('\ufeff' + writer.writerow([field['label'] for field in fields])).encode('utf-8')
+
+        block = []
+        for row in rows:
+            block.append(writer.writerow(row))
+            if len(block) >= chunk_size:
+                yield ''.join(block).encode('utf-8')
+                block = []
+        if block:
+            yield ''.join(block).encode('utf-8')
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
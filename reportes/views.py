@@ -7,7 +7,8 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 import json
 from django.db.models import Count, Sum, Avg, Q
-from .utils import PDFExporter, ExcelExporter, export_queryset_to_pdf, export_queryset_to_excel
+from .kpis import obtener_kpis
+from .cache_dashboard import obtener_fragmento
 
 # Importaciones de modelos
 from inventario.models import Activo, Hardware, Software, Mantenimiento
@@ -23,10 +24,9 @@ except ImportError:
 
 from usuarios.decorators import (
     supervisor_o_admin_requerido,
-    puede_ver_reportes,
     puede_ver_actividad,
-    es_admin
 )
+from usuarios.permisos import permisos_peticion
 
 # Context processor para permisos globales
 
@@ -35,22 +35,13 @@ def permisos_context(request):
     """
     Context processor para agregar permisos a todos los templates
     """
-    context = {}
-
-    if request.user.is_authenticated:
-        context.update({
-            'puede_ver_reportes': puede_ver_reportes(request.user),
-            'puede_ver_actividad': puede_ver_actividad(request.user),
-            'es_admin': es_admin(request.user),
-        })
-    else:
-        context.update({
-            'puede_ver_reportes': False,
-            'puede_ver_actividad': False,
-            'es_admin': False,
-        })
-
-    return context
+    permisos = permisos_peticion(request)
+    return {
+        'permisos': permisos,
+        'puede_ver_reportes': permisos.puede('ver_reportes'),
+        'puede_ver_actividad': permisos.puede('ver_actividad'),
+        'es_admin': permisos.puede('administrar'),
+    }
 
 
 @supervisor_o_admin_requerido
@@ -63,172 +54,120 @@ def reportes_index_view(request):
     return render(request, 'reportes/index.html', context)
 
 
+def _calcular_dashboard(hoy):
+    """Calcular los datos del dashboard de reportes (sin la actividad reciente)"""
+    # Indicadores pre-agregados (ver reportes/kpis.py)
+    indicadores = obtener_kpis(hoy, limite_departamentos=10)
+
+    # Nivel de transformación digital (si existe módulo diagnóstico)
+    nivel_transformacion = 0
+    if DIAGNOSTICO_AVAILABLE:
+        nivel_transformacion = Diagnostico.objects.filter(
+            nivel_general__isnull=False
+        ).aggregate(promedio=Avg('nivel_general'))['promedio'] or 0
+
+    # Activos por departamento y por estado para gráficos
+    activos_por_departamento = indicadores['por_departamento']
+    activos_por_estado = indicadores['por_estado']
+
+    # Software próximo a vencer
+    software_por_vencer = list(Software.objects.filter(
+        fecha_vencimiento__isnull=False,
+        fecha_vencimiento__gte=hoy,
+        fecha_vencimiento__lte=hoy + timedelta(days=30),
+        activo__estado='activo'
+    ).select_related('activo')[:10])
+
+    # Añadir días restantes a cada software
+    for software in software_por_vencer:
+        software.dias_restantes = (software.fecha_vencimiento - hoy).days
+
+    # Mantenimientos recientes
+    mantenimientos_recientes = list(Mantenimiento.objects.filter(
+        fecha_realizacion__isnull=False
+    ).select_related('activo').order_by('-fecha_realizacion')[:10])
+
+    colores_estado = {
+        'activo': '#28a745',
+        'en_mantenimiento': '#ffc107',
+        'obsoleto': '#dc3545',
+    }
+
+    return {
+        'total_activos': indicadores['total_activos'],
+        'total_hardware': indicadores['total_hardware'],
+        'total_software': indicadores['total_software'],
+        'mantenimientos_pendientes': indicadores['mantenimientos_pendientes'],
+        'nivel_transformacion': nivel_transformacion,
+        'activos_por_departamento': activos_por_departamento,
+        'software_por_vencer': software_por_vencer,
+        'mantenimientos_recientes': mantenimientos_recientes,
+        # Datos para gráficos
+        'departamentos_nombres': json.dumps(
+            [item['departamento__nombre'] for item in activos_por_departamento]),
+        'departamentos_totales': json.dumps(
+            [item['total'] for item in activos_por_departamento]),
+        'estados_nombres': json.dumps(
+            [item['estado'].replace('_', ' ').title() for item in activos_por_estado]),
+        'estados_totales': json.dumps(
+            [item['total'] for item in activos_por_estado]),
+        'estados_colores': json.dumps(
+            [colores_estado.get(item['estado'], '#6c757d') for item in activos_por_estado]),
+        # Línea temporal de adquisiciones (últimos 12 meses)
+        'chart_activos_meses': json.dumps(
+            [mes.strftime('%b %Y') for mes, _ in indicadores['por_mes']]),
+        'chart_activos_totales': json.dumps(
+            [total for _, total in indicadores['por_mes']]),
+    }
+
+
 @supervisor_o_admin_requerido
 def dashboard_view(request):
     """Dashboard de reportes - Solo supervisores y admins"""
     try:
-        # Importar modelos de inventario de manera segura
-        from inventario.models import Activo, Hardware, Software, Mantenimiento
         from usuarios.models import LogActividad
-        from django.db.models import Count, Q, Sum, Avg
-        from datetime import datetime, timedelta
 
-        # Estadísticas generales
+        # Estadísticas generales (cacheadas hasta que cambien los datos)
         try:
-            hardware_ids = Hardware.objects.values_list('activo_id', flat=True)
-            software_ids = Software.objects.values_list('activo_id', flat=True)
-
-            total_activos = Activo.objects.filter(
-                id__in=list(hardware_ids) + list(software_ids)
-            ).exclude(estado='baja').count()
-
-            total_hardware = Hardware.objects.select_related('activo').filter(
-                activo__estado__in=['activo', 'en_mantenimiento', 'obsoleto']
-            ).count()
-
-            total_software = Software.objects.select_related('activo').filter(
-                activo__estado__in=['activo', 'en_mantenimiento', 'obsoleto']
-            ).count()
-
-            # Mantenimientos pendientes
-            mantenimientos_pendientes = Mantenimiento.objects.filter(
-                Q(estado='programado') | Q(estado='en_proceso')
-            ).count()
-
-            # Nivel de transformación digital (si existe módulo diagnóstico)
-            nivel_transformacion = 0
-            try:
-                from diagnostico.models import Diagnostico
-                diagnosticos = Diagnostico.objects.filter(
-                    nivel_general__isnull=False)
-                if diagnosticos.exists():
-                    nivel_transformacion = diagnosticos.aggregate(
-                        promedio=Avg('nivel_general')
-                    )['promedio'] or 0
-            except ImportError:
-                pass
-
-            # Activos por departamento para gráfico
-            activos_por_departamento = Activo.objects.filter(
-                id__in=list(hardware_ids) + list(software_ids)
-            ).exclude(estado='baja').values(
-                'departamento__nombre'
-            ).annotate(total=Count('id')).order_by('-total')[:10]
-
-            # Activos por estado
-            activos_por_estado = Activo.objects.filter(
-                id__in=list(hardware_ids) + list(software_ids)
-            ).values('estado').annotate(total=Count('id')).order_by('-total')
-
-            # Software próximo a vencer
             hoy = timezone.now().date()
-            software_por_vencer = Software.objects.filter(
-                fecha_vencimiento__isnull=False,
-                fecha_vencimiento__gte=hoy,
-                fecha_vencimiento__lte=hoy + timedelta(days=30),
-                activo__estado='activo'
-            ).select_related('activo')[:10]
-
-            # Añadir días restantes a cada software
-            for software in software_por_vencer:
-                software.dias_restantes = (
-                    software.fecha_vencimiento - hoy).days
-
-            # Mantenimientos recientes
-            mantenimientos_recientes = Mantenimiento.objects.filter(
-                fecha_realizacion__isnull=False
-            ).select_related('activo').order_by('-fecha_realizacion')[:10]
-
-            # Actividades recientes (solo si puede verlas)
-            actividades = []
-            if puede_ver_actividad(request.user):
-                actividades = LogActividad.objects.select_related(
-                    'usuario'
-                ).order_by('-fecha')[:15]
-
-            # Datos para gráficos
-            departamentos_nombres = [item['departamento__nombre']
-                                     for item in activos_por_departamento]
-            departamentos_totales = [item['total']
-                                     for item in activos_por_departamento]
-
-            estados_nombres = [item['estado'].replace(
-                '_', ' ').title() for item in activos_por_estado]
-            estados_totales = [item['total'] for item in activos_por_estado]
-            estados_colores = []
-            for estado in activos_por_estado:
-                if estado['estado'] == 'activo':
-                    estados_colores.append('#28a745')
-                elif estado['estado'] == 'en_mantenimiento':
-                    estados_colores.append('#ffc107')
-                elif estado['estado'] == 'obsoleto':
-                    estados_colores.append('#dc3545')
-                else:
-                    estados_colores.append('#6c757d')
-
-            # Línea temporal de adquisiciones (últimos 12 meses)
-            chart_activos_meses = []
-            chart_activos_totales = []
-
-            for i in range(11, -1, -1):
-                fecha = timezone.now() - timedelta(days=30*i)
-                mes_nombre = fecha.strftime('%b %Y')
-
-                # Contar activos adquiridos en ese mes
-                total_mes = Activo.objects.filter(
-                    id__in=list(hardware_ids) + list(software_ids),
-                    fecha_adquisicion__year=fecha.year,
-                    fecha_adquisicion__month=fecha.month
-                ).count()
-
-                chart_activos_meses.append(mes_nombre)
-                chart_activos_totales.append(total_mes)
-
+            datos = obtener_fragmento(
+                'reportes', (hoy.isoformat(),), lambda: _calcular_dashboard(hoy))
         except Exception as e:
             # Valores por defecto en caso de error
-            total_activos = 0
-            total_hardware = 0
-            total_software = 0
-            mantenimientos_pendientes = 0
-            nivel_transformacion = 0
-            activos_por_departamento = []
-            software_por_vencer = []
-            mantenimientos_recientes = []
-            actividades = []
-            departamentos_nombres = []
-            departamentos_totales = []
-            estados_nombres = []
-            estados_totales = []
-            estados_colores = []
-            chart_activos_meses = []
-            chart_activos_totales = []
+            datos = {
+                'total_activos': 0,
+                'total_hardware': 0,
+                'total_software': 0,
+                'mantenimientos_pendientes': 0,
+                'nivel_transformacion': 0,
+                'activos_por_departamento': [],
+                'software_por_vencer': [],
+                'mantenimientos_recientes': [],
+                'departamentos_nombres': '[]',
+                'departamentos_totales': '[]',
+                'estados_nombres': '[]',
+                'estados_totales': '[]',
+                'estados_colores': '[]',
+                'chart_activos_meses': '[]',
+                'chart_activos_totales': '[]',
+            }
+
+        # Actividades recientes (solo si puede verlas)
+        actividades = []
+        if puede_ver_actividad(request.user):
+            actividades = LogActividad.objects.select_related(
+                'usuario'
+            ).order_by('-fecha')[:15]
 
         context = {
             'section': 'dashboard',
             'title': 'Dashboard de Reportes',
-            'total_activos': total_activos,
-            'total_hardware': total_hardware,
-            'total_software': total_software,
-            'mantenimientos_pendientes': mantenimientos_pendientes,
-            'nivel_transformacion': nivel_transformacion,
-            'activos_por_departamento': activos_por_departamento,
-            'software_por_vencer': software_por_vencer,
-            'mantenimientos_recientes': mantenimientos_recientes,
             'actividades': actividades,
-            'departamentos_nombres': json.dumps(departamentos_nombres),
-            'departamentos_totales': json.dumps(departamentos_totales),
-            'estados_nombres': json.dumps(estados_nombres),
-            'estados_totales': json.dumps(estados_totales),
-            'estados_colores': json.dumps(estados_colores),
-            'chart_activos_meses': json.dumps(chart_activos_meses),
-            'chart_activos_totales': json.dumps(chart_activos_totales),
+            **datos,
         }
 
         return render(request, 'reportes/dashboard.html', context)
 
-    except ImportError:
-        messages.error(request, 'Módulo de inventario no disponible.')
-        return redirect('reportes_index')
     except Exception as e:
         messages.error(request, 'Error al cargar el dashboard de reportes.')
         return redirect('reportes_index')
@@ -252,8 +191,8 @@ def inventario_report_view(request):
             if form.is_valid():
                 formato = form.cleaned_data.get('formato', 'vista')
 
-                # Si el formato es PDF o Excel, redirigir a exportación
-                if formato in ['pdf', 'excel']:
+                # Si el formato es PDF, Excel o CSV, redirigir a exportación
+                if formato in ['pdf', 'excel', 'csv']:
                     from django.http import QueryDict
                     params = QueryDict(mutable=True)
                     params.update(request.GET if request.method ==
@@ -648,6 +587,36 @@ def obsolescencia_report_view(request):
         return redirect('reportes_index')
 
 
+@supervisor_o_admin_requerido
+def actividad_report_view(request):
+    """Reporte de actividad de usuarios, incluidos los periodos archivados"""
+    from usuarios.retencion import consultar_actividad, periodos_archivados
+    from .forms import ActividadReportForm
+
+    form = ActividadReportForm(request.GET or None)
+    actividades = []
+
+    if form.is_valid():
+        actividades = consultar_actividad(
+            desde=form.cleaned_data['fecha_inicio'],
+            hasta=form.cleaned_data['fecha_fin'],
+            usuario=form.cleaned_data['usuario'],
+        )
+    elif not request.GET:
+        # Sin filtros: última actividad registrada
+        actividades = consultar_actividad(desde=timezone.now().date() - timedelta(days=7))
+
+    context = {
+        'form': form,
+        'actividades': actividades,
+        'periodos_archivados': periodos_archivados(),
+        'section': 'actividad_report',
+        'title': 'Reporte de Actividad'
+    }
+
+    return render(request, 'reportes/actividad_report.html', context)
+
+
 @supervisor_o_admin_requerido
 def transformacion_digital_report_view(request):
     """Reporte de transformación digital - Solo supervisores y admins"""
@@ -764,93 +733,17 @@ def export_inventario_view(request, format):
     print(f"Exportando {format} - Filtros: {request.GET}")
     """Exportar reporte de inventario"""
     try:
-        from inventario.models import Activo, Hardware, Software
+        from .cache_reportes import exportar_con_cache
         from .forms import InventarioReportForm
-        from .utils import PDFExporter, ExcelExporter, export_queryset_to_pdf, export_queryset_to_excel
 
         # Procesar filtros del GET request
         form = InventarioReportForm(request.GET)
 
         if form.is_valid():
-            # Aplicar filtros según el formulario
-            queryset = Activo.objects.all()
-
-            # Filtrar por tipo
-            tipo = form.cleaned_data.get('tipo')
-            if tipo == 'hardware':
-                hardware_ids = Hardware.objects.values_list(
-                    'activo_id', flat=True)
-                queryset = queryset.filter(id__in=hardware_ids)
-            elif tipo == 'software':
-                software_ids = Software.objects.values_list(
-                    'activo_id', flat=True)
-                queryset = queryset.filter(id__in=software_ids)
-
-            # Filtrar por departamento
-            departamento = form.cleaned_data.get('departamento')
-            if departamento:
-                queryset = queryset.filter(departamento=departamento)
-
-            # Filtrar por estado
-            estado = form.cleaned_data.get('estado')
-            if estado:
-                queryset = queryset.filter(estado=estado)
-
-            # Filtrar por fechas
-            fecha_inicio = form.cleaned_data.get('fecha_inicio')
-            fecha_fin = form.cleaned_data.get('fecha_fin')
-
-            if fecha_inicio:
-                queryset = queryset.filter(fecha_adquisicion__gte=fecha_inicio)
-            if fecha_fin:
-                queryset = queryset.filter(fecha_adquisicion__lte=fecha_fin)
-
-            queryset = queryset.select_related(
-                'departamento').order_by('-fecha_adquisicion')
-
-            # Definir campos para el reporte
-            fields = [
-                {'name': 'id', 'label': 'ID'},
-                {'name': 'nombre', 'label': 'Nombre'},
-                {'name': 'get_tipo_display', 'label': 'Tipo'},
-                {'name': 'departamento.nombre', 'label': 'Departamento'},
-                {'name': 'get_estado_display', 'label': 'Estado'},
-                {'name': 'valor_adquisicion', 'label': 'Valor Adquisición'},
-                {'name': 'fecha_adquisicion', 'label': 'Fecha Adquisición'},
-            ]
-
-            # Preparar título y filtros para el reporte
-            titulo = "Reporte de Inventario"
-            filtros = {}
-
-            if tipo:
-                filtros['Tipo'] = tipo.title()
-            if departamento:
-                filtros['Departamento'] = departamento.nombre
-            if estado:
-                filtros['Estado'] = estado.replace('_', ' ').title()
-            if fecha_inicio:
-                filtros['Fecha desde'] = fecha_inicio.strftime('%d/%m/%Y')
-            if fecha_fin:
-                filtros['Fecha hasta'] = fecha_fin.strftime('%d/%m/%Y')
-
-            # Generar reporte según formato
-            if format.lower() == 'pdf':
-                return export_queryset_to_pdf(
-                    queryset=queryset,
-                    fields=fields,
-                    title=titulo,
-                    filters=filtros,
-                    landscape=True
-                )
-            elif format.lower() == 'excel':
-                return export_queryset_to_excel(
-                    queryset=queryset,
-                    fields=fields,
-                    title=titulo,
-                    filters=filtros
-                )
-            else:
+            # Servir desde la caché de archivos o generar según formato
+            try:
+                return exportar_con_cache(request, 'inventario', form.cleaned_data, format)
+            except ValueError:
                 messages.error(request, 'Formato de exportación no válido.')
                 return redirect('inventario_report')
         else:
@@ -871,86 +764,17 @@ def export_mantenimiento_view(request, format):
     print(f"Exportando {format} - Filtros: {request.GET}")
     """Exportar reporte de mantenimientos"""
     try:
-        from inventario.models import Mantenimiento
+        from .cache_reportes import exportar_con_cache
         from .forms import MantenimientoReportForm
-        from .utils import export_queryset_to_pdf, export_queryset_to_excel
 
         # Procesar filtros del GET request
         form = MantenimientoReportForm(request.GET)
 
         if form.is_valid():
-            # Aplicar filtros
-            queryset = Mantenimiento.objects.select_related(
-                'activo', 'responsable')
-
-            # Filtros del formulario
-            tipo = form.cleaned_data.get('tipo')
-            if tipo:
-                queryset = queryset.filter(tipo=tipo)
-
-            estado = form.cleaned_data.get('estado')
-            if estado:
-                queryset = queryset.filter(estado=estado)
-
-            responsable = form.cleaned_data.get('responsable')
-            if responsable:
-                queryset = queryset.filter(responsable=responsable)
-
-            fecha_inicio = form.cleaned_data.get('fecha_inicio')
-            fecha_fin = form.cleaned_data.get('fecha_fin')
-
-            if fecha_inicio:
-                queryset = queryset.filter(fecha_programada__gte=fecha_inicio)
-            if fecha_fin:
-                queryset = queryset.filter(fecha_programada__lte=fecha_fin)
-
-            queryset = queryset.order_by('-fecha_programada')
-
-            # Definir campos para el reporte
-            fields = [
-                {'name': 'id', 'label': 'ID'},
-                {'name': 'activo.nombre', 'label': 'Activo'},
-                {'name': 'get_tipo_display', 'label': 'Tipo'},
-                {'name': 'fecha_programada', 'label': 'Fecha Programada'},
-                {'name': 'fecha_realizacion', 'label': 'Fecha Realización'},
-                {'name': 'responsable.get_full_name', 'label': 'Responsable'},
-                {'name': 'get_estado_display', 'label': 'Estado'},
-                {'name': 'costo', 'label': 'Costo'},
-                {'name': 'descripcion', 'label': 'Descripción'},
-            ]
-
-            # Preparar título y filtros para el reporte
-            titulo = "Reporte de Mantenimientos"
-            filtros = {}
-
-            if tipo:
-                filtros['Tipo'] = tipo.title()
-            if estado:
-                filtros['Estado'] = estado.replace('_', ' ').title()
-            if responsable:
-                filtros['Responsable'] = responsable.get_full_name()
-            if fecha_inicio:
-                filtros['Fecha desde'] = fecha_inicio.strftime('%d/%m/%Y')
-            if fecha_fin:
-                filtros['Fecha hasta'] = fecha_fin.strftime('%d/%m/%Y')
-
-            # Generar reporte según formato
-            if format.lower() == 'pdf':
-                return export_queryset_to_pdf(
-                    queryset=queryset,
-                    fields=fields,
-                    title=titulo,
-                    filters=filtros,
-                    landscape=True
-                )
-            elif format.lower() == 'excel':
-                return export_queryset_to_excel(
-                    queryset=queryset,
-                    fields=fields,
-                    title=titulo,
-                    filters=filtros
-                )
-            else:
+            # Servir desde la caché de archivos o generar según formato
+            try:
+                return exportar_con_cache(request, 'mantenimiento', form.cleaned_data, format)
+            except ValueError:
                 messages.error(request, 'Formato de exportación no válido.')
                 return redirect('mantenimiento_report')
         else:
@@ -971,72 +795,17 @@ def export_diagnostico_view(request, format):
     print(f"Exportando {format} - Filtros: {request.GET}")
     """Exportar reporte de diagnóstico"""
     try:
-        from diagnostico.models import Diagnostico
+        from .cache_reportes import exportar_con_cache
         from .forms import TransformacionDigitalReportForm
-        from .utils import export_queryset_to_pdf, export_queryset_to_excel
 
         # Procesar filtros del GET request
         form = TransformacionDigitalReportForm(request.GET)
 
         if form.is_valid():
-            # Aplicar filtros
-            queryset = Diagnostico.objects.select_related(
-                'departamento', 'cuestionario', 'responsable'
-            )
-
-            departamento = form.cleaned_data.get('departamento')
-            if departamento:
-                queryset = queryset.filter(departamento=departamento)
-
-            fecha_inicio = form.cleaned_data.get('fecha_inicio')
-            fecha_fin = form.cleaned_data.get('fecha_fin')
-
-            if fecha_inicio:
-                queryset = queryset.filter(fecha__gte=fecha_inicio)
-            if fecha_fin:
-                queryset = queryset.filter(fecha__lte=fecha_fin)
-
-            queryset = queryset.order_by('-fecha')
-
-            # Definir campos para el reporte
-            fields = [
-                {'name': 'id', 'label': 'ID'},
-                {'name': 'departamento.nombre', 'label': 'Departamento'},
-                {'name': 'cuestionario.titulo', 'label': 'Cuestionario'},
-                {'name': 'fecha', 'label': 'Fecha'},
-                {'name': 'nivel_general', 'label': 'Nivel General'},
-                {'name': 'responsable.get_full_name', 'label': 'Responsable'},
-                {'name': 'observaciones', 'label': 'Observaciones'},
-            ]
-
-            # Preparar título y filtros para el reporte
-            titulo = "Reporte de Transformación Digital"
-            filtros = {}
-
-            if departamento:
-                filtros['Departamento'] = departamento.nombre
-            if fecha_inicio:
-                filtros['Fecha desde'] = fecha_inicio.strftime('%d/%m/%Y')
-            if fecha_fin:
-                filtros['Fecha hasta'] = fecha_fin.strftime('%d/%m/%Y')
-
-            # Generar reporte según formato
-            if format.lower() == 'pdf':
-                return export_queryset_to_pdf(
-                    queryset=queryset,
-                    fields=fields,
-                    title=titulo,
-                    filters=filtros,
-                    landscape=True
-                )
-            elif format.lower() == 'excel':
-                return export_queryset_to_excel(
-                    queryset=queryset,
-                    fields=fields,
-                    title=titulo,
-                    filters=filtros
-                )
-            else:
+            # Servir desde la caché de archivos o generar según formato
+            try:
+                return exportar_con_cache(request, 'diagnostico', form.cleaned_data, format)
+            except ValueError:
                 messages.error(request, 'Formato de exportación no válido.')
                 return redirect('transformacion_digital_report')
         else:
@@ -1052,6 +821,82 @@ def export_diagnostico_view(request, format):
         return redirect('transformacion_digital_report')
 
 
+@supervisor_o_admin_requerido
+def solicitar_reporte_view(request, tipo, format):
+    """Registrar una exportación para generarla en segundo plano"""
+    from .exportaciones import EXPORTACIONES
+    from .trabajos import solicitar_reporte, LimiteReportesExcedido
+
+    if tipo not in EXPORTACIONES:
+        messages.error(request, 'Tipo de reporte no válido.')
+        return redirect('reportes_index')
+
+    try:
+        solicitar_reporte(request.user, tipo, format, request.GET.dict())
+        messages.success(
+            request, 'El reporte se está generando. Podrá descargarlo desde "Mis reportes".')
+        return redirect('mis_reportes')
+    except (ValueError, LimiteReportesExcedido) as e:
+        messages.error(request, str(e))
+        return redirect(EXPORTACIONES[tipo][2])
+
+
+@supervisor_o_admin_requerido
+def mis_reportes_view(request):
+    """Reportes generados en segundo plano por el usuario"""
+    from .models import Reporte
+
+    reportes = Reporte.objects.filter(usuario=request.user)[:50]
+
+    context = {
+        'reportes': reportes,
+        'hay_en_curso': any(r.estado in ('pendiente', 'en_proceso') for r in reportes),
+        'section': 'mis_reportes',
+        'title': 'Mis Reportes'
+    }
+
+    return render(request, 'reportes/mis_reportes.html', context)
+
+
+@supervisor_o_admin_requerido
+def estado_reporte_view(request, pk):
+    """Estado de un reporte en generación (para consultar periódicamente)"""
+    from django.shortcuts import get_object_or_404
+    from django.urls import reverse
+    from .models import Reporte
+
+    reporte = get_object_or_404(Reporte, pk=pk, usuario=request.user)
+
+    return JsonResponse({
+        'estado': reporte.estado,
+        'estado_display': reporte.get_estado_display(),
+        'progreso': reporte.progreso,
+        'error': reporte.mensaje_error,
+        'url': reverse('descargar_reporte', kwargs={'pk': pk})
+        if reporte.estado == 'completado' else None,
+    })
+
+
+@supervisor_o_admin_requerido
+def descargar_reporte_view(request, pk):
+    """Descargar el archivo de un reporte generado"""
+    import os
+    from django.http import FileResponse, Http404
+    from django.shortcuts import get_object_or_404
+    from .models import Reporte
+
+    reporte = get_object_or_404(
+        Reporte, pk=pk, usuario=request.user, estado='completado')
+
+    try:
+        archivo = reporte.archivo.open('rb')
+    except (ValueError, FileNotFoundError):
+        raise Http404('El archivo del reporte ya no está disponible.')
+
+    return FileResponse(archivo, as_attachment=True,
+                        filename=os.path.basename(reporte.archivo.name))
+
+
 @supervisor_o_admin_requerido
 def index(request):
     """Vista de compatibilidad - redirige a reportes_index_view"""
@@ -1063,7 +908,4 @@ def verificar_acceso_reportes(request):
     """
     Función auxiliar que puede ser usada en middleware o context processors
     """
-    if not request.user.is_authenticated:
-        return False
-
-    return puede_ver_reportes(request.user)
+    return permisos_peticion(request).puede('ver_reportes')
@@ -0,0 +1,99 @@
+# usuarios/acceso.py
+"""
+Control de acceso por prefijo de URL.
+
+Las reglas de settings.ACCESO_RUTAS se compilan una sola vez, al crear el
+middleware, en un árbol cuyos nodos son segmentos de la ruta. Cada petición
+recorre el árbol segmento a segmento y se queda con la regla del prefijo más
+largo que coincide, de modo que una regla más específica puede relajar otra
+más general (p. ej. '/reportes/publico/': None).
+
+Valores de una regla:
+    'capacidad': la ruta exige esa capacidad (ver usuarios/permisos.py)
+    '': basta con haber iniciado sesión
+    None: ruta libre
+
+Las rutas de archivos estáticos y media se descartan antes de recorrer el
+árbol, y el rol del usuario solo se resuelve cuando alguna regla coincide.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .permisos import BITS
+
+# Marca de los nodos sin regla propia
+SIN_REGLA = object()
+
+# Mensaje al denegar el acceso según la capacidad que falta
+MENSAJES = {
+    'ver_reportes': 'No tiene permisos para acceder a la sección de reportes.',
+}
+MENSAJE_DEFECTO = 'No tiene permisos para acceder a esta sección.'
+
+
+class _Nodo:
+    __slots__ = ('hijos', 'regla')
+
+    def __init__(self):
+        self.hijos = {}
+        self.regla = SIN_REGLA
+
+
+def _segmentos(ruta):
+    return [segmento for segmento in ruta.split('/') if segmento]
+
+
+class RutasAcceso:
+    """
+    Reglas de acceso compiladas para buscar el prefijo más largo.
+
+    Los prefijos se comparan por segmentos completos: '/reportes/' cubre
+    '/reportes' y '/reportes/ventas/', pero no '/reportes-antiguos/'.
+    """
+
+    def __init__(self, reglas, excluidos=()):
+        self._raiz = _Nodo()
+        # startswith con una tupla vacía siempre es falso
+        self._excluidos = tuple(excluidos)
+        for prefijo, regla in reglas.items():
+            nodo = self._raiz
+            for segmento in _segmentos(prefijo):
+                nodo = nodo.hijos.setdefault(segmento, _Nodo())
+            nodo.regla = regla
+
+    def buscar(self, ruta):
+        """
+        Regla del prefijo más largo que coincide con la ruta.
+
+        Returns:
+            El valor de la regla, o SIN_REGLA si ninguna coincide
+        """
+        if ruta.startswith(self._excluidos):
+            return SIN_REGLA
+
+        nodo = self._raiz
+        regla = nodo.regla
+        for segmento in ruta.split('/'):
+            if not segmento:
+                continue
+            nodo = nodo.hijos.get(segmento)
+            if nodo is None:
+                break
+            if nodo.regla is not SIN_REGLA:
+                regla = nodo.regla
+        return regla
+
+
+def rutas_configuradas():
+    """Compilar las reglas de settings.ACCESO_RUTAS"""
+    reglas = getattr(settings, 'ACCESO_RUTAS', {})
+    for prefijo, regla in reglas.items():
+        if regla and regla not in BITS:
+            raise ImproperlyConfigured(
+                f"ACCESO_RUTAS['{prefijo}']: capacidad desconocida '{regla}'")
+
+    excluidos = [
+        url for url in (settings.STATIC_URL, settings.MEDIA_URL)
+        if url and url.startswith('/')
+    ]
+    return RutasAcceso(reglas, excluidos)
@@ -0,0 +1,185 @@
+# usuarios/actividad.py
+"""
+Registro de actividad de los usuarios.
+
+Por defecto las entradas de LogActividad no se escriben dentro de la
+petición: se encolan en memoria y un hilo en segundo plano las inserta con
+bulk_create por lotes. Así las vistas de solo lectura no toman el bloqueo de
+escritura de la base de datos.
+
+Configuración (settings):
+    ACTIVIDAD_ASINCRONA: False para escribir cada entrada en el momento
+    ACTIVIDAD_TAMANO_LOTE: entradas máximas por bulk_create
+    ACTIVIDAD_INTERVALO: segundos máximos que una entrada espera en la cola
+    ACTIVIDAD_CAPACIDAD_COLA: entradas máximas en memoria; con la cola llena
+        las nuevas se descartan
+    ACTIVIDAD_MUESTREO_CONSULTAS: fracción (0-1) de eventos "Consulta de ..."
+        que se registran; 0 los omite todos
+"""
+import atexit
+import logging
+import queue
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import LogActividad
+
+logger = logging.getLogger(__name__)
+
+PREFIJO_CONSULTA = 'Consulta de'
+
+
+class EscritorActividad:
+    """Cola de entradas de actividad vaciada por un hilo en segundo plano"""
+
+    def __init__(self, tamano_lote=100, intervalo=2.0, capacidad=10000):
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.cola = queue.Queue(maxsize=capacidad)
+        # Entradas perdidas porque la cola seguía llena
+        self.descartadas = 0
+        self._hilo = None
+        self._candado = threading.Lock()
+        self._detener = threading.Event()
+
+    def iniciar(self):
+        """Arrancar el hilo escritor si no está en marcha"""
+        with self._candado:
+            if self._hilo is not None and self._hilo.is_alive():
+                return
+            self._detener.clear()
+            self._hilo = threading.Thread(
+                target=self._ejecutar, name='escritor-actividad', daemon=True)
+            self._hilo.start()
+
+    def encolar(self, entrada):
+        """
+        Añadir una entrada a la cola.
+
+        Se llama desde transaction.on_commit, después de confirmar la vista:
+        nunca lanza excepciones ni se bloquea. Con la cola llena la entrada se
+        descarta en el acto: esperar al hilo escritor detendría la petición.
+        """
+        self.iniciar()
+        try:
+            self.cola.put_nowait(entrada)
+        except queue.Full:
+            self.descartadas += 1
+            logger.warning('Cola de actividad llena: entrada descartada (%s)', entrada.accion)
+
+    def _tomar_lote(self):
+        """Esperar la primera entrada y reunir las que lleguen durante el intervalo"""
+        try:
+            lote = [self.cola.get(timeout=self.intervalo)]
+        except queue.Empty:
+            return []
+
+        limite = time.monotonic() + self.intervalo
+        while len(lote) < self.tamano_lote:
+            restante = limite - time.monotonic()
+            if restante <= 0 or self._detener.is_set():
+                break
+            try:
+                lote.append(self.cola.get(timeout=restante))
+            except queue.Empty:
+                break
+        return lote
+
+    def _escribir(self, lote):
+        try:
+            LogActividad.objects.bulk_create(lote, batch_size=self.tamano_lote)
+        except Exception:
+            logger.exception(
+                'No se pudieron guardar %d entradas de actividad', len(lote))
+
+    def _ejecutar(self):
+        while not self._detener.is_set():
+            lote = self._tomar_lote()
+            if lote:
+                try:
+                    self._escribir(lote)
+                finally:
+                    # Solo la conexión propia del hilo escritor
+                    close_old_connections()
+
+    def vaciar(self):
+        """Escribir inmediatamente todo lo pendiente en la cola"""
+        lote = []
+        while True:
+            try:
+                lote.append(self.cola.get_nowait())
+            except queue.Empty:
+                break
+            if len(lote) >= self.tamano_lote:
+                self._escribir(lote)
+                lote = []
+        if lote:
+            self._escribir(lote)
+
+    def detener(self, timeout=5):
+        """Detener el hilo y escribir lo pendiente (al cerrar el proceso)"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+        self.vaciar()
+
+
+_escritor = None
+_candado_escritor = threading.Lock()
+
+
+def obtener_escritor():
+    """Escritor compartido por el proceso (se crea al primer uso)"""
+    global _escritor
+    if _escritor is None:
+        with _candado_escritor:
+            if _escritor is None:
+                _escritor = EscritorActividad(
+                    tamano_lote=getattr(settings, 'ACTIVIDAD_TAMANO_LOTE', 100),
+                    intervalo=getattr(settings, 'ACTIVIDAD_INTERVALO', 2.0),
+                    capacidad=getattr(settings, 'ACTIVIDAD_CAPACIDAD_COLA', 10000),
+                )
+                atexit.register(_escritor.detener)
+    return _escritor
+
+
+def registrar_actividad(usuario, accion, detalles=None, ip=None):
+    """
+    Registrar una acción del usuario.
+
+    Los errores nunca se propagan a la vista: el registro de actividad no
+    debe impedir completar la operación.
+
+    Returns:
+        La entrada de LogActividad, o None si fue omitida por el muestreo
+    """
+    try:
+        if accion.startswith(PREFIJO_CONSULTA):
+            muestreo = getattr(settings, 'ACTIVIDAD_MUESTREO_CONSULTAS', 1.0)
+            if random.random() >= muestreo:
+                return None
+
+        entrada = LogActividad(
+            usuario_id=usuario.pk,
+            accion=accion,
+            detalles=detalles,
+            ip=ip,
+            fecha=timezone.now()
+        )
+
+        if not getattr(settings, 'ACTIVIDAD_ASINCRONA', True):
+            entrada.save()
+            return entrada
+
+        # Encolar solo si la transacción en curso se confirma
+        transaction.on_commit(lambda: obtener_escritor().encolar(entrada))
+        return entrada
+
+    except Exception:
+        logger.exception('Error registrando actividad: %s', accion)
+        return None
@@ -1,9 +1,11 @@
 # usuarios/admin.py
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django.utils.html import format_html
-from .models import Rol, Departamento, PerfilUsuario, LogActividad
+from .models import Rol, Departamento, PerfilUsuario, LogActividad, LogActividadArchivado
+from .permisos import BITS, codificar, decodificar
 
 
 # Inline para mostrar el perfil en la página de usuario
@@ -45,12 +47,42 @@ admin.site.unregister(User)
 admin.site.register(User, UserAdmin)
 
 
+class RolAdminForm(forms.ModelForm):
+    """Edición de Rol.capacidades como casillas en lugar del entero de bits"""
+    lista_capacidades = forms.MultipleChoiceField(
+        label='Capacidades',
+        choices=[(capacidad, capacidad.replace('_', ' ').capitalize()) for capacidad in BITS],
+        widget=forms.CheckboxSelectMultiple,
+        required=False,
+    )
+
+    class Meta:
+        model = Rol
+        fields = ('nombre', 'descripcion', 'lista_capacidades', 'permisos')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk and self.instance.capacidades is not None:
+            self.initial['lista_capacidades'] = sorted(decodificar(self.instance.capacidades))
+
+    def save(self, commit=True):
+        self.instance.capacidades = codificar(self.cleaned_data['lista_capacidades'])
+        return super().save(commit)
+
+
 @admin.register(Rol)
 class RolAdmin(admin.ModelAdmin):
-    list_display = ('nombre', 'descripcion')
+    form = RolAdminForm
+    list_display = ('nombre', 'descripcion', 'get_capacidades')
     search_fields = ('nombre', 'descripcion')
     ordering = ('nombre',)
 
+    def get_capacidades(self, obj):
+        if obj.capacidades is None:
+            return '-'
+        return ', '.join(sorted(decodificar(obj.capacidades))) or '-'
+    get_capacidades.short_description = 'Capacidades'
+
 
 @admin.register(Departamento)
 class DepartamentoAdmin(admin.ModelAdmin):
@@ -97,6 +129,24 @@ class LogActividadAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(LogActividadArchivado)
+class LogActividadArchivadoAdmin(admin.ModelAdmin):
+    list_display = ('usuario', 'accion', 'fecha', 'ip', 'periodo')
+    list_filter = ('periodo', 'accion')
+    search_fields = ('usuario__username', 'accion', 'detalles', 'ip')
+    readonly_fields = ('usuario', 'accion', 'fecha', 'detalles', 'ip', 'periodo')
+    ordering = ('-fecha',)
+    date_hierarchy = 'periodo'
+
+    def has_add_permission(self, request):
+        """El archivo solo se alimenta con el comando archivar_logs"""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """No permitir editar logs"""
+        return False
+
+
 # Personalizar el título del admin
 admin.site.site_header = 'Administración - Sistema UCF'
 admin.site.site_title = 'Admin UCF'
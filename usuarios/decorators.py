@@ -6,44 +6,32 @@ from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 
+from .permisos import BITS, permisos_peticion, permisos_usuario
 
-def rol_requerido(roles_permitidos):
-    """
-    Decorador que verifica si el usuario tiene uno de los roles permitidos
-
-    Args:
-        roles_permitidos: Lista de nombres de roles o string con un rol
 
-    Usage:
-        @rol_requerido(['Administrador', 'Supervisor'])
-        @rol_requerido('Administrador')
-    """
+def _permiso_requerido(comprobar):
+    """Decorador que deja pasar las peticiones cuyos permisos cumplen `comprobar`"""
     def decorator(view_func):
         @wraps(view_func)
         @login_required
         def wrapper(request, *args, **kwargs):
-            # Convertir a lista si es string
-            if isinstance(roles_permitidos, str):
-                roles = [roles_permitidos]
-            else:
-                roles = roles_permitidos
-
             try:
+                permisos = permisos_peticion(request)
+
                 # Verificar si el usuario tiene perfil
-                if not hasattr(request.user, 'perfil'):
+                if not permisos.tiene_perfil:
                     messages.error(
                         request, 'Su cuenta no tiene un perfil asignado. Contacte al administrador.')
                     return redirect('dashboard')
 
                 # Verificar si tiene rol asignado
-                if not request.user.perfil.rol:
+                if not permisos.rol:
                     messages.error(
                         request, 'Su cuenta no tiene un rol asignado. Contacte al administrador.')
                     return redirect('dashboard')
 
-                # Verificar si el rol está en los permitidos
-                rol_usuario = request.user.perfil.rol.nombre
-                if rol_usuario in roles:
+                # Verificar si el rol concede el acceso
+                if comprobar(permisos):
                     return view_func(request, *args, **kwargs)
                 else:
                     messages.error(
@@ -59,93 +47,80 @@ def rol_requerido(roles_permitidos):
     return decorator
 
 
+def rol_requerido(roles_permitidos):
+    """
+    Decorador que verifica si el usuario tiene uno de los roles permitidos
+
+    Args:
+        roles_permitidos: Lista de nombres de roles o string con un rol
+
+    Usage:
+        @rol_requerido(['Administrador', 'Supervisor'])
+        @rol_requerido('Administrador')
+    """
+    # Convertir a lista si es string
+    if isinstance(roles_permitidos, str):
+        roles = [roles_permitidos]
+    else:
+        roles = roles_permitidos
+
+    return _permiso_requerido(lambda permisos: permisos.tiene_rol(roles))
+
+
+def capacidad_requerida(capacidad):
+    """
+    Decorador que verifica si el rol del usuario concede una capacidad
+
+    Args:
+        capacidad: nombre de usuarios.permisos.BITS
+
+    Usage:
+        @capacidad_requerida('ver_reportes')
+    """
+    bit = BITS[capacidad]
+    return _permiso_requerido(lambda permisos: permisos.bits & bit)
+
+
 def admin_requerido(view_func):
     """
     Decorador para vistas que requieren rol de Administrador
     """
-    return rol_requerido(['Administrador', 'Superadministrador'])(view_func)
+    return capacidad_requerida('administrar')(view_func)
 
 
 def supervisor_o_admin_requerido(view_func):
     """
     Decorador para vistas que requieren rol de Supervisor o Administrador
     """
-    return rol_requerido(['Administrador', 'Superadministrador', 'Supervisor'])(view_func)
+    return capacidad_requerida('supervisar')(view_func)
 
 
 def puede_ver_reportes(user):
     """
     Función auxiliar para verificar si un usuario puede ver reportes
     """
-    try:
-        if not hasattr(user, 'perfil') or not user.perfil.rol:
-            return False
-
-        roles_con_reportes = [
-            'Administrador',
-            'Superadministrador',
-            'Supervisor',
-            'Analista',
-            'Coordinador'
-        ]
-
-        return user.perfil.rol.nombre in roles_con_reportes
-    except:
-        return False
+    return permisos_usuario(user).puede('ver_reportes')
 
 
 def puede_ver_actividad(user):
     """
     Función auxiliar para verificar si un usuario puede ver actividad reciente
     """
-    try:
-        if not hasattr(user, 'perfil') or not user.perfil.rol:
-            return False
-
-        roles_con_actividad = [
-            'Administrador',
-            'Superadministrador',
-            'Supervisor',
-            'Coordinador'
-        ]
-
-        return user.perfil.rol.nombre in roles_con_actividad
-    except:
-        return False
+    return permisos_usuario(user).puede('ver_actividad')
 
 
 def es_admin(user):
     """
     Función auxiliar para verificar si un usuario es administrador
     """
-    try:
-        if not hasattr(user, 'perfil') or not user.perfil.rol:
-            return False
-
-        return user.perfil.rol.nombre in ['Administrador', 'Superadministrador']
-    except:
-        return False
+    return permisos_usuario(user).puede('administrar')
 
 
 def tiene_permiso_inventario(user):
     """
     Función auxiliar para verificar permisos de inventario
     """
-    try:
-        if not hasattr(user, 'perfil') or not user.perfil.rol:
-            return False
-
-        roles_inventario = [
-            'Administrador',
-            'Superadministrador',
-            'Supervisor',
-            'Técnico',
-            'Coordinador'
-        ]
-
-        return user.perfil.rol.nombre in roles_inventario
-    except:
-        return False
+    return permisos_usuario(user).puede('gestionar_inventario')
 
 
 class PermissionMixin:
@@ -153,20 +128,25 @@ class PermissionMixin:
     Mixin para CBVs que requieren verificación de permisos
     """
     roles_requeridos = []
+    capacidad_requerida = None
 
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
             return redirect('login')
 
-        if self.roles_requeridos:
+        if self.roles_requeridos or self.capacidad_requerida:
             try:
-                if not hasattr(request.user, 'perfil') or not request.user.perfil.rol:
+                permisos = permisos_peticion(request)
+                if not permisos.rol:
                     messages.error(
                         request, 'Su cuenta no tiene permisos asignados.')
                     return redirect('dashboard')
 
-                rol_usuario = request.user.perfil.rol.nombre
-                if rol_usuario not in self.roles_requeridos:
+                if self.capacidad_requerida:
+                    permitido = permisos.puede(self.capacidad_requerida)
+                else:
+                    permitido = permisos.tiene_rol(self.roles_requeridos)
+                if not permitido:
                     messages.error(
                         request, 'No tiene permisos para acceder a esta sección.')
                     return redirect('dashboard')
@@ -0,0 +1,51 @@
+# usuarios/management/commands/archivar_logs.py
+import time
+
+from django.core.management.base import BaseCommand
+from usuarios.retencion import (
+    DIAS_RETENCION, TAMANO_LOTE, archivar_logs, fecha_limite, pendientes_archivar
+)
+
+
+class Command(BaseCommand):
+    help = 'Mueve al archivo las entradas del registro de actividad más antiguas que N días'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=DIAS_RETENCION,
+            help=f'Días de actividad que permanecen en la tabla activa (por defecto {DIAS_RETENCION})',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Entradas movidas por transacción (por defecto {TAMANO_LOTE})',
+        )
+        parser.add_argument(
+            '--simular',
+            action='store_true',
+            help='Mostrar cuántas entradas se archivarían sin modificar nada',
+        )
+
+    def handle(self, *args, **options):
+        dias = options['dias']
+        limite = fecha_limite(dias)
+
+        self.stdout.write(
+            f'🗄️  Archivando actividad anterior a {limite:%Y-%m-%d %H:%M} ({dias} días)...')
+
+        if options['simular']:
+            pendientes = pendientes_archivar(dias)
+            self.stdout.write(
+                self.style.WARNING(f'   ⚠ Simulación: se archivarían {pendientes} entradas'))
+            return
+
+        inicio = time.time()
+        total = archivar_logs(dias=dias, tamano_lote=options['lote'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ {total} entradas archivadas en {time.time() - inicio:.2f} segundos')
+        )
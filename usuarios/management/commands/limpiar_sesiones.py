@@ -0,0 +1,45 @@
+# usuarios/management/commands/limpiar_sesiones.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from usuarios.sesiones import TAMANO_LOTE, limpiar_sesiones, sesiones_caducadas, usa_base_datos
+
+
+class Command(BaseCommand):
+    help = 'Elimina por lotes las sesiones caducadas (programar con cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Sesiones eliminadas por transacción (por defecto {TAMANO_LOTE})',
+        )
+        parser.add_argument(
+            '--simular',
+            action='store_true',
+            help='Mostrar cuántas sesiones se eliminarían sin modificar nada',
+        )
+
+    def handle(self, *args, **options):
+        if not usa_base_datos():
+            self.stdout.write(self.style.WARNING(
+                f'   ⚠ {settings.SESSION_ENGINE} no guarda sesiones en la base de datos'))
+            return
+
+        self.stdout.write('🧹 Eliminando sesiones caducadas...')
+
+        if options['simular']:
+            pendientes = sesiones_caducadas().count()
+            self.stdout.write(
+                self.style.WARNING(f'   ⚠ Simulación: se eliminarían {pendientes} sesiones'))
+            return
+
+        inicio = time.time()
+        total = limpiar_sesiones(tamano_lote=options['lote'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ {total} sesiones eliminadas en {time.time() - inicio:.2f} segundos')
+        )
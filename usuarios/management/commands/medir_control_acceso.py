@@ -0,0 +1,56 @@
+# usuarios/management/commands/medir_control_acceso.py
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from usuarios.middleware import ControlAccesoMiddleware
+
+RUTAS_PRUEBA = [
+    ('estática', '/static/css/estilos.css'),
+    ('media', '/media/perfiles/foto.jpg'),
+    ('sin regla', '/inventario/hardware/125/edit/'),
+    ('sin regla (raíz)', '/'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Mide el coste por petición del middleware de control de acceso en rutas sin regla'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iteraciones',
+            type=int,
+            default=200000,
+            help='Peticiones simuladas por ruta (por defecto 200000)',
+        )
+
+    def handle(self, *args, **options):
+        iteraciones = options['iteraciones']
+        respuesta = HttpResponse()
+        middleware = ControlAccesoMiddleware(lambda request: respuesta)
+        vacio = lambda request: respuesta  # noqa: E731
+
+        self.stdout.write(f'⏱️  Midiendo {iteraciones} peticiones por ruta...')
+
+        for nombre, ruta in RUTAS_PRUEBA:
+            request = RequestFactory().get(ruta)
+            request.user = AnonymousUser()
+
+            # Coste del bucle y de la llamada a la vista, que se descuenta
+            inicio = time.perf_counter()
+            for _ in range(iteraciones):
+                vacio(request)
+            base = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            for _ in range(iteraciones):
+                middleware(request)
+            total = time.perf_counter() - inicio
+
+            microsegundos = max(total - base, 0) / iteraciones * 1e6
+            self.stdout.write(f'   ✓ {nombre} ({ruta}): {microsegundos:.3f} µs por petición')
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Medición completada'))
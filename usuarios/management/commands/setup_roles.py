@@ -2,6 +2,7 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from usuarios.models import Rol, Departamento, PerfilUsuario
+from usuarios.permisos import CAPACIDADES_ROLES, codificar
 
 
 class Command(BaseCommand):
@@ -89,11 +90,14 @@ class Command(BaseCommand):
         updated_count = 0
 
         for rol_data in roles_data:
+            # Capacidades declaradas en usuarios.permisos.CAPACIDADES_ROLES
+            capacidades = codificar(CAPACIDADES_ROLES[rol_data['nombre']])
             rol, created = Rol.objects.get_or_create(
                 nombre=rol_data['nombre'],
                 defaults={
                     'descripcion': rol_data['descripcion'],
-                    'permisos': rol_data['permisos']
+                    'permisos': rol_data['permisos'],
+                    'capacidades': capacidades
                 }
             )
 
@@ -104,6 +108,7 @@ class Command(BaseCommand):
                 # Actualizar descripción y permisos si el rol ya existe
                 rol.descripcion = rol_data['descripcion']
                 rol.permisos = rol_data['permisos']
+                rol.capacidades = capacidades
                 rol.save()
                 updated_count += 1
                 self.stdout.write(f'   ↻ Rol actualizado: {rol.nombre}')
@@ -1,84 +1,66 @@
 # usuarios/middleware.py
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.urls import reverse
-from .decorators import puede_ver_reportes
+from django.utils.functional import SimpleLazyObject
+from .acceso import MENSAJE_DEFECTO, MENSAJES, SIN_REGLA, rutas_configuradas
+from .permisos import permisos_peticion
+from .sesiones import renovar_si_necesario
 
 
-class ReportesPermissionMiddleware:
+class SesionDeslizanteMiddleware:
     """
-    Middleware que bloquea el acceso a URLs de reportes para usuarios sin permisos
+    Retrasa la caducidad de la sesión guardándola solo cuando le queda
+    poca vida (ver usuarios/sesiones.py). Debe ir justo después de
+    SessionMiddleware.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
 
-        # URLs que requieren permisos especiales
-        self.protected_paths = [
-            '/reportes/',
-            '/export/',
-        ]
-
     def __call__(self, request):
-        # Verificar si la URL está protegida
-        if any(request.path.startswith(path) for path in self.protected_paths):
-            # Si no está autenticado, redirigir al login
-            if not request.user.is_authenticated:
-                return redirect('login')
-
-            # Si está autenticado pero no tiene permisos
-            if not puede_ver_reportes(request.user):
-                messages.error(
-                    request,
-                    'No tiene permisos para acceder a la sección de reportes.'
-                )
-                return redirect('dashboard')
-
         response = self.get_response(request)
+        sesion = getattr(request, 'session', None)
+        if sesion is not None:
+            renovar_si_necesario(sesion)
         return response
 
 
-class RoleBasedAccessMiddleware:
+class PermisosMiddleware:
     """
-    Middleware más general para controlar acceso basado en roles
+    Asigna request.permisos: rol y capacidades del usuario, resueltos al
+    primer uso y una sola vez por petición (ver usuarios/permisos.py).
+    Debe ir después de SessionMiddleware y AuthenticationMiddleware.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
 
-        # Configuración de permisos por URL
-        self.url_permissions = {
-            '/admin/': ['Administrador', 'Superadministrador'],
-            '/reportes/': ['Administrador', 'Superadministrador', 'Supervisor', 'Analista', 'Coordinador'],
-            '/usuarios/admin/': ['Administrador', 'Superadministrador'],
-        }
-
     def __call__(self, request):
-        # Solo aplicar a usuarios autenticados
-        if request.user.is_authenticated:
+        request.permisos = SimpleLazyObject(lambda: permisos_peticion(request))
+        return self.get_response(request)
 
-            # Verificar cada regla de URL
-            for url_pattern, required_roles in self.url_permissions.items():
-                if request.path.startswith(url_pattern):
 
-                    # Verificar si el usuario tiene el rol requerido
-                    user_role = self.get_user_role(request.user)
+class ControlAccesoMiddleware:
+    """
+    Control de acceso por prefijo de URL con las reglas de
+    settings.ACCESO_RUTAS, compiladas al arrancar (ver usuarios/acceso.py)
+    """
 
-                    if user_role not in required_roles:
-                        messages.error(
-                            request,
-                            f'Su rol "{user_role}" no tiene permisos para acceder a esta sección.'
-                        )
-                        return redirect('dashboard')
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rutas = rutas_configuradas()
 
-        response = self.get_response(request)
-        return response
+    def __call__(self, request):
+        regla = self.rutas.buscar(request.path_info)
+
+        if regla is not SIN_REGLA and regla is not None:
+            # Si no está autenticado, redirigir al login
+            if not request.user.is_authenticated:
+                return redirect('login')
+
+            # Si está autenticado pero no tiene permisos
+            if regla and not permisos_peticion(request).puede(regla):
+                messages.error(request, MENSAJES.get(regla, MENSAJE_DEFECTO))
+                return redirect('dashboard')
 
-    def get_user_role(self, user):
-        """Obtener el rol del usuario de forma segura"""
-        try:
-            if hasattr(user, 'perfil') and user.perfil.rol:
-                return user.perfil.rol.nombre
-            return 'Usuario Regular'
-        except:
-            return 'Usuario Regular'
+        return self.get_response(request)
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0002_remove_perfilusuario_cargo'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='logactividad',
+            name='fecha',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
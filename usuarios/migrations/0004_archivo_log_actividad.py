@@ -0,0 +1,53 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0003_fecha_log_actividad'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogActividadArchivado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('accion', models.CharField(max_length=255)),
+                ('fecha', models.DateTimeField()),
+                ('detalles', models.TextField(blank=True, null=True)),
+                ('ip', models.GenericIPAddressField(blank=True, null=True)),
+                ('periodo', models.DateField()),
+            ],
+            options={
+                'verbose_name': 'Log de Actividad Archivado',
+                'verbose_name_plural': 'Logs de Actividades Archivados',
+                'ordering': ['-fecha'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='logactividad',
+            index=models.Index(fields=['-fecha'], name='log_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logactividad',
+            index=models.Index(fields=['usuario', '-fecha'], name='log_usuario_fecha_idx'),
+        ),
+        migrations.AddField(
+            model_name='logactividadarchivado',
+            name='usuario',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='logactividadarchivado',
+            index=models.Index(fields=['periodo', '-fecha'], name='log_arch_periodo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logactividadarchivado',
+            index=models.Index(fields=['usuario', '-fecha'], name='log_arch_usuario_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+# Bits de usuarios.permisos.BITS en el momento de la migración:
+# administrar 1, supervisar 2, ver_reportes 4, ver_actividad 8, gestionar_inventario 16
+CAPACIDADES_ROLES = {
+    'Superadministrador': 31,
+    'Administrador': 31,
+    'Supervisor': 30,
+    'Coordinador': 28,
+    'Técnico': 16,
+    'Analista': 4,
+}
+
+
+def asignar_capacidades(apps, schema_editor):
+    """Los roles existentes conservan los permisos que les daba su nombre"""
+    Rol = apps.get_model('usuarios', 'Rol')
+    for rol in Rol.objects.all():
+        rol.capacidades = CAPACIDADES_ROLES.get(rol.nombre, 0)
+        rol.save(update_fields=['capacidades'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0004_archivo_log_actividad'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rol',
+            name='capacidades',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(asignar_capacidades, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,25 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class Rol(models.Model):
     nombre = models.CharField(max_length=50)
     descripcion = models.TextField(blank=True, null=True)
+    # Descripción libre heredada; los permisos efectivos están en capacidades
     permisos = models.TextField(blank=True, null=True)
+    # Bits de usuarios.permisos.BITS; vacío: los del rol del sistema con el mismo nombre
+    capacidades = models.PositiveIntegerField(blank=True, null=True)
 
     def __str__(self):
         return self.nombre
 
+    def save(self, *args, **kwargs):
+        if self.capacidades is None:
+            from .permisos import capacidades_predeterminadas
+            self.capacidades = capacidades_predeterminadas(self.nombre)
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Rol"
         verbose_name_plural = "Roles"
@@ -52,7 +62,8 @@ class PerfilUsuario(models.Model):
 class LogActividad(models.Model):
     usuario = models.ForeignKey(User, on_delete=models.CASCADE)
     accion = models.CharField(max_length=255)
-    fecha = models.DateTimeField(auto_now_add=True)
+    # Momento del evento (no de la escritura, que puede ser diferida)
+    fecha = models.DateTimeField(default=timezone.now, editable=False)
     detalles = models.TextField(blank=True, null=True)
     ip = models.GenericIPAddressField(blank=True, null=True)
 
@@ -63,3 +74,31 @@ class LogActividad(models.Model):
         verbose_name = "Log de Actividad"
         verbose_name_plural = "Logs de Actividades"
         ordering = ['-fecha']
+        indexes = [
+            # Actividad reciente (dashboards) y por usuario (perfil)
+            models.Index(fields=['-fecha'], name='log_fecha_idx'),
+            models.Index(fields=['usuario', '-fecha'], name='log_usuario_fecha_idx'),
+        ]
+
+
+class LogActividadArchivado(models.Model):
+    """Entradas de LogActividad movidas fuera de la tabla activa por antigüedad"""
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE)
+    accion = models.CharField(max_length=255)
+    fecha = models.DateTimeField()
+    detalles = models.TextField(blank=True, null=True)
+    ip = models.GenericIPAddressField(blank=True, null=True)
+    # Primer día del mes de la entrada: cada periodo se consulta por separado
+    periodo = models.DateField()
+
+    def __str__(self):
+        return f"{self.usuario.username} - {self.accion} - {self.fecha}"
+
+    class Meta:
+        verbose_name = "Log de Actividad Archivado"
+        verbose_name_plural = "Logs de Actividades Archivados"
+        ordering = ['-fecha']
+        indexes = [
+            models.Index(fields=['periodo', '-fecha'], name='log_arch_periodo_idx'),
+            models.Index(fields=['usuario', '-fecha'], name='log_arch_usuario_idx'),
+        ]
@@ -0,0 +1,201 @@
+# usuarios/permisos.py
+"""
+Capacidades de los roles y resolución de permisos por petición.
+
+Cada Rol guarda sus capacidades como un entero (Rol.capacidades) en el que
+cada bit es una capacidad de BITS; comprobar un permiso es un AND de bits.
+Los roles se cargan con una sola consulta en un mapa inmutable del proceso
+(id -> nombre y bits) que se vuelve a leer cuando cambia la versión de
+permisos.
+
+El rol del usuario se resuelve una sola vez por petición y se guarda:
+    - en la petición (request.permisos, lo asigna PermisosMiddleware) y en el
+      propio objeto usuario, para las funciones que solo reciben el usuario
+    - en la sesión, para no consultar el perfil en las peticiones siguientes
+
+La copia de la sesión y el mapa de roles llevan el número de versión global
+de permisos; las señales de usuarios/signals.py lo incrementan al guardar o
+eliminar un Rol o un PerfilUsuario, y con eso todas las copias anteriores
+dejan de valer. La versión se guarda en la base de datos (VersionDatos,
+dominio 'permisos') y se lee una vez por petición autenticada, de modo que
+todos los procesos de trabajo ven el cambio en la petición siguiente sea
+cual sea el backend de caché. El incremento forma parte de la transacción
+que modifica el rol o el perfil.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from .models import PerfilUsuario, Rol
+
+DOMINIO_VERSION = 'permisos'
+CLAVE_SESION = '_permisos'
+
+# Capacidad -> bit de Rol.capacidades (no reutilizar bits ya asignados)
+BITS = {
+    'administrar': 1 << 0,
+    'supervisar': 1 << 1,
+    'ver_reportes': 1 << 2,
+    'ver_actividad': 1 << 3,
+    'gestionar_inventario': 1 << 4,
+}
+
+# Capacidades de los roles del sistema: setup_roles las aplica y también las
+# reciben los roles de ese nombre creados sin capacidades (ver Rol.save)
+CAPACIDADES_ROLES = {
+    'Superadministrador': ['administrar', 'supervisar', 'ver_reportes', 'ver_actividad', 'gestionar_inventario'],
+    'Administrador': ['administrar', 'supervisar', 'ver_reportes', 'ver_actividad', 'gestionar_inventario'],
+    'Supervisor': ['supervisar', 'ver_reportes', 'ver_actividad', 'gestionar_inventario'],
+    'Coordinador': ['ver_reportes', 'ver_actividad', 'gestionar_inventario'],
+    'Técnico': ['gestionar_inventario'],
+    'Analista': ['ver_reportes'],
+    'Usuario Regular': [],
+}
+
+
+def codificar(capacidades):
+    """Nombres de capacidades -> entero de bits"""
+    bits = 0
+    for capacidad in capacidades:
+        bits |= BITS[capacidad]
+    return bits
+
+
+def decodificar(bits):
+    """Entero de bits -> nombres de capacidades"""
+    return frozenset(capacidad for capacidad, bit in BITS.items() if bits & bit)
+
+
+def capacidades_predeterminadas(nombre):
+    """Bits de un rol del sistema según su nombre (0 si no es uno de ellos)"""
+    return codificar(CAPACIDADES_ROLES.get(nombre, ()))
+
+
+@dataclass(frozen=True)
+class PermisosUsuario:
+    """Rol y capacidades resueltos de un usuario"""
+    usuario_id: int = None
+    tiene_perfil: bool = False
+    rol_id: int = None
+    rol: str = None
+    bits: int = 0
+
+    def puede(self, capacidad):
+        return bool(self.bits & BITS[capacidad])
+
+    @property
+    def capacidades(self):
+        return decodificar(self.bits)
+
+    def tiene_rol(self, roles):
+        return self.rol is not None and self.rol in roles
+
+
+ANONIMO = PermisosUsuario()
+
+
+def obtener_version():
+    """Versión actual de los permisos (una consulta por clave única)"""
+    from reportes.models import VersionDatos
+
+    version = VersionDatos.objects.filter(dominio=DOMINIO_VERSION).values_list(
+        'version', flat=True).first()
+    return version or 0
+
+
+def invalidar():
+    """Invalidar las copias de permisos de todas las sesiones y procesos"""
+    from reportes.cache_reportes import incrementar_version
+
+    global _roles
+    _roles = None
+    incrementar_version(DOMINIO_VERSION)
+
+
+# (versión, mapa id de rol -> (nombre, bits)); se sustituye entero, nunca se modifica
+_roles = None
+
+
+def mapa_roles(version=None):
+    """Mapa inmutable de los roles, recargado si cambió la versión"""
+    global _roles
+    version = obtener_version() if version is None else version
+    actual = _roles
+    if actual is None or actual[0] != version:
+        mapa = {}
+        for pk, nombre, bits in Rol.objects.values_list('pk', 'nombre', 'capacidades'):
+            if bits is None:
+                bits = capacidades_predeterminadas(nombre)
+            mapa[pk] = (nombre, bits)
+        actual = (version, MappingProxyType(mapa))
+        _roles = actual
+    return actual[1]
+
+
+def _permisos_rol(usuario_id, tiene_perfil, rol_id, version):
+    if rol_id is None:
+        return PermisosUsuario(usuario_id, tiene_perfil)
+    nombre, bits = mapa_roles(version).get(rol_id, (None, 0))
+    return PermisosUsuario(usuario_id, tiene_perfil, rol_id, nombre, bits)
+
+
+def _cargar(usuario, version):
+    """Rol del perfil del usuario (sin JOIN: nombre y bits salen del mapa)"""
+    # Si el perfil ya está cargado en el objeto no hace falta consultar
+    perfil = usuario._state.fields_cache.get('perfil')
+    if perfil is not None:
+        return _permisos_rol(usuario.pk, True, perfil.rol_id, version)
+
+    roles = list(PerfilUsuario.objects.filter(usuario_id=usuario.pk).values_list(
+        'rol_id', flat=True)[:1])
+    if not roles:
+        return PermisosUsuario(usuario.pk)
+    return _permisos_rol(usuario.pk, True, roles[0], version)
+
+
+def permisos_usuario(usuario):
+    """
+    Permisos de un usuario, resueltos una vez por objeto usuario.
+
+    Las vistas reciben un objeto usuario nuevo en cada petición, de modo que
+    el resultado no sobrevive a la petición.
+    """
+    if usuario is None or not usuario.is_authenticated:
+        return ANONIMO
+    permisos = getattr(usuario, '_permisos', None)
+    if permisos is None:
+        permisos = _cargar(usuario, obtener_version())
+        usuario._permisos = permisos
+    return permisos
+
+
+def permisos_peticion(request):
+    """
+    Permisos del usuario de la petición, usando la copia de la sesión si
+    sigue vigente.
+    """
+    usuario = request.user
+    if not usuario.is_authenticated:
+        return ANONIMO
+
+    permisos = getattr(usuario, '_permisos', None)
+    if permisos is not None:
+        return permisos
+
+    sesion = getattr(request, 'session', None)
+    version = obtener_version()
+    copia = sesion.get(CLAVE_SESION) if sesion is not None else None
+
+    if copia and copia.get('usuario') == usuario.pk and copia.get('version') == version:
+        permisos = _permisos_rol(usuario.pk, copia['perfil'], copia['rol'], version)
+    else:
+        permisos = _cargar(usuario, version)
+        if sesion is not None:
+            sesion[CLAVE_SESION] = {
+                'usuario': usuario.pk,
+                'version': version,
+                'perfil': permisos.tiene_perfil,
+                'rol': permisos.rol_id,
+            }
+
+    usuario._permisos = permisos
+    return permisos
@@ -0,0 +1,131 @@
+# usuarios/retencion.py
+"""
+Política de retención del registro de actividad.
+
+Las entradas de LogActividad más antiguas que ACTIVIDAD_DIAS_RETENCION se
+mueven por lotes a LogActividadArchivado, de modo que la tabla activa solo
+contiene la actividad reciente. consultar_actividad() lee ambas tablas para
+que los reportes puedan consultar cualquier periodo.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import LogActividad, LogActividadArchivado
+
+DIAS_RETENCION = getattr(settings, 'ACTIVIDAD_DIAS_RETENCION', 90)
+TAMANO_LOTE = 1000
+LIMITE_CONSULTA = 500
+
+CAMPOS_ACTIVIDAD = ('usuario__username', 'accion', 'fecha', 'detalles', 'ip')
+
+
+def periodo_de(fecha):
+    """Primer día del mes (hora local) de una fecha con hora"""
+    return timezone.localtime(fecha).date().replace(day=1)
+
+
+def fecha_limite(dias=None, ahora=None):
+    """Momento a partir del cual las entradas permanecen en la tabla activa"""
+    dias = DIAS_RETENCION if dias is None else dias
+    return (ahora or timezone.now()) - timedelta(days=dias)
+
+
+def archivar_logs(dias=None, tamano_lote=TAMANO_LOTE, ahora=None):
+    """
+    Mover al archivo las entradas anteriores al límite de retención.
+
+    Cada lote se copia y se elimina en su propia transacción para no
+    mantener bloqueada la tabla durante todo el proceso.
+
+    Returns:
+        Número de entradas archivadas
+    """
+    limite = fecha_limite(dias, ahora)
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            lote = list(
+                LogActividad.objects.filter(fecha__lt=limite)
+                .order_by('fecha', 'id')[:tamano_lote]
+            )
+            if not lote:
+                break
+
+            LogActividadArchivado.objects.bulk_create([
+                LogActividadArchivado(
+                    usuario_id=log.usuario_id,
+                    accion=log.accion,
+                    fecha=log.fecha,
+                    detalles=log.detalles,
+                    ip=log.ip,
+                    periodo=periodo_de(log.fecha),
+                )
+                for log in lote
+            ])
+            LogActividad.objects.filter(id__in=[log.id for log in lote]).delete()
+
+        total += len(lote)
+
+    return total
+
+
+def pendientes_archivar(dias=None, ahora=None):
+    """Número de entradas que archivar_logs() movería"""
+    return LogActividad.objects.filter(fecha__lt=fecha_limite(dias, ahora)).count()
+
+
+def periodos_archivados():
+    """Meses disponibles en el archivo, del más reciente al más antiguo"""
+    return list(
+        LogActividadArchivado.objects.order_by('-periodo')
+        .values_list('periodo', flat=True).distinct()
+    )
+
+
+def _inicio_dia(fecha):
+    return timezone.make_aware(datetime.combine(fecha, time.min))
+
+
+def consultar_actividad(desde=None, hasta=None, usuario=None, limite=LIMITE_CONSULTA):
+    """
+    Consultar la actividad de un rango de fechas en la tabla activa y el archivo.
+
+    Args:
+        desde, hasta: fechas (date) inclusivas; None para no limitar
+        usuario: filtrar por usuario
+
+    Returns:
+        Lista de diccionarios con CAMPOS_ACTIVIDAD, de la más reciente a la más antigua
+    """
+    filtros = {}
+    if desde:
+        filtros['fecha__gte'] = _inicio_dia(desde)
+    if hasta:
+        filtros['fecha__lt'] = _inicio_dia(hasta + timedelta(days=1))
+    if usuario:
+        filtros['usuario'] = usuario
+
+    recientes = LogActividad.objects.filter(**filtros).values(*CAMPOS_ACTIVIDAD)
+
+    # El archivo solo se consulta si el rango llega antes de la entrada más antigua activa
+    mas_antigua = LogActividad.objects.order_by('fecha').values_list(
+        'fecha', flat=True).first()
+    if mas_antigua and desde and _inicio_dia(desde) >= mas_antigua:
+        return list(recientes.order_by('-fecha')[:limite])
+
+    archivados = LogActividadArchivado.objects.filter(**filtros)
+    # Limitar por periodo para recorrer solo los meses del rango
+    if desde:
+        archivados = archivados.filter(periodo__gte=desde.replace(day=1))
+    if hasta:
+        archivados = archivados.filter(periodo__lte=hasta)
+
+    return list(
+        recientes.order_by().union(
+            archivados.values(*CAMPOS_ACTIVIDAD).order_by(), all=True)
+        .order_by('-fecha')[:limite]
+    )
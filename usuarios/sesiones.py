@@ -0,0 +1,87 @@
+# usuarios/sesiones.py
+"""
+Caducidad deslizante y limpieza de sesiones.
+
+Con SESSION_SAVE_EVERY_REQUEST cada petición escribía la sesión para
+retrasar su caducidad. Ahora la sesión guarda el momento de su última
+renovación (CLAVE_RENOVACION) y SesionDeslizanteMiddleware solo la marca
+para guardar cuando le quedan menos de SESION_UMBRAL_RENOVACION segundos de
+vida: una sesión activa se escribe como mucho una vez cada
+SESSION_COOKIE_AGE - SESION_UMBRAL_RENOVACION segundos.
+
+Las sesiones caducadas de la tabla django_session se eliminan por lotes con
+el comando limpiar_sesiones (cron). Con sesiones en cookies firmadas no hay
+tabla y la limpieza no hace nada.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.utils import timezone
+
+CLAVE_RENOVACION = '_renovada'
+UMBRAL_RENOVACION = getattr(settings, 'SESION_UMBRAL_RENOVACION', 900)
+TAMANO_LOTE = 5000
+
+# Motores que guardan las sesiones en la tabla django_session
+MOTORES_BD = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def renovar_si_necesario(sesion, ahora=None):
+    """
+    Marcar la sesión para guardarse si le queda poca vida.
+
+    Returns:
+        True si la sesión se guardará al terminar la petición
+    """
+    # Sesión sin datos (p. ej. un anónimo): no hay nada que renovar
+    if sesion.is_empty():
+        return False
+
+    ahora = int(ahora if ahora is not None else time.time())
+    if not sesion.modified:
+        renovada = sesion.get(CLAVE_RENOVACION)
+        restante = (renovada or 0) + settings.SESSION_COOKIE_AGE - ahora
+        if restante >= UMBRAL_RENOVACION:
+            return False
+
+    # Se guarda de todos modos (o debe guardarse): anotar la renovación
+    sesion[CLAVE_RENOVACION] = ahora
+    return True
+
+
+def usa_base_datos():
+    return settings.SESSION_ENGINE in MOTORES_BD
+
+
+def sesiones_caducadas(ahora=None):
+    return Session.objects.filter(expire_date__lt=ahora or timezone.now())
+
+
+def limpiar_sesiones(tamano_lote=TAMANO_LOTE, ahora=None):
+    """
+    Eliminar de la tabla las sesiones caducadas, un lote por transacción.
+
+    Con cached_db la copia de la caché caduca por sí sola en el mismo momento.
+
+    Returns:
+        Número de sesiones eliminadas
+    """
+    if not usa_base_datos():
+        return 0
+
+    ahora = ahora or timezone.now()
+    total = 0
+    while True:
+        claves = list(sesiones_caducadas(ahora).values_list(
+            'session_key', flat=True)[:tamano_lote])
+        if not claves:
+            break
+        with transaction.atomic():
+            Session.objects.filter(session_key__in=claves).delete()
+        total += len(claves)
+    return total
@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from .models import PerfilUsuario, Departamento, Rol
@@ -44,3 +44,18 @@ def crear_perfil_usuario(sender, instance, created, **kwargs):
             print(f"El usuario {instance.username} ya tiene perfil")
     else:
         print(f"Usuario {instance.username} actualizado (no creado)")
+
+
+@receiver(post_save, sender=Rol)
+@receiver(post_delete, sender=Rol)
+@receiver(post_save, sender=PerfilUsuario)
+@receiver(post_delete, sender=PerfilUsuario)
+def invalidar_permisos(sender, instance, **kwargs):
+    """Invalidar los permisos resueltos en sesiones y en el usuario del perfil"""
+    from .permisos import invalidar
+
+    invalidar()
+    if sender is PerfilUsuario:
+        usuario = instance._state.fields_cache.get('usuario')
+        if usuario is not None:
+            usuario.__dict__.pop('_permisos', None)
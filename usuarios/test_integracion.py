@@ -7,15 +7,19 @@ enfocadas en validar la interacción entre componentes,
 utilizando herramientas de pruebas automatizadas"
 """
 
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
 from unittest.mock import patch
 import json
-from usuarios.models import PerfilUsuario, Departamento, Rol, LogActividad
+from usuarios.models import PerfilUsuario, Departamento, Rol, LogActividad, LogActividadArchivado
 from usuarios.forms import RegistroForm, LoginForm
+from usuarios.actividad import EscritorActividad, registrar_actividad
+from usuarios.retencion import archivar_logs, consultar_actividad, periodo_de
 from inventario.models import Activo, Hardware
 
 
@@ -621,6 +625,325 @@ class RendimientoIntegracionTestCase(TestCase):
         self.assertIn('total_activos', response.context)
 
 
+class RegistroActividadIntegracionTestCase(TestCase):
+    """
+    Pruebas de integración para el registro de actividad en segundo plano
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='actividad',
+            password='testpass123'
+        )
+
+    def test_escritor_actividad_por_lotes(self):
+        """
+        CP-INT-12: Verificar que el escritor guarda las entradas encoladas por lotes
+        Integración: Cola -> bulk_create -> LogActividad
+        """
+        escritor = EscritorActividad(tamano_lote=2)
+        for i in range(5):
+            escritor.cola.put_nowait(LogActividad(
+                usuario=self.user,
+                accion=f'Acción {i}',
+                fecha=timezone.now()
+            ))
+
+        escritor.vaciar()
+
+        self.assertTrue(escritor.cola.empty())
+        self.assertEqual(
+            LogActividad.objects.filter(usuario=self.user).count(), 5)
+
+        # Con la cola llena y sin hilo que la vacíe, la entrada se descarta sin
+        # error y sin esperar (un intervalo largo bloquearía la prueba)
+        escritor = EscritorActividad(intervalo=60, capacidad=1)
+        with patch.object(escritor, 'iniciar'):
+            for i in range(2):
+                escritor.encolar(LogActividad(usuario=self.user, accion=f'Saturada {i}'))
+        self.assertEqual((escritor.cola.qsize(), escritor.descartadas), (1, 1))
+
+    @override_settings(ACTIVIDAD_ASINCRONA=True, ACTIVIDAD_MUESTREO_CONSULTAS=0)
+    def test_registro_asincrono_y_muestreo(self):
+        """
+        CP-INT-13: Verificar que el registro asíncrono no escribe en la petición
+        y que las consultas se pueden omitir
+        Integración: Vista -> Cola diferida -> Muestreo de consultas
+        """
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            entrada = registrar_actividad(self.user, 'Creación de hardware')
+            omitida = registrar_actividad(self.user, 'Consulta de hardware')
+
+        self.assertIsNotNone(entrada)
+        self.assertIsNone(omitida)
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(LogActividad.objects.filter(usuario=self.user).exists())
+
+    def test_archivo_actividad_consulta_transparente(self):
+        """
+        CP-INT-14: Verificar que archivar_logs mueve las entradas antiguas y que
+        la consulta de actividad las sigue devolviendo
+        Integración: Retención -> Archivo -> Consulta combinada
+        """
+        ahora = timezone.now()
+        LogActividad.objects.create(
+            usuario=self.user, accion='Antigua', fecha=ahora - timedelta(days=120))
+        LogActividad.objects.create(
+            usuario=self.user, accion='Reciente', fecha=ahora - timedelta(days=1))
+
+        archivadas = archivar_logs(dias=90, tamano_lote=1)
+
+        self.assertEqual(archivadas, 1)
+        self.assertEqual(list(LogActividad.objects.values_list('accion', flat=True)),
+                         ['Reciente'])
+        archivo = LogActividadArchivado.objects.get()
+        self.assertEqual(archivo.periodo, periodo_de(archivo.fecha))
+
+        actividad = consultar_actividad(
+            desde=(ahora - timedelta(days=200)).date(), usuario=self.user)
+        self.assertEqual([a['accion'] for a in actividad], ['Reciente', 'Antigua'])
+
+        recientes = consultar_actividad(desde=(ahora - timedelta(days=7)).date())
+        self.assertEqual([a['accion'] for a in recientes], ['Reciente'])
+
+
+class PermisosPeticionIntegracionTestCase(TestCase):
+    """
+    Pruebas de integración para la resolución de permisos por petición
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='supervisor',
+            password='testpass123'
+        )
+        self.perfil = self.user.perfil
+        self.perfil.rol = Rol.objects.create(nombre='Supervisor')
+        self.perfil.save()
+
+    def consultas_perfil(self, url):
+        """Respuesta y número de consultas a la tabla de perfiles"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+        return response, sum(
+            'usuarios_perfilusuario' in consulta['sql'] for consulta in consultas.captured_queries)
+
+    def test_permisos_resueltos_una_vez_y_en_sesion(self):
+        """
+        CP-INT-15: Verificar que los permisos se resuelven una vez por petición,
+        se reutilizan desde la sesión y se invalidan al cambiar el rol
+        Integración: Middleware -> Decorador -> Context processor -> Sesión
+        """
+        self.client.force_login(self.user)
+
+        # Middleware, decorador y context processor comparten una sola consulta
+        response, consultas = self.consultas_perfil(reverse('reportes_index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(consultas, 1)
+        self.assertEqual(response.context['permisos'].rol, 'Supervisor')
+        self.assertTrue(response.context['puede_ver_reportes'])
+        self.assertFalse(response.context['es_admin'])
+
+        # La siguiente petición usa la copia de la sesión
+        response, consultas = self.consultas_perfil(reverse('reportes_index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(consultas, 0)
+
+        # Cambiar el rol invalida la copia
+        self.perfil.rol = Rol.objects.create(nombre='Usuario Regular Test')
+        self.perfil.save()
+        response, consultas = self.consultas_perfil(reverse('reportes_index'))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(consultas, 1)
+
+        # Un cambio hecho por otro proceso (solo la versión en la base de datos,
+        # sin tocar el mapa de roles de este proceso) también se aplica
+        from django.db.models import F
+        from reportes.models import VersionDatos
+
+        self.perfil.rol = Rol.objects.create(nombre='Supervisor Test', capacidades=6)
+        self.perfil.save()
+        self.assertEqual(self.client.get(reverse('reportes_index')).status_code, 200)
+        PerfilUsuario.objects.filter(pk=self.perfil.pk).update(
+            rol=Rol.objects.get(nombre='Usuario Regular Test'))
+        VersionDatos.objects.filter(dominio='permisos').update(version=F('version') + 1)
+        self.assertEqual(self.client.get(reverse('reportes_index')).status_code, 302)
+
+
+class ControlAccesoIntegracionTestCase(TestCase):
+    """
+    Pruebas de integración para el control de acceso por prefijo de URL
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tecnico',
+            password='testpass123'
+        )
+        self.perfil = self.user.perfil
+
+    def test_control_acceso_por_prefijo(self):
+        """
+        CP-INT-16: Verificar el prefijo más largo de las reglas de acceso y que
+        las rutas sin regla no resuelven el rol
+        Integración: Reglas compiladas -> Middleware -> Permisos
+        """
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from django.utils.functional import SimpleLazyObject
+        from usuarios.acceso import SIN_REGLA, RutasAcceso
+        from usuarios.middleware import ControlAccesoMiddleware
+
+        rutas = RutasAcceso({
+            '/reportes/': 'ver_reportes',
+            '/reportes/publico/': None,
+            '/usuarios/admin/': 'administrar',
+        }, excluidos=['/static/'])
+        self.assertEqual(rutas.buscar('/reportes'), 'ver_reportes')
+        self.assertEqual(rutas.buscar('/reportes/inventario/pdf/'), 'ver_reportes')
+        self.assertIsNone(rutas.buscar('/reportes/publico/resumen/'))
+        self.assertIs(rutas.buscar('/reportes-antiguos/'), SIN_REGLA)
+        self.assertIs(rutas.buscar('/usuarios/perfil/'), SIN_REGLA)
+        self.assertEqual(rutas.buscar('/usuarios/admin/roles/'), 'administrar')
+
+        # Sin regla: el usuario (perezoso) no llega a cargarse
+        middleware = ControlAccesoMiddleware(lambda request: HttpResponse('ok'))
+        request = RequestFactory().get('/inventario/hardware/')
+        request.user = SimpleLazyObject(lambda: self.fail('Se resolvió el usuario'))
+        with self.assertNumQueries(0):
+            self.assertEqual(middleware(request).status_code, 200)
+
+        # Con regla: anónimo al login, rol sin capacidad al dashboard
+        response = self.client.get('/reportes/')
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+
+        self.perfil.rol = Rol.objects.create(nombre='Técnico')
+        self.perfil.save()
+        self.client.force_login(self.user)
+        response = self.client.get('/export/inventario/')
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+
+class CapacidadesRolIntegracionTestCase(TestCase):
+    """
+    Pruebas de integración para las capacidades de los roles como bits
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='auditor',
+            password='testpass123'
+        )
+        self.perfil = self.user.perfil
+
+    def test_capacidades_por_bits(self):
+        """
+        CP-INT-17: Verificar que los permisos dependen de los bits del rol y no
+        de su nombre, y que el mapa de roles se refresca al cambiar un rol
+        Integración: Rol.capacidades -> Mapa de roles -> Decoradores
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        from usuarios.permisos import codificar, mapa_roles, permisos_usuario
+
+        # Un rol propio con bits explícitos
+        rol = Rol.objects.create(
+            nombre='Auditor', capacidades=codificar(['supervisar', 'ver_reportes']))
+        self.perfil.rol = rol
+        self.perfil.save()
+
+        usuario = User.objects.get(pk=self.user.pk)
+        permisos = permisos_usuario(usuario)
+        self.assertTrue(permisos.puede('ver_reportes'))
+        self.assertFalse(permisos.puede('administrar'))
+        self.assertEqual(permisos.capacidades, {'supervisar', 'ver_reportes'})
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('reportes_index')).status_code, 200)
+
+        # Quitar la capacidad se aplica en la petición siguiente
+        rol.capacidades = codificar(['ver_reportes'])
+        rol.save()
+        self.assertEqual(mapa_roles()[rol.pk], ('Auditor', codificar(['ver_reportes'])))
+        self.assertEqual(self.client.get(reverse('reportes_index')).status_code, 302)
+
+        # Sin consultas una vez cargado el mapa para la versión vigente
+        from usuarios.permisos import obtener_version
+        version = obtener_version()
+        with self.assertNumQueries(0):
+            mapa_roles(version)
+
+        # setup_roles declara las capacidades de los roles del sistema
+        call_command('setup_roles', stdout=StringIO())
+        self.assertEqual(Rol.objects.get(nombre='Coordinador').capacidades,
+                         codificar(['ver_reportes', 'ver_actividad', 'gestionar_inventario']))
+
+
+class SesionesIntegracionTestCase(TestCase):
+    """
+    Pruebas de integración para la caducidad deslizante y la limpieza de sesiones
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='sesion',
+            password='testpass123'
+        )
+
+    def escrituras_sesion(self, url):
+        """Número de escrituras en la tabla de sesiones durante una petición"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return sum(
+            'django_session' in consulta['sql']
+            and consulta['sql'].startswith(('INSERT', 'UPDATE'))
+            for consulta in consultas.captured_queries)
+
+    def test_renovacion_deslizante_y_limpieza(self):
+        """
+        CP-INT-18: Verificar que la sesión solo se escribe cuando le queda poca
+        vida y que la limpieza elimina solo las sesiones caducadas
+        Integración: Middleware -> Sesión -> Comando de limpieza
+        """
+        import time
+        from io import StringIO
+        from django.conf import settings
+        from django.contrib.sessions.models import Session
+        from django.core.management import call_command
+        from usuarios.sesiones import CLAVE_RENOVACION, UMBRAL_RENOVACION
+
+        self.client.force_login(self.user)
+        url = reverse('dashboard')
+
+        # La primera petición anota la renovación; las siguientes no escriben
+        self.assertEqual(self.escrituras_sesion(url), 1)
+        self.assertEqual(self.escrituras_sesion(url), 0)
+
+        # Por debajo del umbral se renueva una sola vez
+        sesion = self.client.session
+        sesion[CLAVE_RENOVACION] = int(time.time()) - (
+            settings.SESSION_COOKIE_AGE - UMBRAL_RENOVACION) - 1
+        sesion.save()
+        self.assertEqual(self.escrituras_sesion(url), 1)
+        self.assertEqual(self.escrituras_sesion(url), 0)
+
+        # La limpieza conserva la sesión activa
+        Session.objects.create(
+            session_key='caducada', session_data='',
+            expire_date=timezone.now() - timedelta(minutes=1))
+        salida = StringIO()
+        call_command('limpiar_sesiones', lote=1, stdout=salida)
+        self.assertIn('1 sesiones eliminadas', salida.getvalue())
+        self.assertFalse(Session.objects.filter(session_key='caducada').exists())
+        self.assertTrue(Session.objects.filter(session_key=self.client.session.session_key).exists())
+        self.assertEqual(self.escrituras_sesion(url), 0)
+
 if __name__ == '__main__':
     import unittest
     unittest.main()
@@ -7,8 +7,9 @@ from django.contrib import messages
 from django.utils import timezone
 from django.db import transaction
 from .models import PerfilUsuario, Departamento, Rol, LogActividad
+from .actividad import registrar_actividad
 from .forms import RegistroForm, PerfilForm, LoginForm, CambiarPasswordForm
-from .decorators import puede_ver_actividad, puede_ver_reportes
+from .permisos import permisos_peticion
 
 
 def index(request):
@@ -55,7 +56,7 @@ def login_view(request):
                     )
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=user,
                     accion="Inicio de sesión",
                     ip=get_client_ip(request)
@@ -74,7 +75,7 @@ def logout_view(request):
     """Vista para cerrar sesión"""
     if request.user.is_authenticated:
         # Registrar actividad
-        LogActividad.objects.create(
+        registrar_actividad(
             usuario=request.user,
             accion="Cierre de sesión",
             ip=get_client_ip(request)
@@ -128,7 +129,7 @@ def register_view(request):
                         )
 
                     # Registrar actividad
-                    LogActividad.objects.create(
+                    registrar_actividad(
                         usuario=user,
                         accion="Registro de usuario",
                         ip=get_client_ip(request)
@@ -200,7 +201,7 @@ def profile_view(request):
                 form.save()
 
                 # Registrar actividad
-                LogActividad.objects.create(
+                registrar_actividad(
                     usuario=request.user,
                     accion="Actualización de perfil",
                     ip=get_client_ip(request)
@@ -246,7 +247,7 @@ def cambiar_password_view(request):
             update_session_auth_hash(request, request.user)
 
             # Registrar actividad
-            LogActividad.objects.create(
+            registrar_actividad(
                 usuario=request.user,
                 accion="Cambio de contraseña",
                 ip=get_client_ip(request)
@@ -265,73 +266,23 @@ def cambiar_password_view(request):
 def dashboard_view(request):
     """Vista del dashboard principal con restricciones por rol"""
     try:
-        # Importación de modelos necesarios
-        from inventario.models import Activo, Hardware, Software, Mantenimiento
-        from django.db.models import Count, Q
-        from django.utils import timezone
-        from datetime import timedelta
+        from inventario.estadisticas import obtener_resumen, ResumenInventario
+        from reportes.cache_dashboard import obtener_fragmento
 
-        # Fechas para filtros
-        hoy = timezone.now().date()
-
-        # Obtener estadísticas de manera segura
+        # Obtener estadísticas de manera segura (cacheadas hasta que cambien los datos)
         try:
-            hardware_ids = Hardware.objects.values_list('activo_id', flat=True)
-            software_ids = Software.objects.values_list('activo_id', flat=True)
-
-            total_activos = Activo.objects.filter(
-                id__in=list(hardware_ids) + list(software_ids)
-            ).exclude(estado='baja').count()
-
-            total_hardware = Hardware.objects.select_related('activo').filter(
-                activo__estado__in=['activo', 'en_mantenimiento', 'obsoleto']
-            ).count()
-
-            total_software = Software.objects.select_related('activo').filter(
-                activo__estado__in=['activo', 'en_mantenimiento', 'obsoleto']
-            ).count()
-
-            # Mantenimientos
-            mantenimientos_pendientes = Mantenimiento.objects.filter(
-                Q(estado='programado') | Q(estado='en_proceso')
-            ).count()
-
-            # Equipos obsoletos
-            equipos_obsoletos = Activo.objects.filter(
-                estado='obsoleto').count()
-
-            # Software por vencer
-            software_vencer = Software.objects.filter(
-                fecha_vencimiento__isnull=False,
-                fecha_vencimiento__gte=hoy,
-                fecha_vencimiento__lte=hoy + timedelta(days=30),
-                activo__estado='activo'
-            ).count()
-
-            # Distribución por departamento
-            por_departamento = Activo.objects.filter(
-                id__in=list(hardware_ids) + list(software_ids)
-            ).exclude(
-                estado='baja'
-            ).values(
-                'departamento__nombre'
-            ).annotate(
-                total=Count('id')
-            ).order_by('-total')[:5]
-
+            hoy = timezone.now().date()
+            resumen = obtener_fragmento(
+                'resumen', (hoy.isoformat(),),
+                lambda: obtener_resumen(limite_departamentos=5, hoy=hoy))
         except Exception:
             # Valores por defecto en caso de error
-            total_activos = 0
-            total_hardware = 0
-            total_software = 0
-            mantenimientos_pendientes = 0
-            equipos_obsoletos = 0
-            software_vencer = 0
-            por_departamento = []
+            resumen = ResumenInventario()
 
         # Verificar permisos para actividad reciente
+        permisos = permisos_peticion(request)
         actividades = []
-        mostrar_actividad = puede_ver_actividad(request.user)
+        mostrar_actividad = permisos.puede('ver_actividad')
 
         if mostrar_actividad:
             try:
@@ -341,24 +292,19 @@ def dashboard_view(request):
                 actividades = []
 
         # Verificar permisos para reportes
-        puede_reportes = puede_ver_reportes(request.user)
+        puede_reportes = permisos.puede('ver_reportes')
 
         # Obtener información del rol para mostrar en el template
-        rol_usuario = "Usuario Regular"
-        try:
-            if hasattr(request.user, 'perfil') and request.user.perfil.rol:
-                rol_usuario = request.user.perfil.rol.nombre
-        except Exception:
-            pass
+        rol_usuario = permisos.rol or "Usuario Regular"
 
         context = {
-            'total_activos': total_activos,
-            'total_hardware': total_hardware,
-            'total_software': total_software,
-            'mantenimientos_pendientes': mantenimientos_pendientes,
-            'equipos_obsoletos': equipos_obsoletos,
-            'software_vencer': software_vencer,
-            'por_departamento': por_departamento,
+            'total_activos': resumen.total_activos,
+            'total_hardware': resumen.total_hardware,
+            'total_software': resumen.total_software,
+            'mantenimientos_pendientes': resumen.mantenimientos_pendientes,
+            'equipos_obsoletos': resumen.equipos_obsoletos,
+            'software_vencer': resumen.software_vencer,
+            'por_departamento': resumen.por_departamento,
             'actividades': actividades,
             'mostrar_actividad': mostrar_actividad,
             'puede_reportes': puede_reportes,